@@ -1,4 +1,4 @@
-from .core import PolymarketClient, PolymarketTrader
+from .core import PolymarketClient, AsyncPolymarketClient, PolymarketTrader
 from .api import GigaBrainClient, DuneClient
 from .data import (
     Timeframe,
@@ -13,7 +13,7 @@ from .data import (
     get_4h_fetcher,
 )
 from .copytrading import CopyTradingService, HourlyScheduler, LeaderboardFetcher, RedisCache
-from .markets import CryptoMarkets
+from .markets import CryptoMarkets, MarketHub, get_market_hub
 from .scalper import ScalperBot
 from .strategy import SmartStrategy, market_status, ask_ai, get_bets, get_pnl
 from .db import Database, TradeRepository
@@ -23,6 +23,7 @@ from .server import PolyBrainServer, create_server
 __version__ = "2.0.0"
 __all__ = [
     'PolymarketClient',
+    'AsyncPolymarketClient',
     'PolymarketTrader',
     'GigaBrainClient',
     'DuneClient',
@@ -41,6 +42,8 @@ __all__ = [
     'LeaderboardFetcher',
     'RedisCache',
     'CryptoMarkets',
+    'MarketHub',
+    'get_market_hub',
     'ScalperBot',
     'SmartStrategy',
     'market_status',
@@ -1,3 +1,4 @@
 from .copytrade import CopyTradeAgent
+from .rules import MovePrefilter
 
-__all__ = ['CopyTradeAgent']
+__all__ = ['CopyTradeAgent', 'MovePrefilter']
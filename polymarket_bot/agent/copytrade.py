@@ -2,14 +2,17 @@ import time
 import json
 from typing import List, Dict, Optional
 from datetime import datetime
-from ..core import PolymarketClient, PolymarketTrader
-from ..api import GigaBrainClient
+from ..core import PolymarketClient, PolymarketTrader, get_orderbook_store
+from ..api import GigaBrainClient, get_decision_cache, get_llm_scheduler
 from ..db import Database, TradeRepository
 from ..copytrading import CopyTradingService
+from .rules import MovePrefilter, parse_timestamp
 from ..config import (
     WALLET_ADDRESS,
     MAX_POSITION_SIZE,
-    ENABLE_TRADING
+    ENABLE_TRADING,
+    COPY_BATCH_SIZE,
+    COPY_BATCH_WINDOW
 )
 
 
@@ -17,7 +20,10 @@ class CopyTradeAgent:
     def __init__(self):
         self.client = PolymarketClient()
         self.trader = PolymarketTrader()
+        self.books = get_orderbook_store()
         self.gigabrain = GigaBrainClient()
+        self.decisions = get_decision_cache()
+        self.scheduler = get_llm_scheduler()
         self.copytrading = CopyTradingService()
         self.db = Database()
         self.repo = None
@@ -25,6 +31,12 @@ class CopyTradeAgent:
         self.max_position = MAX_POSITION_SIZE
         self.min_confidence = 0.6
         self.seen_moves = set()
+        self.batch_size = COPY_BATCH_SIZE
+        self.batch_window = COPY_BATCH_WINDOW
+        self.prefilter = MovePrefilter()
+        self.tiers: Dict[str, int] = {}
+        self.llm_calls = 0
+        self.llm_time = 0.0
     
     def connect(self):
         self.db.connect()
@@ -51,20 +63,89 @@ class CopyTradeAgent:
         position = whale_size * base_ratio * confidence_multiplier
         return min(position, self.max_position)
     
+    def _move_id(self, whale: Dict, activity: Dict) -> str:
+        return f"{whale.get('wallet')}_{activity.get('id', activity.get('timestamp', ''))}"
+    
+    def _move_fields(self, activity: Dict) -> Dict:
+        return {
+            'market_id': activity.get('conditionId', activity.get('marketId', '')),
+            'market_question': activity.get('title', activity.get('marketTitle', 'Unknown')),
+            'side': activity.get('side', 'BUY'),
+            'size': float(activity.get('size', 0) or activity.get('amount', 0) or 0),
+            'price': float(activity.get('price', 0.5) or 0.5)
+        }
+    
+    def _decision_key(self, whale: Dict, activity: Dict) -> str:
+        fields = self._move_fields(activity)
+        return self.decisions.key('copy', {
+            'wallet': whale.get('wallet'),
+            'move': activity.get('id', activity.get('timestamp')),
+            'profit': round(float(whale.get('profit', 0) or 0), -3),
+            'market': fields['market_question'],
+            'side': fields['side'],
+            'size': fields['size'],
+            'price': fields['price']
+        })
+    
+    def _normalize_analysis(self, analysis: Dict) -> Dict:
+        return {
+            'copy': analysis.get('copy', False),
+            'confidence': float(analysis.get('confidence', 0.5)),
+            'reasoning': analysis.get('reasoning', 'No reasoning provided')
+        }
+    
+    def _fallback_analysis(self, whale: Dict, error: Exception) -> Dict:
+        return {
+            'copy': whale.get('profit', 0) > 10000,
+            'confidence': 0.5,
+            'reasoning': f'Fallback: Based on whale profit. Error: {str(error)}',
+            'tier': 'fallback'
+        }
+    
+    def _record(self, analysis: Dict) -> Dict:
+        tier = analysis.get('tier', 'llm').split(':')[0]
+        self.tiers[tier] = self.tiers.get(tier, 0) + 1
+        return analysis
+    
+    def _ask(self, prompt: str, size: float, label: str, ends: List[Optional[float]]) -> Dict:
+        # The answer is worthless once the markets close; the soonest close sets the queue position
+        known = [end for end in ends if end is not None]
+        deadline = max(known) if known and len(known) == len(ends) else None
+        started = time.time()
+        try:
+            return self.scheduler.run(
+                lambda timeout: self.gigabrain.chat(prompt, timeout),
+                priority=self.scheduler.priority(min(known) if known else None, size),
+                deadline=deadline,
+                label=label
+            )
+        finally:
+            self.llm_calls += 1
+            self.llm_time += time.time() - started
+    
+    def _screen(self, whale: Dict, activity: Dict) -> Optional[Dict]:
+        # Rules and the decision cache settle the obvious moves without a GigaBrain round trip
+        analysis = self.prefilter.check(whale, activity, self._move_fields(activity))
+        if analysis is None:
+            cached = self.decisions.get(self._decision_key(whale, activity))
+            if cached is not None:
+                analysis = dict(cached, tier='cache')
+        return self._record(analysis) if analysis is not None else None
+    
     def analyze_trade(self, whale: Dict, activity: Dict) -> Dict:
-        market_question = activity.get('title', activity.get('marketTitle', 'Unknown'))
-        side = activity.get('side', 'BUY')
-        size = float(activity.get('size', 0) or activity.get('amount', 0) or 0)
-        price = float(activity.get('price', 0.5) or 0.5)
+        return self._screen(whale, activity) or self._ask_single(whale, activity)
+    
+    def _ask_single(self, whale: Dict, activity: Dict) -> Dict:
+        fields = self._move_fields(activity)
         
         prompt = f"""Analyze this whale trade on Polymarket:
 
 Whale: {whale.get('wallet', 'Unknown')}
 Whale Profit: ${whale.get('profit', 0):,.2f}
-Market: {market_question}
-Side: {side}
-Size: ${size:,.2f}
-Price: {price}
+Market: {fields['market_question']}
+Side: {fields['side']}
+Size: ${fields['size']:,.2f}
+Price: {fields['price']}
 
 Should we copy this trade? Consider:
 1. Whale's track record (profit)
@@ -76,7 +157,10 @@ Respond with JSON:
 {{"copy": true/false, "confidence": 0.0-1.0, "reasoning": "brief explanation"}}"""
 
         try:
-            response = self.gigabrain.chat(prompt)
+            response = self._ask(prompt, fields['size'], 'copy', [parse_timestamp(activity.get('endDate'))])
+            if 'error' in response:
+                # A failed call is not a "no"; caching it would mute this move for the whole TTL
+                return self._record(self._fallback_analysis(whale, RuntimeError(response['error'])))
             content = response.get('response', response.get('message', '{}'))
             
             if isinstance(content, str):
@@ -88,50 +172,170 @@ Respond with JSON:
             else:
                 analysis = content
             
-            return {
-                'copy': analysis.get('copy', False),
-                'confidence': float(analysis.get('confidence', 0.5)),
-                'reasoning': analysis.get('reasoning', 'No reasoning provided')
-            }
+            result = self._normalize_analysis(analysis)
+            self.decisions.put(self._decision_key(whale, activity), result)
+            return self._record(dict(result, tier='llm'))
         except Exception as e:
-            return {
-                'copy': whale.get('profit', 0) > 10000,
-                'confidence': 0.5,
-                'reasoning': f'Fallback: Based on whale profit. Error: {str(e)}'
-            }
+            return self._record(self._fallback_analysis(whale, e))
     
-    def process_whale_activity(self, whale: Dict, activity: Dict) -> Optional[int]:
-        move_id = f"{whale.get('wallet')}_{activity.get('id', activity.get('timestamp', ''))}"
+    def _parse_batch(self, content) -> Dict[str, Dict]:
+        if isinstance(content, str):
+            items = None
+            for open_char, close_char in (('[', ']'), ('{', '}')):
+                start = content.find(open_char)
+                end = content.rfind(close_char) + 1
+                if items is None and start >= 0 and end > start:
+                    try:
+                        items = json.loads(content[start:end])
+                    except ValueError:
+                        pass
+            
+            if items is None:
+                # Salvage whatever complete objects made it through a truncated or chatty reply
+                items = []
+                decoder = json.JSONDecoder()
+                i = content.find('{')
+                while i >= 0:
+                    try:
+                        item, end = decoder.raw_decode(content, i)
+                        items.append(item)
+                        i = content.find('{', end)
+                    except ValueError:
+                        i = content.find('{', i + 1)
+        else:
+            items = content
+        
+        if isinstance(items, dict) and 'copy' in items:
+            items = [items]
+        elif isinstance(items, dict):
+            items = items.get('decisions', [dict(v, id=k) for k, v in items.items() if isinstance(v, dict)])
+        
+        decisions = {}
+        for item in items if isinstance(items, list) else []:
+            if not isinstance(item, dict) or item.get('id') is None or 'copy' not in item:
+                continue
+            try:
+                decisions[str(item['id'])] = self._normalize_analysis(item)
+            except (TypeError, ValueError):
+                continue
+        return decisions
+    
+    def analyze_trades(self, moves: List[Dict]) -> Dict[str, Dict]:
+        results = {}
+        pending = []
+        for move in moves:
+            analysis = self._screen(move['whale'], move['activity'])
+            if analysis is not None:
+                results[move['id']] = analysis
+            else:
+                pending.append(move)
+        
+        if len(pending) == 1:
+            move = pending[0]
+            results[move['id']] = self._ask_single(move['whale'], move['activity'])
+            return results
+        if not pending:
+            return results
+        
+        prompt = "Analyze these whale trades on Polymarket:\n\n"
+        for i, move in enumerate(pending, 1):
+            whale = move['whale']
+            fields = self._move_fields(move['activity'])
+            prompt += f"""Move {i}:
+Whale: {whale.get('wallet', 'Unknown')}
+Whale Profit: ${whale.get('profit', 0):,.2f}
+Market: {fields['market_question']}
+Side: {fields['side']}
+Size: ${fields['size']:,.2f}
+Price: {fields['price']}
+
+"""
+        prompt += """Should we copy each trade? Consider:
+1. Whale's track record (profit)
+2. Market liquidity and volume
+3. Current price vs fair value
+4. Risk/reward ratio
+
+Respond with a JSON array, one object per move:
+[{"id": <move number>, "copy": true/false, "confidence": 0.0-1.0, "reasoning": "brief explanation"}]"""
+        
+        failed = None
+        try:
+            size = max(self._move_fields(m['activity'])['size'] for m in pending)
+            ends = [parse_timestamp(m['activity'].get('endDate')) for m in pending]
+            response = self._ask(prompt, size, 'copy-batch', ends)
+            if 'error' in response:
+                failed = RuntimeError(response['error'])
+                print(f"Batch analysis failed: {failed}")
+            decisions = self._parse_batch(response.get('response', response.get('message', '[]'))) if failed is None else {}
+        except Exception as e:
+            print(f"Batch analysis failed: {e}")
+            decisions = {}
+        
+        for i, move in enumerate(pending, 1):
+            analysis = decisions.get(str(i))
+            if analysis is None and failed is not None:
+                # GigaBrain is down; asking again per move would only repeat the failure
+                analysis = self._record(self._fallback_analysis(move['whale'], failed))
+            elif analysis is None:
+                # Only the moves the batch dropped pay for their own round trip
+                analysis = self._ask_single(move['whale'], move['activity'])
+            else:
+                self.decisions.put(self._decision_key(move['whale'], move['activity']), analysis)
+                analysis = self._record(dict(analysis, tier='llm-batch'))
+            results[move['id']] = analysis
+        return results
+    
+    def prepare_move(self, whale: Dict, activity: Dict) -> Optional[Dict]:
+        move_id = self._move_id(whale, activity)
         if move_id in self.seen_moves:
             return None
         self.seen_moves.add(move_id)
         
-        market_id = activity.get('conditionId', activity.get('marketId', ''))
-        market_question = activity.get('title', activity.get('marketTitle', 'Unknown'))
-        side = activity.get('side', 'BUY').upper()
-        size = float(activity.get('size', 0) or activity.get('amount', 0) or 0)
-        price = float(activity.get('price', 0.5) or 0.5)
-        
-        if size < 10:
+        fields = self._move_fields(activity)
+        if fields['size'] < 10:
             return None
         
         whale_move_id = self.repo.save_whale_move(
             wallet=whale.get('wallet', ''),
-            market_id=market_id,
-            market_question=market_question,
-            side=side,
-            size=size,
-            price=price
+            market_id=fields['market_id'],
+            market_question=fields['market_question'],
+            side=fields['side'].upper(),
+            size=fields['size'],
+            price=fields['price']
         )
-        
-        analysis = self.analyze_trade(whale, activity)
+        return {'id': move_id, 'whale': whale, 'activity': activity, 'whale_move_id': whale_move_id}
+    
+    def execute_move(self, move: Dict, analysis: Dict) -> Optional[int]:
+        whale = move['whale']
+        activity = move['activity']
+        whale_move_id = move['whale_move_id']
+        fields = self._move_fields(activity)
+        market_id = fields['market_id']
+        market_question = fields['market_question']
+        side = fields['side'].upper()
+        size = fields['size']
+        price = fields['price']
         
         if not analysis['copy'] or analysis['confidence'] < self.min_confidence:
             self.repo.mark_move_processed(whale_move_id)
-            print(f"Skipping trade: {analysis['reasoning']}")
+            print(f"Skipping trade [{analysis.get('tier', 'llm')}]: {analysis['reasoning']}")
             return None
         
         our_size = self.calculate_position_size(size, whale.get('profit', 0))
+        token_id = activity.get('tokenId', activity.get('token_id', ''))
+        our_price = price
+        limit_price = price
+        
+        book = self.books.get(token_id) if token_id else None
+        if book is not None:
+            fill_price = book.vwap(side, our_size)
+            if fill_price is None:
+                self.repo.mark_move_processed(whale_move_id)
+                print(f"Skipping trade: not enough liquidity for {side} {our_size:.2f}")
+                return None
+            our_price = fill_price
+            limit_price = book.price_for_size(side, our_size)
         
         trade_id = self.repo.save_trade(
             whale_wallet=whale.get('wallet', ''),
@@ -142,41 +346,60 @@ Respond with JSON:
             whale_price=price,
             our_side=side,
             our_size=our_size,
-            our_price=price,
+            our_price=our_price,
             reasoning=analysis['reasoning'],
             confidence=analysis['confidence'],
             status='pending'
         )
+        self.prefilter.mark_copied(market_id, side)
         
         if ENABLE_TRADING:
-            token_id = activity.get('tokenId', activity.get('token_id', ''))
             if token_id:
                 result = None
                 if side == 'BUY':
-                    result = self.trader.buy(token_id, our_size, price)
+                    result = self.trader.buy(token_id, our_size, limit_price)
                 else:
-                    result = self.trader.sell(token_id, our_size, price)
+                    result = self.trader.sell(token_id, our_size, limit_price)
                 
                 if result:
                     self.repo.update_trade_status(trade_id, 'executed', datetime.now())
-                    print(f"Trade executed: {side} ${our_size:.2f} @ {price}")
+                    print(f"Trade executed: {side} ${our_size:.2f} @ {our_price}")
                 else:
                     self.repo.update_trade_status(trade_id, 'failed')
                     print(f"Trade failed: {side} ${our_size:.2f}")
             else:
                 self.repo.update_trade_status(trade_id, 'no_token_id')
         else:
-            print(f"Trade logged (trading disabled): {side} ${our_size:.2f} @ {price}")
+            print(f"Trade logged (trading disabled): {side} ${our_size:.2f} @ {our_price}")
         
         self.repo.mark_move_processed(whale_move_id)
         return trade_id
     
+    def process_whale_activity(self, whale: Dict, activity: Dict) -> Optional[int]:
+        move = self.prepare_move(whale, activity)
+        if move is None:
+            return None
+        return self.execute_move(move, self.analyze_trade(whale, activity))
+    
+    def process_whale_moves(self, moves: List[Dict]) -> List[int]:
+        if not moves:
+            return []
+        analyses = self.analyze_trades(moves)
+        trade_ids = []
+        for move in moves:
+            trade_id = self.execute_move(move, analyses[move['id']])
+            if trade_id is not None:
+                trade_ids.append(trade_id)
+        return trade_ids
+    
     def monitor_whales(self, top_n: int = 20, interval: int = 60):
         print(f"Monitoring top {top_n} whales every {interval}s...")
         
         while True:
             try:
                 whales = self.copytrading.fetch_top_whales(top_n)
+                pending = []
+                window_start = None
                 
                 for whale in whales[:10]:
                     wallet = whale.get('wallet')
@@ -187,10 +410,20 @@ Respond with JSON:
                     
                     for activity in activities:
                         if activity.get('type') in ['TRADE', 'BUY', 'SELL']:
-                            self.process_whale_activity(whale, activity)
+                            move = self.prepare_move(whale, activity)
+                            if move is not None:
+                                pending.append(move)
+                                window_start = window_start or time.time()
+                    
+                    # Moves seen within one window share a single GigaBrain round trip
+                    if pending and (len(pending) >= self.batch_size or time.time() - window_start >= self.batch_window):
+                        self.process_whale_moves(pending)
+                        pending = []
+                        window_start = None
                     
                     time.sleep(0.5)
                 
+                self.process_whale_moves(pending)
                 print(f"[{datetime.now().strftime('%H:%M:%S')}] Scan complete. Waiting {interval}s...")
                 time.sleep(interval)
                 
@@ -204,5 +437,17 @@ Respond with JSON:
     def get_stats(self) -> Dict:
         return self.repo.get_pnl_summary()
     
+    def get_analysis_stats(self) -> Dict:
+        avoided = sum(count for tier, count in self.tiers.items() if tier in ('rules', 'cache'))
+        llm_avg = self.llm_time / self.llm_calls if self.llm_calls else 0.0
+        return {
+            'tiers': dict(self.tiers),
+            'llm_calls': self.llm_calls,
+            'llm_avg_s': llm_avg,
+            'llm_calls_avoided': avoided,
+            'latency_saved_s': avoided * llm_avg,
+            'prefilter': self.prefilter.stats()
+        }
+    
     def get_recent_trades(self, limit: int = 20) -> List[Dict]:
         return self.repo.get_trade_history(limit)
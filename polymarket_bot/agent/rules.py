@@ -0,0 +1,125 @@
+import time
+from datetime import datetime
+from typing import List, Dict, Optional, Callable, Tuple
+from ..config import (
+    COPY_MIN_WHALE_PROFIT,
+    COPY_PRICE_FLOOR,
+    COPY_PRICE_CEILING,
+    COPY_MAX_MOVE_AGE,
+    COPY_AUTO_PROFIT,
+    COPY_AUTO_SIZE
+)
+
+Rule = Callable[[Dict, Dict, Dict], Optional[Dict]]
+
+
+def _decision(rule: str, copy: bool, confidence: float, reasoning: str) -> Dict:
+    return {'copy': copy, 'confidence': confidence, 'reasoning': reasoning, 'tier': f'rules:{rule}'}
+
+
+def parse_timestamp(value) -> Optional[float]:
+    if value in (None, ''):
+        return None
+    try:
+        ts = float(value)
+        return ts / 1000 if ts > 1e12 else ts
+    except (TypeError, ValueError):
+        pass
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00')).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+class MovePrefilter:
+    def __init__(
+        self,
+        min_whale_profit: float = COPY_MIN_WHALE_PROFIT,
+        price_floor: float = COPY_PRICE_FLOOR,
+        price_ceiling: float = COPY_PRICE_CEILING,
+        max_move_age: float = COPY_MAX_MOVE_AGE,
+        auto_profit: float = COPY_AUTO_PROFIT,
+        auto_size: float = COPY_AUTO_SIZE
+    ):
+        self.min_whale_profit = min_whale_profit
+        self.price_floor = price_floor
+        self.price_ceiling = price_ceiling
+        self.max_move_age = max_move_age
+        self.auto_profit = auto_profit
+        self.auto_size = auto_size
+        self.copied: set = set()
+        # Cheapest and most decisive checks first; the first rule that answers wins
+        self.rules: List[Tuple[str, Rule]] = [
+            ('duplicate', self._duplicate),
+            ('closed', self._closed),
+            ('extreme_price', self._extreme_price),
+            ('small_whale', self._small_whale),
+            ('auto_copy', self._auto_copy)
+        ]
+        self.hits: Dict[str, int] = {name: 0 for name, _ in self.rules}
+        self.checked = 0
+        self.escalated = 0
+        self.check_time = 0.0
+    
+    def mark_copied(self, market_id: str, side: str):
+        self.copied.add((market_id, side.upper()))
+    
+    def _duplicate(self, whale: Dict, activity: Dict, fields: Dict) -> Optional[Dict]:
+        if (fields['market_id'], fields['side'].upper()) in self.copied:
+            return _decision('duplicate', False, 1.0, 'Already copied this market and side')
+        return None
+    
+    def _closed(self, whale: Dict, activity: Dict, fields: Dict) -> Optional[Dict]:
+        if activity.get('closed') or activity.get('resolved'):
+            return _decision('closed', False, 1.0, 'Market already closed')
+        now = time.time()
+        end = parse_timestamp(activity.get('endDate'))
+        if end is not None and end <= now:
+            return _decision('closed', False, 1.0, 'Market already closed')
+        moved = parse_timestamp(activity.get('timestamp'))
+        if moved is not None and self.max_move_age and now - moved > self.max_move_age:
+            return _decision('closed', False, 1.0, f'Move is older than {self.max_move_age:.0f}s')
+        return None
+    
+    def _extreme_price(self, whale: Dict, activity: Dict, fields: Dict) -> Optional[Dict]:
+        price = fields['price']
+        if price <= self.price_floor or price >= self.price_ceiling:
+            return _decision('extreme_price', False, 1.0, f'Price {price} leaves no edge to copy')
+        return None
+    
+    def _small_whale(self, whale: Dict, activity: Dict, fields: Dict) -> Optional[Dict]:
+        profit = float(whale.get('profit', 0) or 0)
+        if profit < self.min_whale_profit:
+            return _decision('small_whale', False, 0.9, f'Whale profit ${profit:,.0f} below ${self.min_whale_profit:,.0f}')
+        return None
+    
+    def _auto_copy(self, whale: Dict, activity: Dict, fields: Dict) -> Optional[Dict]:
+        if not self.auto_profit:
+            return None
+        profit = float(whale.get('profit', 0) or 0)
+        if profit >= self.auto_profit and fields['size'] >= self.auto_size:
+            return _decision('auto_copy', True, 0.75, f'Top whale (${profit:,.0f}) with a ${fields["size"]:,.0f} move')
+        return None
+    
+    def check(self, whale: Dict, activity: Dict, fields: Dict) -> Optional[Dict]:
+        started = time.perf_counter()
+        self.checked += 1
+        try:
+            for name, rule in self.rules:
+                decision = rule(whale, activity, fields)
+                if decision is not None:
+                    self.hits[name] += 1
+                    return decision
+            self.escalated += 1
+            return None
+        finally:
+            self.check_time += time.perf_counter() - started
+    
+    def stats(self) -> Dict:
+        return {
+            'checked': self.checked,
+            'decided': self.checked - self.escalated,
+            'escalated': self.escalated,
+            'rules': dict(self.hits),
+            'avg_check_us': self.check_time / self.checked * 1e6 if self.checked else 0.0
+        }
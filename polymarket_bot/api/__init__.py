@@ -1,4 +1,15 @@
 from .gigabrain import GigaBrainClient
 from .dune import DuneClient
+from .decisions import DecisionCache, get_decision_cache
+from .scheduler import LLMScheduler, LLMRequest, DeadlineExceeded, get_llm_scheduler
 
-__all__ = ['GigaBrainClient', 'DuneClient']
+__all__ = [
+    'GigaBrainClient',
+    'DuneClient',
+    'DecisionCache',
+    'get_decision_cache',
+    'LLMScheduler',
+    'LLMRequest',
+    'DeadlineExceeded',
+    'get_llm_scheduler'
+]
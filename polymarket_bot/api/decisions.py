@@ -0,0 +1,149 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Any, Callable
+from ..config import DECISION_CACHE_SIZE, DECISION_CACHE_TTL, DECISION_CACHE_REDIS
+from ..copytrading.cache import RedisCache
+
+
+def _normalize(value: Any, precision: int) -> Any:
+    if isinstance(value, float):
+        return round(value, precision)
+    if isinstance(value, dict):
+        return {str(k): _normalize(v, precision) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v, precision) for v in value]
+    return value
+
+
+class DecisionCache:
+    def __init__(
+        self,
+        max_size: int = DECISION_CACHE_SIZE,
+        ttl: float = DECISION_CACHE_TTL,
+        redis=None,
+        namespace: str = 'decisions'
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.redis = redis
+        self.namespace = namespace
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def key(self, kind: str, inputs: Dict, precision: int = 2) -> str:
+        payload = json.dumps(_normalize(inputs, precision), sort_keys=True, default=str)
+        return f"{kind}:{hashlib.sha1(payload.encode()).hexdigest()}"
+    
+    def _redis_key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+    
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+        
+        if self.redis is not None:
+            value = self.redis.get(self._redis_key(key))
+            if isinstance(value, dict) and 'value' in value:
+                with self._lock:
+                    self.redis_hits += 1
+                self._store(key, value['value'], value.get('expires_at', now + self.ttl))
+                return value['value']
+        
+        with self._lock:
+            self.misses += 1
+        return None
+    
+    def _store(self, key: str, value: Any, expires_at: float):
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def put(self, key: str, value: Any, ttl: Optional[float] = None, expires_at: Optional[float] = None):
+        now = time.time()
+        expiry = now + (self.ttl if ttl is None else ttl)
+        # A decision about an interval is worthless once the interval has closed
+        if expires_at is not None:
+            expiry = min(expiry, expires_at)
+        if expiry <= now:
+            return
+        
+        self._store(key, value, expiry)
+        if self.redis is not None:
+            self.redis.set(
+                self._redis_key(key),
+                {'value': value, 'expires_at': expiry},
+                max(int(expiry - now), 1)
+            )
+    
+    def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        ttl: Optional[float] = None,
+        expires_at: Optional[float] = None,
+        cacheable: Callable[[Any], bool] = None
+    ) -> Any:
+        value = self.get(key)
+        if value is not None:
+            return value
+        value = compute()
+        if value is not None and (cacheable is None or cacheable(value)):
+            self.put(key, value, ttl, expires_at)
+        return value
+    
+    def invalidate(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.redis is not None:
+            self.redis.delete(self._redis_key(key))
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            hits = self.hits + self.redis_hits
+            lookups = hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'redis_hits': self.redis_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': hits / lookups if lookups else 0.0,
+                'redis': self.redis is not None and self.redis.client is not None
+            }
+
+
+_cache: Optional[DecisionCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_decision_cache() -> DecisionCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                redis = RedisCache() if DECISION_CACHE_REDIS else None
+                _cache = DecisionCache(redis=redis if redis is not None and redis.client else None)
+    return _cache
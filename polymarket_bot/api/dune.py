@@ -1,14 +1,13 @@
-import requests
 from typing import Dict, Optional, List
 from ..config import DUNE_API_KEY
+from ..utils.http import get_session
 
 
 class DuneClient:
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or DUNE_API_KEY
         self.base_url = "https://api.dune.com/api/v1"
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.session = get_session({
             'Content-Type': 'application/json'
         })
     
@@ -1,50 +1,192 @@
-import subprocess
+import asyncio
 import json
-from typing import Dict, Optional, List
+import time
+import httpx
+import requests
+from typing import Dict, Optional, List, Callable
 from ..config import GIGABRAIN_API_KEY, GIGABRAIN_BASE_URL
+from ..utils.http import get_session
+
+# Callers have always seen this for a request that never produced a response
+TRANSPORT_ERROR = 'curl failed'
 
 
 class GigaBrainClient:
-    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        chat_timeout: float = 90,
+        sessions_timeout: float = 10
+    ):
         self.api_key = api_key or GIGABRAIN_API_KEY
         self.base_url = (base_url or GIGABRAIN_BASE_URL or 'https://api.gigabrain.gg').rstrip('/')
+        self.chat_timeout = chat_timeout
+        self.sessions_timeout = sessions_timeout
+        self.headers = {
+            'Authorization': f'Bearer {self.api_key}',
+            'Content-Type': 'application/json'
+        }
+        self.session = get_session(self.headers)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    async def _get_client(self) -> httpx.AsyncClient:
+        # httpx pools are bound to the loop that created them
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            if self._client is not None:
+                try:
+                    await self._client.aclose()
+                except Exception:
+                    pass
+            self._client = httpx.AsyncClient(headers=self.headers, timeout=httpx.Timeout(self.chat_timeout, pool=None))
+            self._loop = loop
+        return self._client
+    
+    def _chat_timeout(self, timeout: Optional[float]) -> float:
+        # A caller's deadline can cut a call short but never stretch it past chat_timeout
+        return min(timeout, self.chat_timeout) if timeout else self.chat_timeout
     
-    def chat(self, message: str) -> Dict:
+    def _parse_chat(self, body: str) -> Dict:
+        if not body.strip():
+            return {'error': 'empty response', 'success': False}
+        return json.loads(body)
+    
+    def chat(self, message: str, timeout: Optional[float] = None) -> Dict:
         try:
-            cmd = [
-                'curl', '-s', '-X', 'POST',
+            resp = self.session.post(
                 f'{self.base_url}/v1/chat',
-                '-H', f'Authorization: Bearer {self.api_key}',
-                '-H', 'Content-Type: application/json',
-                '-d', json.dumps({'message': message, 'stream': False}),
-                '--max-time', '90'
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=100)
-            
-            if result.returncode != 0:
-                return {'error': 'curl failed', 'success': False}
-            
-            if not result.stdout.strip():
-                return {'error': 'empty response', 'success': False}
-            
-            return json.loads(result.stdout)
-        except subprocess.TimeoutExpired:
+                json={'message': message, 'stream': False},
+                timeout=self._chat_timeout(timeout)
+            )
+            return self._parse_chat(resp.text)
+        except requests.Timeout:
             return {'error': 'timeout', 'success': False}
+        except requests.RequestException:
+            return {'error': TRANSPORT_ERROR, 'success': False}
+        except Exception as e:
+            return {'error': str(e), 'success': False}
+    
+    def _chunk_text(self, line: str) -> Optional[str]:
+        # Server-sent events carry the token payload on "data:" lines
+        sse = line.startswith('data:')
+        if sse:
+            line = line[6:] if line.startswith('data: ') else line[5:]
+            if line.strip() == '[DONE]':
+                return None
+        elif not line or line.startswith(('event:', 'id:', 'retry:', ':')):
+            return ''
+        
+        try:
+            payload = json.loads(line)
+        except ValueError:
+            # Plain-text streams are split on newlines, so put them back
+            return line if sse else line + '\n'
+        if not isinstance(payload, dict):
+            return str(payload)
+        
+        delta = payload.get('delta')
+        if isinstance(delta, dict):
+            delta = delta.get('content') or delta.get('text')
+        choices = payload.get('choices')
+        if not delta and isinstance(choices, list) and choices:
+            delta = (choices[0].get('delta') or {}).get('content')
+        return delta or payload.get('content') or payload.get('text') or payload.get('token') or ''
+    
+    def chat_stream(
+        self,
+        message: str,
+        on_token: Optional[Callable[[str], None]] = None,
+        timeout: Optional[float] = None
+    ) -> Dict:
+        parts: List[str] = []
+        timeout = self._chat_timeout(timeout)
+        deadline = time.time() + timeout
+        try:
+            with self.session.post(
+                f'{self.base_url}/v1/chat',
+                json={'message': message, 'stream': True},
+                timeout=timeout,
+                stream=True
+            ) as resp:
+                # Without a charset requests yields bytes (or latin-1 for text/*); the API sends UTF-8
+                if 'charset' not in resp.headers.get('Content-Type', '').lower():
+                    resp.encoding = 'utf-8'
+                for line in resp.iter_lines(chunk_size=None, decode_unicode=True):
+                    if time.time() > deadline:
+                        return {'error': 'timeout', 'success': False, 'content': ''.join(parts)}
+                    text = self._chunk_text(line or '')
+                    if text is None:
+                        break
+                    if text:
+                        parts.append(text)
+                        if on_token is not None:
+                            on_token(text)
+        except requests.Timeout:
+            return {'error': 'timeout', 'success': False, 'content': ''.join(parts)}
+        except requests.RequestException:
+            return {'error': TRANSPORT_ERROR, 'success': False, 'content': ''.join(parts)}
+        except Exception as e:
+            return {'error': str(e), 'success': False, 'content': ''.join(parts)}
+        
+        content = ''.join(parts)
+        try:
+            # Servers that ignore stream=True answer with the usual JSON body
+            body = json.loads(content)
+            if isinstance(body, dict):
+                return body
+        except ValueError:
+            pass
+        if not content.strip():
+            return {'error': 'empty response', 'success': False}
+        return {'content': content}
+    
+    async def achat(self, message: str, timeout: Optional[float] = None) -> Dict:
+        try:
+            client = await self._get_client()
+            resp = await client.post(
+                f'{self.base_url}/v1/chat',
+                json={'message': message, 'stream': False},
+                timeout=self._chat_timeout(timeout)
+            )
+            return self._parse_chat(resp.text)
+        except httpx.TimeoutException:
+            return {'error': 'timeout', 'success': False}
+        except httpx.HTTPError:
+            return {'error': TRANSPORT_ERROR, 'success': False}
         except Exception as e:
             return {'error': str(e), 'success': False}
     
     def get_sessions(self, limit: int = 10) -> List[Dict]:
         try:
-            cmd = [
-                'curl', '-s',
-                f'{self.base_url}/v1/sessions?limit={limit}',
-                '-H', f'Authorization: Bearer {self.api_key}',
-                '--max-time', '10'
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=15)
-            if result.stdout:
-                return json.loads(result.stdout)
+            resp = self.session.get(
+                f'{self.base_url}/v1/sessions',
+                params={'limit': limit},
+                timeout=self.sessions_timeout
+            )
+            if resp.text:
+                return resp.json()
             return []
         except Exception:
             return []
+    
+    async def aget_sessions(self, limit: int = 10) -> List[Dict]:
+        try:
+            client = await self._get_client()
+            resp = await client.get(
+                f'{self.base_url}/v1/sessions',
+                params={'limit': limit},
+                timeout=self.sessions_timeout
+            )
+            if resp.text:
+                return resp.json()
+            return []
+        except Exception:
+            return []
+    
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._loop = None
@@ -0,0 +1,210 @@
+import heapq
+import itertools
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from dataclasses import dataclass, field
+from typing import List, Dict, Optional, Callable, Any
+from ..config import LLM_MAX_CONCURRENCY, LLM_IDLE_SLACK, LLM_CALL_TIMEOUT
+
+LLMCall = Callable[[Optional[float]], Any]
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+@dataclass(order=True)
+class LLMRequest:
+    priority: float
+    seq: int
+    call: LLMCall = field(compare=False)
+    future: Future = field(compare=False)
+    deadline: Optional[float] = field(default=None, compare=False)
+    label: str = field(default='llm', compare=False)
+    submitted_at: float = field(default_factory=time.time, compare=False)
+
+
+class LLMScheduler:
+    def __init__(
+        self,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        idle_slack: float = LLM_IDLE_SLACK,
+        call_timeout: float = LLM_CALL_TIMEOUT,
+        samples: int = 1000
+    ):
+        self.max_concurrency = max_concurrency
+        self.idle_slack = idle_slack
+        self.call_timeout = call_timeout
+        self._queue: List[LLMRequest] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._workers: List[threading.Thread] = []
+        self._stop = False
+        self._latency: Optional[float] = None
+        self._waits: deque = deque(maxlen=samples)
+        self._runs: deque = deque(maxlen=samples)
+        self.in_flight = 0
+        self.max_depth = 0
+        self.counts = {'submitted': 0, 'completed': 0, 'failed': 0, 'expired': 0, 'cancelled': 0}
+    
+    def priority(self, deadline: Optional[float] = None, size: float = 0.0) -> float:
+        # Seconds of slack, so the market closing soonest goes first; bigger whale moves are pulled forward
+        slack = deadline - time.time() if deadline else self.idle_slack
+        return slack / (1 + math.log10(1 + max(size, 0.0)))
+    
+    def _ensure_workers(self):
+        self._workers = [w for w in self._workers if w.is_alive()]
+        while len(self._workers) < self.max_concurrency:
+            worker = threading.Thread(target=self._work, name=f'polybrain-llm-{len(self._workers)}', daemon=True)
+            worker.start()
+            self._workers.append(worker)
+    
+    def submit(
+        self,
+        call: LLMCall,
+        priority: Optional[float] = None,
+        deadline: Optional[float] = None,
+        label: str = 'llm'
+    ) -> Future:
+        future = Future()
+        request = LLMRequest(
+            priority=self.priority(deadline) if priority is None else priority,
+            seq=next(self._seq),
+            call=call,
+            future=future,
+            deadline=deadline,
+            label=label
+        )
+        with self._cond:
+            self._stop = False
+            self._ensure_workers()
+            heapq.heappush(self._queue, request)
+            self.counts['submitted'] += 1
+            self.max_depth = max(self.max_depth, len(self._queue))
+            self._cond.notify()
+        return future
+    
+    def run(
+        self,
+        call: LLMCall,
+        priority: Optional[float] = None,
+        deadline: Optional[float] = None,
+        label: str = 'llm'
+    ) -> Any:
+        future = self.submit(call, priority, deadline, label)
+        try:
+            return future.result(timeout=deadline - time.time() if deadline else None)
+        except FutureTimeout:
+            future.cancel()
+            raise DeadlineExceeded(f"{label} missed its deadline")
+    
+    def _expired(self, request: LLMRequest, now: float) -> bool:
+        if request.deadline is None:
+            return False
+        # An answer expected after the market closes is not worth a slot
+        return now + (self._latency or 0.0) > request.deadline
+    
+    def _next(self) -> Optional[LLMRequest]:
+        with self._cond:
+            while True:
+                while not self._queue and not self._stop:
+                    self._cond.wait()
+                if self._stop:
+                    return None
+                
+                request = heapq.heappop(self._queue)
+                now = time.time()
+                if not request.future.set_running_or_notify_cancel():
+                    self.counts['cancelled'] += 1
+                    continue
+                if self._expired(request, now):
+                    self.counts['expired'] += 1
+                    request.future.set_exception(DeadlineExceeded(f"{request.label} would finish after its deadline"))
+                    continue
+                
+                self.in_flight += 1
+                self._waits.append(now - request.submitted_at)
+                return request
+    
+    def _work(self):
+        while True:
+            request = self._next()
+            if request is None:
+                return
+            
+            started = time.time()
+            timeout = self.call_timeout
+            if request.deadline:
+                # The deadline only shortens a call; a hung one must not hold a slot until the market closes
+                remaining = request.deadline - started
+                if remaining <= 0:
+                    with self._cond:
+                        self.counts['expired'] += 1
+                        self.in_flight -= 1
+                    request.future.set_exception(DeadlineExceeded(f"{request.label} reached its deadline before it started"))
+                    continue
+                timeout = min(remaining, self.call_timeout)
+            try:
+                result = request.call(timeout)
+            except Exception as e:
+                with self._cond:
+                    self.counts['failed'] += 1
+                    self.in_flight -= 1
+                request.future.set_exception(e)
+                continue
+            
+            elapsed = time.time() - started
+            with self._cond:
+                self.counts['completed'] += 1
+                self.in_flight -= 1
+                self._runs.append(elapsed)
+                self._latency = elapsed if self._latency is None else 0.8 * self._latency + 0.2 * elapsed
+            request.future.set_result(result)
+    
+    def shutdown(self):
+        with self._cond:
+            self._stop = True
+            pending, self._queue = self._queue, []
+            self._cond.notify_all()
+        for request in pending:
+            request.future.cancel()
+    
+    def stats(self) -> Dict:
+        def summary(values: List[float]) -> Dict:
+            if not values:
+                return {'count': 0}
+            values = sorted(values)
+            return {
+                'count': len(values),
+                'p50_s': values[len(values) // 2],
+                'p99_s': values[min(len(values) - 1, int(len(values) * 0.99))],
+                'max_s': values[-1]
+            }
+        
+        with self._cond:
+            return {
+                'max_concurrency': self.max_concurrency,
+                'queue_depth': len(self._queue),
+                'max_depth': self.max_depth,
+                'in_flight': self.in_flight,
+                'expected_latency_s': self._latency,
+                'wait': summary(list(self._waits)),
+                'run': summary(list(self._runs)),
+                **self.counts
+            }
+
+
+_scheduler: Optional[LLMScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = LLMScheduler()
+    return _scheduler
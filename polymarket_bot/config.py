@@ -17,10 +17,61 @@ MIN_MARKET_LIQUIDITY = float(os.getenv('MIN_MARKET_LIQUIDITY', '1000.0'))
 ENABLE_PRICE_ALERTS = os.getenv('ENABLE_PRICE_ALERTS', 'true').lower() == 'true'
 ENABLE_VOLUME_ALERTS = os.getenv('ENABLE_VOLUME_ALERTS', 'true').lower() == 'true'
 
+FETCH_MAX_WORKERS = int(os.getenv('FETCH_MAX_WORKERS', '16'))
+FETCH_DEADLINE = float(os.getenv('FETCH_DEADLINE', '2.0'))
+GAMMA_SLUG_BATCH_SIZE = int(os.getenv('GAMMA_SLUG_BATCH_SIZE', '25'))
+GAMMA_PAGE_SIZE = int(os.getenv('GAMMA_PAGE_SIZE', '500'))
+GAMMA_MAX_PAGES = int(os.getenv('GAMMA_MAX_PAGES', '100'))
+INTERVAL_HORIZON = int(os.getenv('INTERVAL_HORIZON', '6'))
+PREFETCH_LEAD = float(os.getenv('PREFETCH_LEAD', '15'))
+PREFETCH_GRACE = float(os.getenv('PREFETCH_GRACE', '5'))
+CLOB_WS_URL = os.getenv('CLOB_WS_URL', 'wss://ws-subscriptions-clob.polymarket.com/ws/market')
+ENABLE_MARKET_STREAM = os.getenv('ENABLE_MARKET_STREAM', 'true').lower() == 'true'
+MARKET_STREAM_PING_INTERVAL = float(os.getenv('MARKET_STREAM_PING_INTERVAL', '10'))
+MARKET_STREAM_MAX_BACKOFF = float(os.getenv('MARKET_STREAM_MAX_BACKOFF', '30'))
+ORDERBOOK_MAX_AGE = float(os.getenv('ORDERBOOK_MAX_AGE', '2'))
+CLOB_BATCH_SIZE = int(os.getenv('CLOB_BATCH_SIZE', '100'))
+REFERENCE_WS_URL = os.getenv('REFERENCE_WS_URL', 'wss://stream.binance.com:9443/stream')
+REFERENCE_REST_URL = os.getenv('REFERENCE_REST_URL', 'https://api.binance.com/api/v3/ticker/price')
+REFERENCE_HISTORY = int(os.getenv('REFERENCE_HISTORY', '3600'))
+REFERENCE_STALE_AFTER = float(os.getenv('REFERENCE_STALE_AFTER', '5'))
+ASYNC_MAX_CONNECTIONS = int(os.getenv('ASYNC_MAX_CONNECTIONS', '100'))
+ASYNC_MAX_CONCURRENCY = int(os.getenv('ASYNC_MAX_CONCURRENCY', '200'))
+MARKET_CACHE_SIZE = int(os.getenv('MARKET_CACHE_SIZE', '2048'))
+MARKET_REFRESH_TTL = float(os.getenv('MARKET_REFRESH_TTL', str(POLL_INTERVAL)))
+MARKET_MISS_TTL = float(os.getenv('MARKET_MISS_TTL', '30'))
+MARKET_METADATA_TTL = float(os.getenv('MARKET_METADATA_TTL', '60'))
+
+HTTP_TIMEOUT = float(os.getenv('HTTP_TIMEOUT', '10'))
+HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', '10'))
+HTTP_RETRIES = int(os.getenv('HTTP_RETRIES', '3'))
+HTTP_BACKOFF = float(os.getenv('HTTP_BACKOFF', '0.3'))
+
 REDIS_HOST = os.getenv('REDIS_HOST', 'localhost')
 REDIS_PORT = int(os.getenv('REDIS_PORT', '6379'))
 REDIS_DB = int(os.getenv('REDIS_DB', '0'))
 
+DECISION_CACHE_SIZE = int(os.getenv('DECISION_CACHE_SIZE', '512'))
+DECISION_CACHE_TTL = float(os.getenv('DECISION_CACHE_TTL', '900'))
+DECISION_CACHE_REDIS = os.getenv('DECISION_CACHE_REDIS', 'false').lower() == 'true'
+COPY_BATCH_SIZE = int(os.getenv('COPY_BATCH_SIZE', '10'))
+COPY_BATCH_WINDOW = float(os.getenv('COPY_BATCH_WINDOW', '2'))
+COPY_MIN_WHALE_PROFIT = float(os.getenv('COPY_MIN_WHALE_PROFIT', '1000'))
+COPY_PRICE_FLOOR = float(os.getenv('COPY_PRICE_FLOOR', '0.03'))
+COPY_PRICE_CEILING = float(os.getenv('COPY_PRICE_CEILING', '0.97'))
+COPY_MAX_MOVE_AGE = float(os.getenv('COPY_MAX_MOVE_AGE', '3600'))
+COPY_AUTO_PROFIT = float(os.getenv('COPY_AUTO_PROFIT', '0'))
+COPY_AUTO_SIZE = float(os.getenv('COPY_AUTO_SIZE', '1000'))
+
+WHALE_SYNC_WORKERS = int(os.getenv('WHALE_SYNC_WORKERS', '16'))
+WHALE_HISTORY_SIZE = int(os.getenv('WHALE_HISTORY_SIZE', '500'))
+WHALE_HISTORY_TTL = int(os.getenv('WHALE_HISTORY_TTL', '604800'))
+
+BRAIN_STREAMING = os.getenv('BRAIN_STREAMING', 'true').lower() == 'true'
+LLM_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', '2'))
+LLM_IDLE_SLACK = float(os.getenv('LLM_IDLE_SLACK', '300'))
+LLM_CALL_TIMEOUT = float(os.getenv('LLM_CALL_TIMEOUT', '90'))
+
 MAX_POSITION_SIZE = float(os.getenv('MAX_POSITION_SIZE', '100.0'))
 MIN_PROFIT_PCT = float(os.getenv('MIN_PROFIT_PCT', '2.0'))
 MAX_LOSS_PCT = float(os.getenv('MAX_LOSS_PCT', '-5.0'))
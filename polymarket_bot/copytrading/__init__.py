@@ -1,6 +1,6 @@
 from .leaderboard import LeaderboardFetcher, LeaderboardEntry
 from .cache import RedisCache
-from .service import CopyTradingService
+from .service import CopyTradingService, SyncReport
 from .scheduler import HourlyScheduler
 
-__all__ = ['LeaderboardFetcher', 'LeaderboardEntry', 'RedisCache', 'CopyTradingService', 'HourlyScheduler']
+__all__ = ['LeaderboardFetcher', 'LeaderboardEntry', 'RedisCache', 'CopyTradingService', 'SyncReport', 'HourlyScheduler']
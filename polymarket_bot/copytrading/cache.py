@@ -34,21 +34,48 @@ class RedisCache:
             print(f"Redis set error: {e}")
             return False
     
+    def _decode(self, value: Optional[str]) -> Optional[Any]:
+        if value is None:
+            return None
+        try:
+            return json.loads(value)
+        except Exception:
+            return value
+    
     def get(self, key: str) -> Optional[Any]:
         if not self.client:
             return None
         try:
-            value = self.client.get(key)
-            if value is None:
-                return None
-            try:
-                return json.loads(value)
-            except Exception:
-                return value
+            return self._decode(self.client.get(key))
         except Exception as e:
             print(f"Redis get error: {e}")
             return None
     
+    def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        if not self.client or not keys:
+            return [None] * len(keys)
+        try:
+            return [self._decode(value) for value in self.client.mget(keys)]
+        except Exception as e:
+            print(f"Redis mget error: {e}")
+            return [None] * len(keys)
+    
+    def set_many(self, items: Dict[str, Any], ttl: int = 3600) -> bool:
+        if not self.client or not items:
+            return False
+        try:
+            # MSET has no TTL, so queue SETEX per key and send them in one round trip
+            pipe = self.client.pipeline(transaction=False)
+            for key, value in items.items():
+                if isinstance(value, (dict, list)):
+                    value = json.dumps(value)
+                pipe.setex(key, ttl, value)
+            pipe.execute()
+            return True
+        except Exception as e:
+            print(f"Redis set_many error: {e}")
+            return False
+    
     def delete(self, key: str):
         if not self.client:
             return False
@@ -74,6 +101,12 @@ class RedisCache:
         key = self._key("whale", wallet)
         return self.get(key)
     
+    def cache_whales(self, whales: Dict[str, Dict], ttl: int = 3600):
+        return self.set_many({self._key("whale", wallet): data for wallet, data in whales.items()}, ttl)
+    
+    def get_whales(self, wallets: List[str]) -> Dict[str, Optional[Dict]]:
+        return dict(zip(wallets, self.mget([self._key("whale", wallet) for wallet in wallets])))
+    
     def cache_whale_trades(self, wallet: str, trades: List[Dict], ttl: int = 3600):
         key = self._key("whale_trades", wallet)
         return self.set(key, trades, ttl)
@@ -82,14 +115,63 @@ class RedisCache:
         key = self._key("whale_trades", wallet)
         return self.get(key)
     
+    def get_cursor(self, wallet: str) -> Optional[Dict]:
+        key = self._key("cursor", wallet)
+        return self.get(key)
+    
+    def get_whale_history(self, wallet: str, limit: int = 100) -> List[Dict]:
+        if not self.client:
+            return []
+        try:
+            key = self._key("history", wallet)
+            return [json.loads(item) for item in self.client.lrange(key, 0, limit - 1)]
+        except Exception as e:
+            print(f"Redis history error: {e}")
+            return []
+    
+    def get_whales_trades(self, wallets: List[str], limit: int = 100) -> Dict[str, List[Dict]]:
+        if not self.client or not wallets:
+            return {wallet: [] for wallet in wallets}
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for wallet in wallets:
+                pipe.lrange(self._key("history", wallet), 0, limit - 1)
+            histories = pipe.execute()
+            return {wallet: [json.loads(item) for item in items or []] for wallet, items in zip(wallets, histories)}
+        except Exception as e:
+            print(f"Redis history error: {e}")
+            return {wallet: [] for wallet in wallets}
+    
+    def append_whale_history(self, wallet: str, items: List[Dict], cursor: Dict, max_len: int = 500, ttl: int = 604800):
+        if not self.client:
+            return False
+        try:
+            key = self._key("history", wallet)
+            # Newest first like the API; history and cursor move in one transaction so a failed write never skips trades
+            pipe = self.client.pipeline()
+            if items:
+                pipe.lpush(key, *[json.dumps(item) for item in reversed(items)])
+                pipe.ltrim(key, 0, max_len - 1)
+                pipe.expire(key, ttl)
+            pipe.setex(self._key("cursor", wallet), ttl, json.dumps(cursor))
+            pipe.execute()
+            return True
+        except Exception as e:
+            print(f"Redis history error: {e}")
+            return False
+    
     def cache_top_whales(self, whales: List[Dict], ttl: int = 3600):
-        key = self._key("top", "whales")
+        updated_at = datetime.now().isoformat()
         metadata = {
             'whales': whales,
-            'updated_at': datetime.now().isoformat(),
+            'updated_at': updated_at,
             'count': len(whales)
         }
-        return self.set(key, metadata, ttl)
+        # updated_at also lives in its own small key so freshness checks skip decoding the whole list
+        return self.set_many({
+            self._key("top", "whales"): metadata,
+            self._key("top", "updated_at"): updated_at
+        }, ttl)
     
     def get_top_whales(self) -> Optional[List[Dict]]:
         key = self._key("top", "whales")
@@ -99,8 +181,6 @@ class RedisCache:
         return None
     
     def get_last_update_time(self) -> Optional[str]:
-        key = self._key("top", "whales")
-        data = self.get(key)
-        if data and isinstance(data, dict):
-            return data.get('updated_at')
-        return None
+        key = self._key("top", "updated_at")
+        value = self.get(key)
+        return str(value) if value else None
@@ -1,7 +1,7 @@
-import requests
 import re
 from typing import List, Dict, Optional
 from dataclasses import dataclass
+from ..utils.http import get_session
 
 
 @dataclass
@@ -15,8 +15,7 @@ class LeaderboardEntry:
 
 class LeaderboardFetcher:
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.session = get_session({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             'Accept': 'application/json, text/html',
             'Referer': 'https://polymarket.com/',
@@ -1,9 +1,41 @@
 import time
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field, asdict
+from typing import List, Dict, Optional, Callable, Iterable, Tuple
 from datetime import datetime
 from .leaderboard import LeaderboardFetcher
 from .cache import RedisCache
 from ..core.client import PolymarketClient
+from ..config import WHALE_SYNC_WORKERS, WHALE_HISTORY_SIZE, WHALE_HISTORY_TTL
+
+WALLET_FIELDS = ('wallet', 'address', 'proxy_wallet', 'user', 'trader')
+ACTIVITY_PAGE = 500
+
+
+def _activity_time(item: Dict) -> int:
+    try:
+        return int(float(item.get('timestamp') or 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _activity_key(item: Dict) -> str:
+    return f"{item.get('transactionHash', '')}:{item.get('asset', '')}:{item.get('side', '')}:{item.get('size', '')}"
+
+
+@dataclass
+class SyncReport:
+    total: int
+    synced: int = 0
+    failures: Dict[str, str] = field(default_factory=dict)
+    elapsed: float = 0.0
+    
+    @property
+    def done(self) -> int:
+        return self.synced + len(self.failures)
+    
+    def to_dict(self) -> Dict:
+        return {**asdict(self), 'done': self.done, 'failed': len(self.failures)}
 
 
 class CopyTradingService:
@@ -12,29 +44,69 @@ class CopyTradingService:
         self.polymarket_client = PolymarketClient()
         self.redis_cache = RedisCache()
         self.cache_ttl = 3600
+        self.sync_workers = WHALE_SYNC_WORKERS
+        self.last_sync: Optional[SyncReport] = None
+        self.history_size = WHALE_HISTORY_SIZE
+        self.history_ttl = WHALE_HISTORY_TTL
     
-    def fetch_whale_trades(self, wallet: str, limit: int = 100) -> List[Dict]:
-        cached = self.redis_cache.get_whale_trades(wallet)
-        if cached:
-            return cached
+    def sync_whale_history(self, wallet: str, strict: bool = False) -> int:
+        cursor = self.redis_cache.get_cursor(wallet) or {}
+        since = cursor.get('timestamp')
+        seen = set(cursor.get('keys', []))
+        page_size = min(self.history_size, ACTIVITY_PAGE)
+        
+        # Only trades at or after the high-water mark come back; a first sync backfills one bounded page
+        fresh: List[Dict] = []
+        offset = 0
+        while offset < self.history_size:
+            page = self.polymarket_client.get_user_activity(
+                wallet,
+                limit=page_size,
+                offset=offset,
+                activity_type='TRADE',
+                start=since,
+                strict=strict
+            )
+            fresh.extend(item for item in page if _activity_key(item) not in seen)
+            if since is None or len(page) < page_size:
+                break
+            offset += len(page)
         
+        if not fresh:
+            return 0
+        
+        fresh = fresh[:self.history_size]
+        latest = max(_activity_time(item) for item in fresh)
+        keys = [_activity_key(item) for item in fresh if _activity_time(item) == latest]
+        if latest == since:
+            keys.extend(seen)
+        self.redis_cache.append_whale_history(
+            wallet,
+            fresh,
+            {'timestamp': latest, 'keys': keys, 'synced_at': datetime.now().isoformat()},
+            self.history_size,
+            self.history_ttl
+        )
+        return len(fresh)
+    
+    def fetch_whale_trades(self, wallet: str, limit: int = 100, strict: bool = False) -> List[Dict]:
         try:
-            trades = self.polymarket_client.get_user_trades(wallet, limit=limit)
-            self.redis_cache.cache_whale_trades(wallet, trades, self.cache_ttl)
-            return trades
+            if not self.redis_cache.client:
+                return self.polymarket_client.get_user_trades(wallet, limit=limit, strict=strict)
+            self.sync_whale_history(wallet, strict=strict)
         except Exception as e:
+            if strict:
+                raise
             print(f"Error fetching trades for {wallet}: {e}")
             return []
-    
-    def fetch_whale_data(self, wallet: str) -> Optional[Dict]:
-        cached = self.redis_cache.get_whale(wallet)
-        if cached:
-            return cached
         
-        trades = self.fetch_whale_trades(wallet)
-        positions = self.polymarket_client.get_user_positions(wallet)
+        return self.redis_cache.get_whale_history(wallet, limit)
+    
+    def _load_whale_data(self, wallet: str, strict: bool = False) -> Dict:
+        trades = self.fetch_whale_trades(wallet, strict=strict)
+        positions = self.polymarket_client.get_user_positions(wallet, strict=strict)
         
-        whale_data = {
+        return {
             'wallet': wallet,
             'trades': trades,
             'positions': positions,
@@ -42,7 +114,13 @@ class CopyTradingService:
             'position_count': len(positions),
             'updated_at': datetime.now().isoformat()
         }
+    
+    def fetch_whale_data(self, wallet: str, strict: bool = False) -> Optional[Dict]:
+        cached = self.redis_cache.get_whale(wallet)
+        if cached:
+            return cached
         
+        whale_data = self._load_whale_data(wallet, strict)
         self.redis_cache.cache_whale(wallet, whale_data, self.cache_ttl)
         return whale_data
     
@@ -71,15 +149,15 @@ class CopyTradingService:
         if not fetch_trades:
             return whales
         
+        results, _ = self.sync_wallets([whale.get('wallet') for whale in whales])
+        
         updated_whales = []
         for whale in whales:
             wallet = whale.get('wallet')
             if not wallet:
                 continue
             
-            print(f"Fetching data for {wallet}...")
-            whale_data = self.update_whale_data(wallet)
-            
+            whale_data = results.get(wallet)
             if whale_data:
                 whale['trades'] = whale_data.get('trades', [])
                 whale['positions'] = whale_data.get('positions', [])
@@ -87,10 +165,71 @@ class CopyTradingService:
                 whale['position_count'] = whale_data.get('position_count', 0)
             
             updated_whales.append(whale)
-            time.sleep(0.5)
         
         return updated_whales
     
+    def sync_wallets(
+        self,
+        wallets: Iterable[str],
+        workers: Optional[int] = None,
+        progress: Optional[Callable[[SyncReport], None]] = None
+    ) -> Tuple[Dict[str, Dict], SyncReport]:
+        wallets = list(dict.fromkeys(w for w in wallets if w))
+        report = SyncReport(total=len(wallets))
+        started = time.time()
+        
+        # One MGET for every cached whale up front, one pipeline for the fresh ones at the end
+        results: Dict[str, Dict] = {wallet: data for wallet, data in self.redis_cache.get_whales(wallets).items() if data}
+        report.synced = len(results)
+        pending = [wallet for wallet in wallets if wallet not in results]
+        if not pending:
+            report.elapsed = time.time() - started
+            if progress is not None:
+                progress(report)
+            self.last_sync = report
+            return results, report
+        
+        fresh: Dict[str, Dict] = {}
+        # Cached whales count towards the total, so print each tenth of it rather than of the fetches
+        shown = report.done * 10 // report.total
+        # Pacing comes from the transport's per-host token bucket, not from sleeps between wallets
+        with ThreadPoolExecutor(
+            max_workers=min(workers or self.sync_workers, len(pending)),
+            thread_name_prefix='polybrain-whale-sync'
+        ) as executor:
+            futures = {executor.submit(self._load_whale_data, wallet, True): wallet for wallet in pending}
+            for future in as_completed(futures):
+                wallet = futures[future]
+                try:
+                    fresh[wallet] = future.result()
+                    report.synced += 1
+                except Exception as e:
+                    report.failures[wallet] = str(e)
+                report.elapsed = time.time() - started
+                
+                if progress is not None:
+                    progress(report)
+                elif report.done * 10 // report.total > shown:
+                    shown = report.done * 10 // report.total
+                    print(f"Synced {report.done}/{report.total} whales ({len(report.failures)} failed, {report.elapsed:.1f}s)")
+        
+        for wallet, error in list(report.failures.items())[:10]:
+            print(f"  {wallet}: {error}")
+        if fresh:
+            self.redis_cache.cache_whales(fresh, self.cache_ttl)
+            results.update(fresh)
+        self.last_sync = report
+        return results, report
+    
+    def sync_whale_rows(self, rows: List[Dict], progress: Optional[Callable[[SyncReport], None]] = None) -> SyncReport:
+        wallets = []
+        for row in rows:
+            wallet = next((row[key] for key in WALLET_FIELDS if row.get(key)), None)
+            if wallet:
+                wallets.append(str(wallet))
+        _, report = self.sync_wallets(wallets, progress=progress)
+        return report
+    
     def should_refresh(self) -> bool:
         last_update = self.redis_cache.get_last_update_time()
         if not last_update:
@@ -108,24 +247,12 @@ class CopyTradingService:
         if not whales:
             return []
         
-        result = []
-        for whale in whales:
-            wallet = whale.get('wallet')
-            if not wallet:
-                continue
-            
-            cached_trades = self.redis_cache.get_whale_trades(wallet)
-            whale_data = {
-                **whale,
-                'trades': cached_trades or [],
-                'cached': True
-            }
-            result.append(whale_data)
-        
-        return result
+        whales = [whale for whale in whales if whale.get('wallet')]
+        trades = self.redis_cache.get_whales_trades([whale['wallet'] for whale in whales])
+        return [{**whale, 'trades': trades.get(whale['wallet'], []), 'cached': True} for whale in whales]
     
     def get_all_whale_wallets(self) -> List[str]:
-        whales = self.get_cached_whales_with_trades()
+        whales = self.redis_cache.get_top_whales() or []
         return [w.get('wallet') for w in whales if w.get('wallet')]
     
     def run_hourly_sync(self, top_n: int = 20):
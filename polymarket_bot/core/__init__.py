@@ -1,4 +1,18 @@
 from .client import PolymarketClient
+from .async_client import AsyncPolymarketClient
 from .trader import PolymarketTrader
+from .orderbook import BookSide, OrderBook, OrderBookStore, get_orderbook_store
+from .market_stream import MarketStream, TokenQuote, get_market_stream
 
-__all__ = ['PolymarketClient', 'PolymarketTrader']
+__all__ = [
+    'PolymarketClient',
+    'AsyncPolymarketClient',
+    'PolymarketTrader',
+    'BookSide',
+    'OrderBook',
+    'OrderBookStore',
+    'get_orderbook_store',
+    'MarketStream',
+    'TokenQuote',
+    'get_market_stream'
+]
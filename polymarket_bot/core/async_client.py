@@ -0,0 +1,341 @@
+import asyncio
+import httpx
+from typing import List, Dict, Optional, Tuple, AsyncIterator
+from datetime import datetime, timezone
+from ..config import (
+    POLYMARKET_API_URL,
+    POLYMARKET_API_KEY,
+    ASYNC_MAX_CONNECTIONS,
+    ASYNC_MAX_CONCURRENCY,
+    CLOB_BATCH_SIZE,
+    GAMMA_PAGE_SIZE,
+    GAMMA_MAX_PAGES
+)
+from ..utils.market import normalize_market, parse_json_fields
+from ..utils.intervals import get_interval_calendar
+from ..data.gamma import TopFinancialMarkets, market_page_params
+from .clob import (
+    CLOB_URL,
+    PRICE_SIDES,
+    book_from_response,
+    chunk_tokens,
+    parse_books,
+    parse_midpoints,
+    parse_prices,
+    price_requests
+)
+
+
+class AsyncPolymarketClient:
+    def __init__(self, max_connections: int = ASYNC_MAX_CONNECTIONS, max_concurrency: int = ASYNC_MAX_CONCURRENCY):
+        self.api_url = POLYMARKET_API_URL or CLOB_URL
+        self.gamma_base_url = 'https://gamma-api.polymarket.com'
+        self.data_api_url = 'https://data-api.polymarket.com'
+        self.api_key = POLYMARKET_API_KEY
+        self.max_connections = max_connections
+        self.max_concurrency = max_concurrency
+        self.headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)',
+            'Content-Type': 'application/json',
+            'Referer': 'https://polymarket.com/',
+            'Origin': 'https://polymarket.com'
+        }
+        if self.api_key:
+            self.headers['X-API-KEY'] = self.api_key
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    async def _get_client(self) -> httpx.AsyncClient:
+        # httpx pools are bound to the loop that created them
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            if self._client is not None:
+                try:
+                    await self._client.aclose()
+                except Exception:
+                    pass
+            self._client = httpx.AsyncClient(
+                headers=self.headers,
+                timeout=httpx.Timeout(10.0, pool=None),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                )
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._client
+    
+    async def _get(self, url: str, params: Optional[Dict] = None, timeout: float = 10) -> Optional[httpx.Response]:
+        client = await self._get_client()
+        async with self._semaphore:
+            return await client.get(url, params=params, timeout=timeout)
+    
+    async def _post(self, url: str, body: List[Dict], timeout: float = 10) -> Optional[httpx.Response]:
+        client = await self._get_client()
+        async with self._semaphore:
+            return await client.post(url, json=body, timeout=timeout)
+    
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._loop = None
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+    
+    async def get_markets(self, limit: int = 50, active: bool = True,
+                          filter_crypto_timeframes: bool = True,
+                          filter_financial: bool = True,
+                          min_volume: float = 50000,
+                          min_liquidity: float = 0) -> List[Dict]:
+        try:
+            all_markets = []
+            seen_condition_ids = set()
+            
+            if filter_crypto_timeframes:
+                found = await asyncio.gather(*[
+                    self.find_active_crypto_timeframe_markets(timeframe) for timeframe in ['15m', '1h', '4h']
+                ])
+                for markets in found:
+                    for m in markets:
+                        cid = m.get('conditionId')
+                        if cid and cid not in seen_condition_ids:
+                            seen_condition_ids.add(cid)
+                            normalized = normalize_market(m)
+                            if normalized:
+                                all_markets.append(normalized)
+            
+            if filter_financial:
+                try:
+                    all_markets.extend(await self._top_financial_markets(
+                        limit, active, min_volume, min_liquidity, seen_condition_ids
+                    ))
+                except Exception:
+                    pass
+            
+            all_markets.sort(key=lambda x: x.get('volume', 0), reverse=True)
+            return all_markets[:limit]
+        except Exception as e:
+            print(f"Error fetching markets: {e}")
+            return []
+    
+    async def _top_financial_markets(self, limit: int, active: bool, min_volume: float,
+                                     min_liquidity: float, seen_condition_ids: set) -> List[Dict]:
+        top = TopFinancialMarkets(limit, min_volume, min_liquidity, seen_condition_ids)
+        pages = self.iter_market_pages(active=active)
+        try:
+            async for page in pages:
+                if not top.add_page(page):
+                    break
+        finally:
+            await pages.aclose()
+        return top.markets()
+    
+    async def _fetch_market_page(self, offset: int, page_size: int, active: bool) -> List[Dict]:
+        resp = await self._get(f"{self.gamma_base_url}/markets",
+                               params=market_page_params(offset, page_size, active), timeout=15)
+        if resp.status_code == 200:
+            data = resp.json()
+            return data if isinstance(data, list) else []
+        return []
+    
+    async def iter_market_pages(self, active: bool = True, page_size: int = GAMMA_PAGE_SIZE,
+                                max_pages: int = GAMMA_MAX_PAGES) -> AsyncIterator[List[Dict]]:
+        pending = asyncio.ensure_future(self._fetch_market_page(0, page_size, active))
+        try:
+            for page_number in range(max_pages):
+                page = await pending
+                pending = None
+                if not page:
+                    return
+                
+                # Fetch the next page while the caller works through this one
+                has_more = len(page) >= page_size and page_number + 1 < max_pages
+                if has_more:
+                    pending = asyncio.ensure_future(
+                        self._fetch_market_page((page_number + 1) * page_size, page_size, active)
+                    )
+                
+                yield page
+                
+                if not has_more:
+                    return
+        finally:
+            if pending is not None:
+                pending.cancel()
+    
+    async def get_orderbook(self, token_id: str) -> Optional[Dict]:
+        try:
+            resp = await self._get(f"{self.api_url}/book", params={"token_id": token_id}, timeout=5)
+            if resp.status_code == 200:
+                return book_from_response(resp.json(), token_id)
+            return None
+        except Exception:
+            return None
+    
+    async def _post_clob(self, path: str, body: List[Dict], timeout: float = 5):
+        try:
+            resp = await self._post(f"{self.api_url}/{path}", body, timeout=timeout)
+            if resp.status_code == 200:
+                return resp.json()
+            return None
+        except Exception as e:
+            print(f"Error fetching /{path} for {len(body)} tokens: {e}")
+            return None
+    
+    async def get_orderbooks(self, token_ids: List[str], batch_size: int = CLOB_BATCH_SIZE) -> Dict[str, Dict]:
+        bodies = [[{'token_id': t} for t in chunk] for chunk in chunk_tokens(token_ids, batch_size)]
+        books = {}
+        for data in await asyncio.gather(*[self._post_clob('books', body) for body in bodies]):
+            books.update(parse_books(data))
+        return books
+    
+    async def get_midpoints(self, token_ids: List[str], batch_size: int = CLOB_BATCH_SIZE) -> Dict[str, float]:
+        bodies = [[{'token_id': t} for t in chunk] for chunk in chunk_tokens(token_ids, batch_size)]
+        midpoints = {}
+        for data in await asyncio.gather(*[self._post_clob('midpoints', body) for body in bodies]):
+            midpoints.update(parse_midpoints(data))
+        return midpoints
+    
+    async def get_prices(
+        self,
+        token_ids: List[str],
+        sides: Tuple[str, ...] = PRICE_SIDES,
+        batch_size: int = CLOB_BATCH_SIZE
+    ) -> Dict[str, Dict[str, float]]:
+        per_chunk = max(batch_size // max(len(sides), 1), 1)
+        bodies = [price_requests(chunk, sides) for chunk in chunk_tokens(token_ids, per_chunk)]
+        prices = {}
+        for data in await asyncio.gather(*[self._post_clob('prices', body) for body in bodies]):
+            for token_id, quote in parse_prices(data).items():
+                prices.setdefault(token_id, {}).update(quote)
+        return prices
+    
+    async def _fetch_user_data(self, endpoint: str, params: Dict) -> List[Dict]:
+        try:
+            resp = await self._get(f"{self.data_api_url}/{endpoint}", params=params, timeout=10)
+            if resp.status_code == 200:
+                data = resp.json()
+                return data if isinstance(data, list) else []
+            return []
+        except Exception:
+            return []
+    
+    async def get_user_trades(self, wallet_address: str, limit: int = 100, offset: int = 0) -> List[Dict]:
+        return await self._fetch_user_data('trades', {"user": wallet_address.lower(), "limit": limit, "offset": offset})
+    
+    async def get_user_positions(self, wallet_address: str, limit: int = 100) -> List[Dict]:
+        return await self._fetch_user_data('positions', {"user": wallet_address.lower(), "limit": limit})
+    
+    async def get_user_activity(
+        self,
+        wallet_address: str,
+        limit: int = 100,
+        offset: int = 0,
+        activity_type: Optional[str] = None,
+        side: Optional[str] = None,
+        start: Optional[int] = None,
+        end: Optional[int] = None
+    ) -> List[Dict]:
+        params = {
+            "user": wallet_address.lower(),
+            "limit": min(limit, 500),
+            "offset": offset,
+            "sortBy": "TIMESTAMP",
+            "sortDirection": "DESC"
+        }
+        
+        if activity_type:
+            params["type"] = activity_type
+        if side:
+            params["side"] = side
+        if start:
+            params["start"] = start
+        if end:
+            params["end"] = end
+        
+        return await self._fetch_user_data('activity', params)
+    
+    async def get_many_user_activity(self, wallet_addresses: List[str], **kwargs) -> Dict[str, List[Dict]]:
+        results = await asyncio.gather(*[self.get_user_activity(w, **kwargs) for w in wallet_addresses])
+        return dict(zip(wallet_addresses, results))
+    
+    async def get_many_user_positions(self, wallet_addresses: List[str], limit: int = 100) -> Dict[str, List[Dict]]:
+        results = await asyncio.gather(*[self.get_user_positions(w, limit) for w in wallet_addresses])
+        return dict(zip(wallet_addresses, results))
+    
+    async def find_active_crypto_timeframe_markets(self, timeframe: str = '15m', symbols: List[str] = None) -> List[Dict]:
+        if symbols is None:
+            symbols = ['BTC', 'ETH', 'SOL', 'XRP']
+        
+        active_markets = []
+        
+        try:
+            lookups = {}
+            for symbol, interval_ts, slug in get_interval_calendar().candidates(timeframe, symbols):
+                if slug not in lookups:
+                    lookups[slug] = (symbol, interval_ts)
+            
+            found = await asyncio.gather(*[self.get_market_by_slug(slug) for slug in lookups])
+            for (symbol, interval_ts), market in zip(lookups.values(), found):
+                if market:
+                    market['conditionId'] = market.get('conditionId', '')
+                    market['startDate'] = str(interval_ts)
+                    market['symbol'] = symbol
+                    active_markets.append(market)
+        except Exception as e:
+            print(f"Error finding {timeframe} markets: {e}")
+        
+        active_markets.sort(key=lambda x: x.get('startDate', ''), reverse=True)
+        return active_markets
+    
+    async def get_market_by_slug(self, slug: str) -> Optional[Dict]:
+        if not slug:
+            return None
+        
+        try:
+            resp = await self._get(f'{self.gamma_base_url}/markets/slug/{slug}', timeout=10)
+            if resp.status_code == 200:
+                market = resp.json()
+                if 'question' not in market or 'conditionId' not in market:
+                    return None
+                return parse_json_fields(market)
+            return None
+        except Exception:
+            return None
+    
+    async def get_market_prices(self, interval_start_ts: int, symbol: str = 'BTC', variant: str = 'fifteen') -> Optional[Dict]:
+        try:
+            start_dt = datetime.fromtimestamp(interval_start_ts, tz=timezone.utc)
+            duration = {'fifteen': 900, 'hour': 3600, 'four': 14400}.get(variant, 900)
+            end_dt = datetime.fromtimestamp(interval_start_ts + duration, tz=timezone.utc)
+            
+            resp = await self._get('https://polymarket.com/api/crypto/crypto-price', params={
+                'symbol': symbol,
+                'eventStartTime': start_dt.strftime('%Y-%m-%dT%H:%M:%SZ'),
+                'variant': variant,
+                'endDate': end_dt.strftime('%Y-%m-%dT%H:%M:%SZ')
+            }, timeout=10)
+            
+            if resp.status_code == 200:
+                data = resp.json()
+                return {
+                    'openPrice': float(data.get('openPrice')) if data.get('openPrice') else None,
+                    'closePrice': float(data.get('closePrice')) if data.get('closePrice') else None,
+                    'completed': data.get('completed', False) or data.get('cached', False),
+                    'timestamp': data.get('timestamp'),
+                    'incomplete': data.get('incomplete', False)
+                }
+            return None
+        except Exception:
+            return None
+    
+    async def get_market_close_price(self, interval_start_ts: int, symbol: str = 'BTC', variant: str = 'fifteen') -> Optional[float]:
+        prices = await self.get_market_prices(interval_start_ts, symbol, variant)
+        return prices.get('closePrice') if prices else None
@@ -1,17 +1,36 @@
-import requests
-from typing import List, Dict, Optional
+from functools import partial
+from typing import List, Dict, Optional, Iterator, Tuple
 from datetime import datetime, timezone
-from ..config import POLYMARKET_API_URL, POLYMARKET_API_KEY
-from ..utils.market import generate_market_slug, get_interval_timestamps, normalize_market, parse_json_fields
-from ..data.filters import filter_financial_markets
+from ..config import POLYMARKET_API_URL, POLYMARKET_API_KEY, GAMMA_PAGE_SIZE, GAMMA_MAX_PAGES, CLOB_BATCH_SIZE
+from ..utils.market import (
+    INTERVAL_DURATIONS,
+    normalize_market,
+    parse_json_fields
+)
+from ..utils.aio import run_sync
+from ..utils.http import get_session
+from ..utils.intervals import get_interval_calendar
+from ..utils.concurrency import fan_out, get_executor
+from ..data.cache import get_market_cache
+from ..data.gamma import TopFinancialMarkets, market_page_params, resolve_market_slugs
+from .async_client import AsyncPolymarketClient
+from .clob import (
+    CLOB_URL,
+    PRICE_SIDES,
+    book_from_response,
+    chunk_tokens,
+    parse_books,
+    parse_midpoints,
+    parse_prices,
+    price_requests
+)
 
 
 class PolymarketClient:
     def __init__(self):
-        self.api_url = POLYMARKET_API_URL
+        self.api_url = POLYMARKET_API_URL or CLOB_URL
         self.gamma_base_url = 'https://gamma-api.polymarket.com'
         self.api_key = POLYMARKET_API_KEY
-        self.session = requests.Session()
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)',
             'Content-Type': 'application/json',
@@ -20,54 +39,97 @@ class PolymarketClient:
         }
         if self.api_key:
             headers['X-API-KEY'] = self.api_key
-        self.session.headers.update(headers)
+        self.session = get_session(headers)
+        self._async_client: Optional[AsyncPolymarketClient] = None
+        self.market_cache = get_market_cache()
+    
+    @property
+    def async_client(self) -> AsyncPolymarketClient:
+        if self._async_client is None:
+            self._async_client = AsyncPolymarketClient()
+        return self._async_client
     
     def get_markets(self, limit: int = 50, active: bool = True, 
                    filter_crypto_timeframes: bool = True,
                    filter_financial: bool = True,
-                   min_volume: float = 50000) -> List[Dict]:
+                   min_volume: float = 50000,
+                   min_liquidity: float = 0) -> List[Dict]:
         try:
             all_markets = []
             seen_condition_ids = set()
             
             if filter_crypto_timeframes:
-                for timeframe in ['15m', '1h', '4h']:
-                    for m in self.find_active_crypto_timeframe_markets(timeframe):
+                for markets in self.find_active_crypto_markets(['15m', '1h', '4h']).values():
+                    for m in markets:
                         cid = m.get('conditionId')
                         if cid and cid not in seen_condition_ids:
                             seen_condition_ids.add(cid)
-                            all_markets.append(m)
+                            normalized = normalize_market(m)
+                            if normalized:
+                                all_markets.append(normalized)
             
             if filter_financial:
                 try:
-                    resp = self.session.get(f"{self.gamma_base_url}/markets", 
-                                           params={"limit": 1000, "active": str(active).lower(), "closed": "false"}, 
-                                           timeout=15)
-                    if resp.status_code == 200:
-                        data = resp.json()
-                        if isinstance(data, list):
-                            for m in filter_financial_markets(data, min_volume):
-                                cid = m.get('conditionId') or m.get('condition_id')
-                                if cid and cid not in seen_condition_ids:
-                                    seen_condition_ids.add(cid)
-                                    all_markets.append(m)
+                    all_markets.extend(self._top_financial_markets(
+                        limit, active, min_volume, min_liquidity, seen_condition_ids
+                    ))
                 except Exception:
                     pass
             
-            valid_markets = [normalize_market(m) for m in all_markets if normalize_market(m)]
-            valid_markets.sort(key=lambda x: x.get('volume', 0), reverse=True)
-            return valid_markets[:limit]
+            all_markets.sort(key=lambda x: x.get('volume', 0), reverse=True)
+            return all_markets[:limit]
         except Exception as e:
             print(f"Error fetching markets: {e}")
             return []
     
+    def _top_financial_markets(self, limit: int, active: bool, min_volume: float,
+                               min_liquidity: float, seen_condition_ids: set) -> List[Dict]:
+        top = TopFinancialMarkets(limit, min_volume, min_liquidity, seen_condition_ids)
+        for page in self.iter_market_pages(active=active):
+            if not top.add_page(page):
+                break
+        return top.markets()
+    
+    def _fetch_market_page(self, offset: int, page_size: int, active: bool) -> List[Dict]:
+        resp = self.session.get(f"{self.gamma_base_url}/markets",
+                                params=market_page_params(offset, page_size, active), timeout=15)
+        if resp.status_code == 200:
+            data = resp.json()
+            return data if isinstance(data, list) else []
+        return []
+    
+    def iter_market_pages(self, active: bool = True, page_size: int = GAMMA_PAGE_SIZE,
+                          max_pages: int = GAMMA_MAX_PAGES) -> Iterator[List[Dict]]:
+        executor = get_executor()
+        pending = executor.submit(self._fetch_market_page, 0, page_size, active)
+        
+        for page_number in range(max_pages):
+            page = pending.result()
+            if not page:
+                return
+            
+            # Fetch the next page while the caller works through this one
+            has_more = len(page) >= page_size and page_number + 1 < max_pages
+            if has_more:
+                pending = executor.submit(self._fetch_market_page, (page_number + 1) * page_size, page_size, active)
+            
+            yield page
+            
+            if not has_more:
+                return
+    
+    def iter_markets(self, active: bool = True, page_size: int = GAMMA_PAGE_SIZE,
+                     max_pages: int = GAMMA_MAX_PAGES) -> Iterator[Dict]:
+        for page in self.iter_market_pages(active, page_size, max_pages):
+            yield from page
+    
     def get_realtime_15m_markets(self) -> List[Dict]:
         try:
             realtime_markets = []
             seen = set()
             
-            for timeframe in ['15m', '1h', '4h']:
-                for m in self.find_active_crypto_timeframe_markets(timeframe):
+            for markets in self.find_active_crypto_markets(['15m', '1h', '4h']).values():
+                for m in markets:
                     cid = m.get('conditionId')
                     if cid and cid not in seen:
                         seen.add(cid)
@@ -82,27 +144,75 @@ class PolymarketClient:
         try:
             resp = self.session.get(f"{self.api_url}/book", params={"token_id": token_id}, timeout=5)
             if resp.status_code == 200:
-                data = resp.json()
-                return {'bids': data.get('bids', []), 'asks': data.get('asks', []), 'token_id': token_id}
+                return book_from_response(resp.json(), token_id)
             return None
         except Exception:
             return None
     
-    def _fetch_user_data(self, endpoint: str, params: Dict) -> List[Dict]:
+    def _post_clob(self, path: str, body: List[Dict], timeout: float = 5):
+        try:
+            resp = self.session.post(f"{self.api_url}/{path}", json=body, timeout=timeout)
+            if resp.status_code == 200:
+                return resp.json()
+            return None
+        except Exception as e:
+            print(f"Error fetching /{path} for {len(body)} tokens: {e}")
+            return None
+    
+    def _post_clob_batches(self, path: str, bodies: List[List[Dict]]) -> List:
+        if len(bodies) == 1:
+            return [self._post_clob(path, bodies[0])]
+        return fan_out([partial(self._post_clob, path, body) for body in bodies])
+    
+    def get_orderbooks(self, token_ids: List[str], batch_size: int = CLOB_BATCH_SIZE) -> Dict[str, Dict]:
+        bodies = [[{'token_id': t} for t in chunk] for chunk in chunk_tokens(token_ids, batch_size)]
+        books = {}
+        for data in self._post_clob_batches('books', bodies):
+            books.update(parse_books(data))
+        return books
+    
+    def get_midpoints(self, token_ids: List[str], batch_size: int = CLOB_BATCH_SIZE) -> Dict[str, float]:
+        bodies = [[{'token_id': t} for t in chunk] for chunk in chunk_tokens(token_ids, batch_size)]
+        midpoints = {}
+        for data in self._post_clob_batches('midpoints', bodies):
+            midpoints.update(parse_midpoints(data))
+        return midpoints
+    
+    def get_prices(
+        self,
+        token_ids: List[str],
+        sides: Tuple[str, ...] = PRICE_SIDES,
+        batch_size: int = CLOB_BATCH_SIZE
+    ) -> Dict[str, Dict[str, float]]:
+        # Each token costs one request entry per side
+        per_chunk = max(batch_size // max(len(sides), 1), 1)
+        bodies = [price_requests(chunk, sides) for chunk in chunk_tokens(token_ids, per_chunk)]
+        prices = {}
+        for data in self._post_clob_batches('prices', bodies):
+            for token_id, quote in parse_prices(data).items():
+                prices.setdefault(token_id, {}).update(quote)
+        return prices
+    
+    def _fetch_user_data(self, endpoint: str, params: Dict, strict: bool = False) -> List[Dict]:
         try:
             resp = self.session.get(f"https://data-api.polymarket.com/{endpoint}", params=params, timeout=10)
             if resp.status_code == 200:
                 data = resp.json()
                 return data if isinstance(data, list) else []
+            if strict:
+                raise RuntimeError(f"{endpoint} returned HTTP {resp.status_code}")
             return []
         except Exception:
+            # Callers that track failures need to tell an error from an empty history
+            if strict:
+                raise
             return []
     
-    def get_user_trades(self, wallet_address: str, limit: int = 100, offset: int = 0) -> List[Dict]:
-        return self._fetch_user_data('trades', {"user": wallet_address.lower(), "limit": limit, "offset": offset})
+    def get_user_trades(self, wallet_address: str, limit: int = 100, offset: int = 0, strict: bool = False) -> List[Dict]:
+        return self._fetch_user_data('trades', {"user": wallet_address.lower(), "limit": limit, "offset": offset}, strict)
     
-    def get_user_positions(self, wallet_address: str, limit: int = 100) -> List[Dict]:
-        return self._fetch_user_data('positions', {"user": wallet_address.lower(), "limit": limit})
+    def get_user_positions(self, wallet_address: str, limit: int = 100, strict: bool = False) -> List[Dict]:
+        return self._fetch_user_data('positions', {"user": wallet_address.lower(), "limit": limit}, strict)
     
     def get_user_activity(
         self,
@@ -112,7 +222,8 @@ class PolymarketClient:
         activity_type: Optional[str] = None,
         side: Optional[str] = None,
         start: Optional[int] = None,
-        end: Optional[int] = None
+        end: Optional[int] = None,
+        strict: bool = False
     ) -> List[Dict]:
         params = {
             "user": wallet_address.lower(),
@@ -131,55 +242,87 @@ class PolymarketClient:
         if end:
             params["end"] = end
         
-        return self._fetch_user_data('activity', params)
+        return self._fetch_user_data('activity', params, strict)
+    
+    def get_many_user_activity(self, wallet_addresses: List[str], **kwargs) -> Dict[str, List[Dict]]:
+        return run_sync(self.async_client.get_many_user_activity(wallet_addresses, **kwargs))
+    
+    def get_many_user_positions(self, wallet_addresses: List[str], limit: int = 100) -> Dict[str, List[Dict]]:
+        return run_sync(self.async_client.get_many_user_positions(wallet_addresses, limit))
     
     def get_whale_activity(self, wallet_address: str, limit: int = 100) -> List[Dict]:
         return self.get_user_activity(wallet_address, limit=limit)
     
     def find_active_crypto_timeframe_markets(self, timeframe: str = '15m', symbols: List[str] = None) -> List[Dict]:
+        return self.find_active_crypto_markets([timeframe], symbols)[timeframe]
+    
+    def find_active_crypto_markets(self, timeframes: List[str] = None, symbols: List[str] = None) -> Dict[str, List[Dict]]:
+        if timeframes is None:
+            timeframes = ['15m', '1h', '4h']
         if symbols is None:
             symbols = ['BTC', 'ETH', 'SOL', 'XRP']
         
-        active_markets = []
-        seen_slugs = set()
+        calendar = get_interval_calendar()
+        lookups = {}
+        expiries = {}
+        for timeframe in timeframes:
+            duration = INTERVAL_DURATIONS.get(timeframe, 900)
+            for symbol, interval_ts, slug in calendar.candidates(timeframe, symbols):
+                if slug not in lookups:
+                    lookups[slug] = (timeframe, symbol, interval_ts)
+                    expiries[slug] = interval_ts + duration
         
         try:
-            intervals = get_interval_timestamps(timeframe)
-            
-            for symbol in symbols:
-                for interval_ts in intervals:
-                    slug = generate_market_slug(interval_ts, symbol, timeframe)
-                    if slug in seen_slugs:
-                        continue
-                    seen_slugs.add(slug)
-                    
-                    market = self.get_market_by_slug(slug)
-                    if market:
-                        market['conditionId'] = market.get('conditionId', '')
-                        market['startDate'] = str(interval_ts)
-                        market['symbol'] = symbol
-                        active_markets.append(market)
+            resolved = resolve_market_slugs(
+                self.session,
+                list(lookups),
+                expiries,
+                self.market_cache,
+                price_source=self.get_midpoints
+            )
         except Exception as e:
-            print(f"Error finding {timeframe} markets: {e}")
+            print(f"Error finding {', '.join(timeframes)} markets: {e}")
+            resolved = {}
         
-        if active_markets:
-            active_markets.sort(key=lambda x: x.get('startDate', ''), reverse=True)
-            symbols_found = ', '.join(set([m.get('symbol', 'Unknown') for m in active_markets]))
-            print(f"Found {len(active_markets)} active {timeframe} crypto markets ({symbols_found})")
+        result = {timeframe: [] for timeframe in timeframes}
+        for slug, (timeframe, symbol, interval_ts) in lookups.items():
+            market = resolved.get(slug)
+            if market:
+                market = parse_json_fields(dict(market))
+                market['conditionId'] = market.get('conditionId', '')
+                market['startDate'] = str(interval_ts)
+                market['symbol'] = symbol
+                result[timeframe].append(market)
         
-        return active_markets
+        for timeframe, active_markets in result.items():
+            if active_markets:
+                active_markets.sort(key=lambda x: x.get('startDate', ''), reverse=True)
+                symbols_found = ', '.join(set([m.get('symbol', 'Unknown') for m in active_markets]))
+                print(f"Found {len(active_markets)} active {timeframe} crypto markets ({symbols_found})")
+        
+        return result
     
-    def get_market_by_slug(self, slug: str) -> Optional[Dict]:
+    def get_market_by_slug(self, slug: str, expires_at: Optional[float] = None) -> Optional[Dict]:
         if not slug:
             return None
         
+        cached = self.market_cache.get(slug)
+        self.market_cache.observe(slug, bool(cached))
+        if cached:
+            return parse_json_fields(cached)
+        if self.market_cache.is_missing(slug):
+            return None
+        
         try:
             resp = self.session.get(f'{self.gamma_base_url}/markets/slug/{slug}', timeout=10)
             if resp.status_code == 200:
                 market = resp.json()
                 if 'question' not in market or 'conditionId' not in market:
                     return None
+                self.market_cache.put(slug, market, expires_at)
                 return parse_json_fields(market)
+            if resp.status_code == 404:
+                self.market_cache.put_missing(slug)
             return None
         except Exception:
             return None
@@ -0,0 +1,60 @@
+from typing import List, Dict, Optional, Iterable, Tuple
+
+CLOB_URL = 'https://clob.polymarket.com'
+PRICE_SIDES = ('BUY', 'SELL')
+
+
+def chunk_tokens(token_ids: Iterable[str], size: int) -> List[List[str]]:
+    tokens = [t for t in dict.fromkeys(token_ids) if t]
+    return [tokens[i:i + size] for i in range(0, len(tokens), size)]
+
+
+def book_from_response(data: Dict, token_id: Optional[str] = None) -> Dict:
+    return {
+        'bids': data.get('bids', []),
+        'asks': data.get('asks', []),
+        'token_id': token_id or data.get('asset_id'),
+        'timestamp': data.get('timestamp'),
+        'hash': data.get('hash')
+    }
+
+
+def parse_books(data) -> Dict[str, Dict]:
+    books = {}
+    for item in data if isinstance(data, list) else []:
+        if isinstance(item, dict) and item.get('asset_id'):
+            books[item['asset_id']] = book_from_response(item)
+    return books
+
+
+def parse_midpoints(data) -> Dict[str, float]:
+    midpoints = {}
+    for token_id, value in (data if isinstance(data, dict) else {}).items():
+        # Single-token responses nest the value as {"mid": "0.5"}
+        if isinstance(value, dict):
+            value = value.get('mid')
+        try:
+            midpoints[token_id] = float(value)
+        except (TypeError, ValueError):
+            continue
+    return midpoints
+
+
+def parse_prices(data) -> Dict[str, Dict[str, float]]:
+    prices = {}
+    for token_id, sides in (data if isinstance(data, dict) else {}).items():
+        if not isinstance(sides, dict):
+            continue
+        parsed = {}
+        for side, value in sides.items():
+            try:
+                parsed[side.upper()] = float(value)
+            except (TypeError, ValueError):
+                continue
+        if parsed:
+            prices[token_id] = parsed
+    return prices
+
+
+def price_requests(tokens: List[str], sides: Tuple[str, ...]) -> List[Dict]:
+    return [{'token_id': token, 'side': side} for token in tokens for side in sides]
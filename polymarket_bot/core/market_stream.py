@@ -0,0 +1,311 @@
+import asyncio
+import json
+import random
+import threading
+import time
+import websockets
+from collections import deque
+from dataclasses import dataclass
+from typing import List, Dict, Optional, Callable, Iterable, Set
+from ..config import CLOB_WS_URL, MARKET_STREAM_PING_INTERVAL, MARKET_STREAM_MAX_BACKOFF
+from ..utils.aio import get_loop
+from .orderbook import OrderBookStore, get_orderbook_store
+
+
+@dataclass
+class TokenQuote:
+    asset_id: str
+    best_bid: Optional[float] = None
+    best_ask: Optional[float] = None
+    last_trade: Optional[float] = None
+    updated_at: float = 0.0
+    
+    @property
+    def spread(self) -> Optional[float]:
+        if self.best_bid is None or self.best_ask is None:
+            return None
+        return self.best_ask - self.best_bid
+    
+    @property
+    def price(self) -> Optional[float]:
+        # Same rule as the Polymarket UI: midpoint unless the book is too wide
+        spread = self.spread
+        if spread is not None and spread <= 0.1:
+            return round((self.best_bid + self.best_ask) / 2, 4)
+        if self.last_trade is not None:
+            return self.last_trade
+        if spread is not None:
+            return round((self.best_bid + self.best_ask) / 2, 4)
+        return None
+
+
+QuoteHandler = Callable[[TokenQuote], None]
+
+
+def _to_float(value) -> Optional[float]:
+    try:
+        return float(value) if value not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+
+class MarketStream:
+    def __init__(
+        self,
+        url: str = CLOB_WS_URL,
+        ping_interval: float = MARKET_STREAM_PING_INTERVAL,
+        max_backoff: float = MARKET_STREAM_MAX_BACKOFF,
+        latency_samples: int = 1000,
+        books: Optional[OrderBookStore] = None
+    ):
+        self.url = url
+        self.books = books
+        self.ping_interval = ping_interval
+        self.max_backoff = max_backoff
+        self.quotes: Dict[str, TokenQuote] = {}
+        self._tokens: Set[str] = set()
+        self._handlers: List[QuoteHandler] = []
+        self._ws = None
+        self._task: Optional[asyncio.Future] = None
+        self._lock = threading.Lock()
+        self.connected = False
+        self.messages = 0
+        self.reconnects = 0
+        self._latencies: deque = deque(maxlen=latency_samples)
+    
+    def on_quote(self, handler: QuoteHandler) -> Callable[[], None]:
+        self._handlers.append(handler)
+        
+        def remove():
+            if handler in self._handlers:
+                self._handlers.remove(handler)
+        
+        return remove
+    
+    def get_quote(self, asset_id: str) -> Optional[TokenQuote]:
+        return self.quotes.get(asset_id)
+    
+    @property
+    def tokens(self) -> Set[str]:
+        with self._lock:
+            return set(self._tokens)
+    
+    def subscribe(self, token_ids: Iterable[str]):
+        with self._lock:
+            added = [t for t in dict.fromkeys(token_ids) if t and t not in self._tokens]
+            self._tokens.update(added)
+        if added:
+            self._send({'assets_ids': added, 'operation': 'subscribe'})
+    
+    def unsubscribe(self, token_ids: Iterable[str]):
+        with self._lock:
+            removed = [t for t in dict.fromkeys(token_ids) if t in self._tokens]
+            self._tokens.difference_update(removed)
+        for token in removed:
+            self.quotes.pop(token, None)
+        if removed:
+            self._send({'assets_ids': removed, 'operation': 'unsubscribe'})
+    
+    def _send(self, message: Dict):
+        ws = self._ws
+        if ws is None or self._task is None:
+            # Picked up by the full subscription sent on (re)connect
+            return
+        asyncio.run_coroutine_threadsafe(self._safe_send(ws, json.dumps(message)), get_loop())
+    
+    async def _safe_send(self, ws, payload: str):
+        try:
+            await ws.send(payload)
+        except Exception as e:
+            print(f"Market stream send failed: {e}")
+    
+    def _quote(self, asset_id: str) -> TokenQuote:
+        quote = self.quotes.get(asset_id)
+        if quote is None:
+            quote = TokenQuote(asset_id)
+            self.quotes[asset_id] = quote
+        return quote
+    
+    def _apply_book(self, event: Dict) -> Optional[TokenQuote]:
+        quote = self._quote(event.get('asset_id', ''))
+        if self.books is not None:
+            self.books.apply_snapshot(
+                quote.asset_id,
+                event.get('bids', []),
+                event.get('asks', []),
+                _to_float(event.get('timestamp')),
+                event.get('hash')
+            )
+        bids = [_to_float(level.get('price')) for level in event.get('bids', []) or []]
+        asks = [_to_float(level.get('price')) for level in event.get('asks', []) or []]
+        bids = [p for p in bids if p is not None]
+        asks = [p for p in asks if p is not None]
+        quote.best_bid = max(bids) if bids else None
+        quote.best_ask = min(asks) if asks else None
+        return quote
+    
+    def _apply_change(self, change: Dict, timestamp: Optional[float]) -> Optional[TokenQuote]:
+        asset_id = change.get('asset_id', '')
+        price = _to_float(change.get('price'))
+        size = _to_float(change.get('size'))
+        applied = False
+        if self.books is not None and price is not None and size is not None and change.get('side'):
+            applied = self.books.apply_delta(asset_id, change['side'], price, size, timestamp)
+        
+        if 'best_bid' in change or 'best_ask' in change:
+            return self._apply_best(change)
+        if applied:
+            # Older price_change payloads carry no top of book, so read it off the local book
+            book = self.books.book(asset_id)
+            quote = self._quote(asset_id)
+            quote.best_bid = book.best_bid
+            quote.best_ask = book.best_ask
+            return quote
+        return None
+    
+    def _apply_best(self, change: Dict) -> Optional[TokenQuote]:
+        if 'best_bid' not in change and 'best_ask' not in change:
+            return None
+        quote = self._quote(change.get('asset_id', ''))
+        quote.best_bid = _to_float(change.get('best_bid'))
+        quote.best_ask = _to_float(change.get('best_ask'))
+        return quote
+    
+    def _apply_trade(self, event: Dict) -> Optional[TokenQuote]:
+        price = _to_float(event.get('price'))
+        if price is None:
+            return None
+        quote = self._quote(event.get('asset_id', ''))
+        quote.last_trade = price
+        return quote
+    
+    def _apply(self, event: Dict) -> List[TokenQuote]:
+        event_type = event.get('event_type')
+        if event_type == 'book':
+            quotes = [self._apply_book(event)]
+        elif event_type == 'price_change':
+            timestamp = _to_float(event.get('timestamp'))
+            if event.get('price_changes'):
+                changes = event['price_changes']
+            else:
+                changes = [{**change, 'asset_id': event.get('asset_id')} for change in event.get('changes', [])]
+            quotes = [self._apply_change(change, timestamp) for change in changes]
+        elif event_type == 'best_bid_ask':
+            quotes = [self._apply_best(event)]
+        elif event_type == 'last_trade_price':
+            quotes = [self._apply_trade(event)]
+        else:
+            return []
+        return [q for q in quotes if q is not None and q.asset_id in self._tokens]
+    
+    def _handle(self, raw: str, received_at: float):
+        if raw == 'PONG':
+            return
+        try:
+            payload = json.loads(raw)
+        except ValueError:
+            return
+        
+        for event in payload if isinstance(payload, list) else [payload]:
+            if not isinstance(event, dict):
+                continue
+            self.messages += 1
+            
+            for quote in self._apply(event):
+                quote.updated_at = received_at
+                for handler in list(self._handlers):
+                    try:
+                        handler(quote)
+                    except Exception as e:
+                        print(f"Market stream handler error: {e}")
+                
+                sent_ms = _to_float(event.get('timestamp'))
+                handled_at = time.time()
+                self._latencies.append((
+                    handled_at - received_at,
+                    handled_at - sent_ms / 1000 if sent_ms else None
+                ))
+    
+    async def _ping(self, ws):
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            await ws.send('PING')
+    
+    async def _run(self):
+        attempt = 0
+        while True:
+            try:
+                async with websockets.connect(self.url, ping_interval=None, max_size=None) as ws:
+                    self._ws = ws
+                    self.connected = True
+                    attempt = 0
+                    await ws.send(json.dumps({'assets_ids': sorted(self.tokens), 'type': 'market'}))
+                    
+                    pinger = asyncio.ensure_future(self._ping(ws))
+                    try:
+                        async for raw in ws:
+                            self._handle(raw if isinstance(raw, str) else raw.decode(), time.time())
+                    finally:
+                        pinger.cancel()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Market stream disconnected: {e}")
+            finally:
+                self._ws = None
+                self.connected = False
+            
+            attempt += 1
+            self.reconnects += 1
+            delay = min(self.max_backoff, 0.5 * 2 ** min(attempt, 10))
+            await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+    
+    def start(self):
+        if self.running:
+            return
+        self._task = asyncio.run_coroutine_threadsafe(self._run(), get_loop())
+    
+    def stop(self):
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+    
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+    
+    def stats(self) -> Dict:
+        samples = list(self._latencies)
+        
+        def summary(values: List[float]) -> Dict:
+            if not values:
+                return {'count': 0}
+            values = sorted(values)
+            return {
+                'count': len(values),
+                'p50_ms': values[len(values) // 2] * 1000,
+                'p99_ms': values[min(len(values) - 1, int(len(values) * 0.99))] * 1000,
+                'max_ms': values[-1] * 1000
+            }
+        
+        return {
+            'connected': self.connected,
+            'tokens': len(self._tokens),
+            'messages': self.messages,
+            'reconnects': self.reconnects,
+            'handler_latency': summary([s[0] for s in samples]),
+            'exchange_latency': summary([s[1] for s in samples if s[1] is not None])
+        }
+
+
+_stream: Optional[MarketStream] = None
+_stream_lock = threading.Lock()
+
+
+def get_market_stream() -> MarketStream:
+    global _stream
+    if _stream is None:
+        with _stream_lock:
+            if _stream is None:
+                _stream = MarketStream(books=get_orderbook_store())
+    return _stream
@@ -0,0 +1,327 @@
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import List, Dict, Optional, Callable, Iterable, Tuple, Any
+from ..config import ORDERBOOK_MAX_AGE
+from .client import PolymarketClient
+
+Level = Tuple[float, float]
+
+
+def _parse_levels(levels: Iterable[Any]) -> List[Level]:
+    parsed = []
+    for level in levels or []:
+        try:
+            if isinstance(level, dict):
+                parsed.append((float(level['price']), float(level['size'])))
+            else:
+                parsed.append((float(level[0]), float(level[1])))
+        except (KeyError, IndexError, TypeError, ValueError):
+            continue
+    return parsed
+
+
+class BookSide:
+    def __init__(self, descending: bool):
+        self.descending = descending
+        # Bid keys are negated so index 0 is the best level on both sides
+        self._keys: List[float] = []
+        self._sizes: List[float] = []
+        self._cum_sizes: Optional[List[float]] = None
+        self._cum_notional: Optional[List[float]] = None
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+    
+    def _key(self, price: float) -> float:
+        return -price if self.descending else price
+    
+    def _price(self, index: int) -> float:
+        key = self._keys[index]
+        return -key if self.descending else key
+    
+    def load(self, levels: Iterable[Level]):
+        book = {}
+        for price, size in levels:
+            if size > 0:
+                book[self._key(price)] = size
+            else:
+                book.pop(self._key(price), None)
+        self._keys = sorted(book)
+        self._sizes = [book[key] for key in self._keys]
+        self._cum_sizes = None
+    
+    def set(self, price: float, size: float):
+        key = self._key(price)
+        i = bisect_left(self._keys, key)
+        exists = i < len(self._keys) and self._keys[i] == key
+        
+        if size <= 0:
+            if not exists:
+                return
+            del self._keys[i]
+            del self._sizes[i]
+        elif exists:
+            self._sizes[i] = size
+        else:
+            self._keys.insert(i, key)
+            self._sizes.insert(i, size)
+        self._cum_sizes = None
+    
+    def best(self) -> Optional[Level]:
+        if not self._keys:
+            return None
+        return self._price(0), self._sizes[0]
+    
+    def levels(self, limit: Optional[int] = None) -> List[Level]:
+        count = len(self._keys) if limit is None else min(limit, len(self._keys))
+        return [(self._price(i), self._sizes[i]) for i in range(count)]
+    
+    def _prefix(self) -> Tuple[List[float], List[float]]:
+        # Rebuilt lazily so a burst of deltas costs one pass on the next query
+        if self._cum_sizes is None:
+            self._cum_sizes = list(accumulate(self._sizes))
+            self._cum_notional = list(accumulate(
+                self._price(i) * size for i, size in enumerate(self._sizes)
+            ))
+        return self._cum_sizes, self._cum_notional
+    
+    @property
+    def total_size(self) -> float:
+        cum_sizes, _ = self._prefix()
+        return cum_sizes[-1] if cum_sizes else 0.0
+    
+    def depth(self, limit_price: float) -> float:
+        cum_sizes, _ = self._prefix()
+        i = bisect_right(self._keys, self._key(limit_price))
+        return cum_sizes[i - 1] if i else 0.0
+    
+    def _fill_index(self, size: float) -> Optional[int]:
+        cum_sizes, _ = self._prefix()
+        i = bisect_left(cum_sizes, size)
+        return i if i < len(cum_sizes) else None
+    
+    def price_for_size(self, size: float) -> Optional[float]:
+        if size <= 0:
+            best = self.best()
+            return best[0] if best else None
+        i = self._fill_index(size)
+        return self._price(i) if i is not None else None
+    
+    def vwap(self, size: float) -> Optional[float]:
+        if size <= 0:
+            return self.price_for_size(size)
+        i = self._fill_index(size)
+        if i is None:
+            return None
+        cum_sizes, cum_notional = self._prefix()
+        filled = cum_sizes[i - 1] if i else 0.0
+        notional = cum_notional[i - 1] if i else 0.0
+        return (notional + (size - filled) * self._price(i)) / size
+
+
+class OrderBook:
+    def __init__(self, asset_id: str):
+        self.asset_id = asset_id
+        self.bids = BookSide(descending=True)
+        self.asks = BookSide(descending=False)
+        self.timestamp: float = 0.0
+        self.hash: Optional[str] = None
+        self.updated_at: float = 0.0
+        self._lock = threading.Lock()
+    
+    def _side(self, side: str) -> BookSide:
+        return self.bids if side.upper() in ('BUY', 'BID', 'BIDS') else self.asks
+    
+    def _taker_side(self, side: str) -> BookSide:
+        # A taker buy lifts the asks, a taker sell hits the bids
+        return self.asks if side.upper() == 'BUY' else self.bids
+    
+    def apply_snapshot(
+        self,
+        bids: Iterable[Any],
+        asks: Iterable[Any],
+        timestamp: Optional[float] = None,
+        book_hash: Optional[str] = None
+    ):
+        with self._lock:
+            if timestamp is not None and timestamp < self.timestamp:
+                return
+            self.bids.load(_parse_levels(bids))
+            self.asks.load(_parse_levels(asks))
+            self.timestamp = timestamp or self.timestamp
+            self.hash = book_hash
+            self.updated_at = time.time()
+    
+    def apply_delta(self, side: str, price: float, size: float, timestamp: Optional[float] = None) -> bool:
+        with self._lock:
+            # Deltas that predate the current snapshot are already reflected in it
+            if timestamp is not None and timestamp < self.timestamp:
+                return False
+            self._side(side).set(float(price), float(size))
+            self.timestamp = timestamp or self.timestamp
+            self.updated_at = time.time()
+            return True
+    
+    @property
+    def best_bid(self) -> Optional[float]:
+        with self._lock:
+            best = self.bids.best()
+        return best[0] if best else None
+    
+    @property
+    def best_ask(self) -> Optional[float]:
+        with self._lock:
+            best = self.asks.best()
+        return best[0] if best else None
+    
+    @property
+    def spread(self) -> Optional[float]:
+        bid, ask = self.best_bid, self.best_ask
+        if bid is None or ask is None:
+            return None
+        return ask - bid
+    
+    @property
+    def mid(self) -> Optional[float]:
+        bid, ask = self.best_bid, self.best_ask
+        if bid is None or ask is None:
+            return None
+        return (bid + ask) / 2
+    
+    def depth(self, side: str, limit_price: float) -> float:
+        with self._lock:
+            return self._taker_side(side).depth(limit_price)
+    
+    def price_for_size(self, side: str, size: float) -> Optional[float]:
+        with self._lock:
+            return self._taker_side(side).price_for_size(size)
+    
+    def vwap(self, side: str, size: float) -> Optional[float]:
+        with self._lock:
+            return self._taker_side(side).vwap(size)
+    
+    def levels(self, limit: Optional[int] = None) -> Dict[str, List[Level]]:
+        with self._lock:
+            return {'bids': self.bids.levels(limit), 'asks': self.asks.levels(limit)}
+    
+    def age(self) -> float:
+        return time.time() - self.updated_at if self.updated_at else float('inf')
+
+
+class OrderBookStore:
+    def __init__(
+        self,
+        fetch: Optional[Callable[[str], Optional[Dict]]] = None,
+        max_age: float = ORDERBOOK_MAX_AGE,
+        fetch_many: Optional[Callable[[List[str]], Dict[str, Dict]]] = None
+    ):
+        self._fetch = fetch
+        self._fetch_many = fetch_many
+        self._client: Optional[PolymarketClient] = None
+        self.max_age = max_age
+        self.books: Dict[str, OrderBook] = {}
+        self._lock = threading.Lock()
+    
+    def book(self, asset_id: str) -> OrderBook:
+        book = self.books.get(asset_id)
+        if book is None:
+            with self._lock:
+                book = self.books.setdefault(asset_id, OrderBook(asset_id))
+        return book
+    
+    def apply_snapshot(
+        self,
+        asset_id: str,
+        bids: Iterable[Any],
+        asks: Iterable[Any],
+        timestamp: Optional[float] = None,
+        book_hash: Optional[str] = None
+    ) -> OrderBook:
+        book = self.book(asset_id)
+        book.apply_snapshot(bids, asks, timestamp, book_hash)
+        return book
+    
+    def apply_delta(
+        self,
+        asset_id: str,
+        side: str,
+        price: float,
+        size: float,
+        timestamp: Optional[float] = None
+    ) -> bool:
+        book = self.books.get(asset_id)
+        # Without a snapshot a delta would build a partial book
+        if book is None or not book.updated_at:
+            return False
+        return book.apply_delta(side, price, size, timestamp)
+    
+    def _get_client(self) -> PolymarketClient:
+        if self._client is None:
+            self._client = PolymarketClient()
+        return self._client
+    
+    def _apply_response(self, asset_id: str, data: Dict) -> OrderBook:
+        timestamp = data.get('timestamp')
+        return self.apply_snapshot(
+            asset_id,
+            data.get('bids', []),
+            data.get('asks', []),
+            float(timestamp) if timestamp else None,
+            data.get('hash')
+        )
+    
+    def refresh(self, asset_id: str) -> Optional[OrderBook]:
+        fetch = self._fetch or self._get_client().get_orderbook
+        data = fetch(asset_id)
+        if not data:
+            return None
+        return self._apply_response(asset_id, data)
+    
+    def refresh_many(self, asset_ids: List[str]) -> Dict[str, OrderBook]:
+        fetch_many = self._fetch_many or self._get_client().get_orderbooks
+        return {
+            asset_id: self._apply_response(asset_id, data)
+            for asset_id, data in fetch_many(list(asset_ids)).items()
+        }
+    
+    def get(self, asset_id: str, max_age: Optional[float] = None) -> Optional[OrderBook]:
+        if not asset_id:
+            return None
+        max_age = self.max_age if max_age is None else max_age
+        book = self.books.get(asset_id)
+        if book is not None and book.age() <= max_age:
+            return book
+        return self.refresh(asset_id)
+    
+    def get_many(self, asset_ids: List[str], max_age: Optional[float] = None) -> Dict[str, OrderBook]:
+        max_age = self.max_age if max_age is None else max_age
+        result = {}
+        stale = []
+        for asset_id in dict.fromkeys(a for a in asset_ids if a):
+            book = self.books.get(asset_id)
+            if book is not None and book.age() <= max_age:
+                result[asset_id] = book
+            else:
+                stale.append(asset_id)
+        if stale:
+            result.update(self.refresh_many(stale))
+        return result
+    
+    def remove(self, asset_id: str):
+        with self._lock:
+            self.books.pop(asset_id, None)
+
+
+_store: Optional[OrderBookStore] = None
+_store_lock = threading.Lock()
+
+
+def get_orderbook_store() -> OrderBookStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = OrderBookStore()
+    return _store
@@ -1,5 +1,13 @@
 from .models import Timeframe, TimeframeConfig, CryptoPriceData, CryptoMarketData
-from .filters import filter_financial_markets
+from .filters import (
+    KeywordMatcher,
+    filter_financial_markets,
+    filter_markets_by_category,
+    get_matcher,
+    register_category
+)
+from .cache import MarketCache, IntervalPriceCache, get_market_cache, get_price_cache
+from .gamma import resolve_market_slugs
 from .fetchers import (
     TimeframeRegistry,
     CryptoFetcherBase,
@@ -10,13 +18,24 @@ from .fetchers import (
     get_1h_fetcher,
     get_4h_fetcher
 )
+from .prefetch import BoundaryStats, BoundaryPrefetcher, get_boundary_prefetcher
+from .reference import ReferencePriceService, get_reference_service
 
 __all__ = [
     'Timeframe',
     'TimeframeConfig',
     'CryptoPriceData',
     'CryptoMarketData',
+    'KeywordMatcher',
     'filter_financial_markets',
+    'filter_markets_by_category',
+    'get_matcher',
+    'register_category',
+    'MarketCache',
+    'IntervalPriceCache',
+    'get_market_cache',
+    'get_price_cache',
+    'resolve_market_slugs',
     'TimeframeRegistry',
     'CryptoFetcherBase',
     'CryptoTimeframeFetcher',
@@ -24,5 +43,10 @@ __all__ = [
     'get_crypto_fetcher_manager',
     'get_15m_fetcher',
     'get_1h_fetcher',
-    'get_4h_fetcher'
+    'get_4h_fetcher',
+    'BoundaryStats',
+    'BoundaryPrefetcher',
+    'get_boundary_prefetcher',
+    'ReferencePriceService',
+    'get_reference_service'
 ]
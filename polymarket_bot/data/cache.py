@@ -0,0 +1,240 @@
+import time
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Dict, Optional, Tuple
+from ..config import MARKET_CACHE_SIZE, MARKET_REFRESH_TTL, MARKET_MISS_TTL, MARKET_METADATA_TTL
+
+STATIC_FIELDS = ('conditionId', 'questionID', 'clobTokenIds', 'outcomes', 'question', 'slug')
+
+
+@dataclass
+class MarketCacheEntry:
+    static: Dict
+    dynamic: Dict
+    refreshed_at: float
+    expires_at: Optional[float]
+    held_until: Optional[float] = None
+    fetched_at: float = 0.0
+
+
+class MarketCache:
+    def __init__(
+        self,
+        max_size: int = MARKET_CACHE_SIZE,
+        refresh_ttl: float = MARKET_REFRESH_TTL,
+        miss_ttl: float = MARKET_MISS_TTL,
+        metadata_ttl: float = MARKET_METADATA_TTL
+    ):
+        self.max_size = max_size
+        self.refresh_ttl = refresh_ttl
+        self.miss_ttl = miss_ttl
+        self.metadata_ttl = metadata_ttl
+        self._entries: 'OrderedDict[str, MarketCacheEntry]' = OrderedDict()
+        self._misses: Dict[str, float] = {}
+        self._watched: Dict[str, Tuple[float, Optional[bool]]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+    
+    def _entry(self, slug: str, now: float) -> Optional[MarketCacheEntry]:
+        entry = self._entries.get(slug)
+        if entry is None:
+            return None
+        if entry.expires_at is not None and now >= entry.expires_at:
+            del self._entries[slug]
+            return None
+        self._entries.move_to_end(slug)
+        return entry
+    
+    def _is_fresh(self, entry: MarketCacheEntry, now: float) -> bool:
+        return now - entry.refreshed_at < self.refresh_ttl
+    
+    def _has_metadata(self, entry: MarketCacheEntry, now: float) -> bool:
+        if entry.held_until is not None and now < entry.held_until:
+            return True
+        return now - entry.fetched_at < self.metadata_ttl
+    
+    def get(self, slug: str) -> Optional[Dict]:
+        now = time.time()
+        with self._lock:
+            entry = self._entry(slug, now)
+            if entry is None or not self._is_fresh(entry, now):
+                self.misses += 1
+                return None
+            self.hits += 1
+            return {**entry.dynamic, **entry.static}
+    
+    def get_static(self, slug: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entry(slug, time.time())
+            return dict(entry.static) if entry else None
+    
+    def peek(self, slug: str) -> Optional[Dict]:
+        # Stale prices are fine here; the caller only wants metadata from a recent full fetch
+        now = time.time()
+        with self._lock:
+            entry = self._entry(slug, now)
+            if entry is None or not self._has_metadata(entry, now):
+                return None
+            return {**entry.dynamic, **entry.static}
+    
+    def is_missing(self, slug: str) -> bool:
+        now = time.time()
+        with self._lock:
+            until = self._misses.get(slug)
+            if until is None:
+                return False
+            if now >= until:
+                del self._misses[slug]
+                return False
+            self.negative_hits += 1
+            return True
+    
+    def put(
+        self,
+        slug: str,
+        market: Dict,
+        expires_at: Optional[float] = None,
+        held_until: Optional[float] = None
+    ):
+        now = time.time()
+        if expires_at is not None and expires_at <= now:
+            return
+        
+        static = {k: market[k] for k in STATIC_FIELDS if k in market}
+        dynamic = {k: v for k, v in market.items() if k not in static}
+        
+        with self._lock:
+            self._misses.pop(slug, None)
+            self._entries[slug] = MarketCacheEntry(static, dynamic, now, expires_at, held_until, now)
+            self._entries.move_to_end(slug)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def put_missing(self, slug: str, ttl: Optional[float] = None):
+        with self._lock:
+            self._misses[slug] = time.time() + (self.miss_ttl if ttl is None else ttl)
+    
+    def update_dynamic(self, slug: str, fields: Dict) -> bool:
+        now = time.time()
+        with self._lock:
+            entry = self._entry(slug, now)
+            if entry is None:
+                return False
+            entry.dynamic = {**entry.dynamic, **fields}
+            entry.refreshed_at = now
+            return True
+    
+    def hold(self, slug: str, held_until: float) -> bool:
+        # Keeps slug, tokens and dates usable for a price-only refresh; prices still age out on refresh_ttl
+        with self._lock:
+            entry = self._entry(slug, time.time())
+            if entry is None:
+                return False
+            entry.held_until = held_until
+            return True
+    
+    def watch(self, slugs: List[str], after: float):
+        with self._lock:
+            for slug in slugs:
+                self._watched[slug] = (after, None)
+    
+    def observe(self, slug: str, hit: bool):
+        # Only the first lookup after the watch time counts, which is the poll the prefetch was for
+        if slug not in self._watched:
+            return
+        with self._lock:
+            item = self._watched.get(slug)
+            if item is not None and item[1] is None and time.time() >= item[0]:
+                self._watched[slug] = (item[0], hit)
+    
+    def observed(self, slugs: List[str], release: bool = False) -> Dict[str, Optional[bool]]:
+        with self._lock:
+            result = {slug: self._watched[slug][1] for slug in slugs if slug in self._watched}
+            if release:
+                for slug in slugs:
+                    self._watched.pop(slug, None)
+            return result
+    
+    def invalidate(self, slug: str):
+        with self._lock:
+            self._entries.pop(slug, None)
+            self._misses.pop(slug, None)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._misses.clear()
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'negative_entries': len(self._misses),
+                'hits': self.hits,
+                'misses': self.misses,
+                'negative_hits': self.negative_hits,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+
+class IntervalPriceCache:
+    def __init__(self, max_size: int = MARKET_CACHE_SIZE):
+        self.max_size = max_size
+        self._prices: 'OrderedDict[Tuple[str, str, int], Tuple[float, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, symbol: str, timeframe: str, interval_ts: int) -> Optional[float]:
+        key = (symbol, timeframe, interval_ts)
+        with self._lock:
+            item = self._prices.get(key)
+            if item is None:
+                return None
+            price, expires_at = item
+            if time.time() >= expires_at:
+                del self._prices[key]
+                return None
+            return price
+    
+    def put(self, symbol: str, timeframe: str, interval_ts: int, price: float, expires_at: float):
+        if time.time() >= expires_at:
+            return
+        
+        key = (symbol, timeframe, interval_ts)
+        with self._lock:
+            self._prices[key] = (price, expires_at)
+            self._prices.move_to_end(key)
+            while len(self._prices) > self.max_size:
+                self._prices.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._prices.clear()
+
+
+_market_cache: Optional[MarketCache] = None
+_market_cache_lock = threading.Lock()
+
+
+def get_market_cache() -> MarketCache:
+    global _market_cache
+    if _market_cache is None:
+        with _market_cache_lock:
+            if _market_cache is None:
+                _market_cache = MarketCache()
+    return _market_cache
+
+
+_price_cache: Optional[IntervalPriceCache] = None
+
+
+def get_price_cache() -> IntervalPriceCache:
+    global _price_cache
+    if _price_cache is None:
+        with _market_cache_lock:
+            if _price_cache is None:
+                _price_cache = IntervalPriceCache()
+    return _price_cache
@@ -1,8 +1,13 @@
-import requests
-from typing import List, Dict, Optional
+from functools import partial
+from typing import List, Dict, Optional, Callable, Tuple
 from datetime import datetime, timezone
 from .models import Timeframe, TimeframeConfig, CryptoPriceData, CryptoMarketData
-from ..utils.market import generate_market_slug, get_interval_timestamps
+from .cache import get_market_cache, get_price_cache
+from .gamma import resolve_market_slugs
+from ..utils.market import generate_market_slug
+from ..utils.intervals import get_interval_calendar
+from ..utils.concurrency import fan_out
+from ..utils.http import get_session
 
 
 class TimeframeRegistry:
@@ -38,8 +43,7 @@ class TimeframeRegistry:
 
 class CryptoFetcherBase:
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.session = get_session({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)',
             'Content-Type': 'application/json',
             'Referer': 'https://polymarket.com/',
@@ -47,11 +51,20 @@ class CryptoFetcherBase:
         })
         self.gamma_base_url = 'https://gamma-api.polymarket.com'
         self.crypto_price_url = 'https://polymarket.com/api/crypto/crypto-price'
+        self.market_cache = get_market_cache()
+        self.price_cache = get_price_cache()
     
-    def _fetch_market_by_slug(self, slug: str) -> Optional[Dict]:
+    def _fetch_market_by_slug(self, slug: str, expires_at: Optional[float] = None) -> Optional[Dict]:
         if not slug:
             return None
         
+        cached = self.market_cache.get(slug)
+        self.market_cache.observe(slug, bool(cached))
+        if cached:
+            return cached
+        if self.market_cache.is_missing(slug):
+            return None
+        
         try:
             resp = self.session.get(
                 f'{self.gamma_base_url}/markets/slug/{slug}',
@@ -61,7 +74,10 @@ class CryptoFetcherBase:
                 market = resp.json()
                 if 'question' not in market or 'conditionId' not in market:
                     return None
+                self.market_cache.put(slug, market, expires_at)
                 return market
+            if resp.status_code == 404:
+                self.market_cache.put_missing(slug)
             return None
         except Exception as e:
             print(f"Error fetching market by slug {slug}: {e}")
@@ -118,7 +134,7 @@ class CryptoTimeframeFetcher(CryptoFetcherBase):
         if not raw_data:
             return None
         
-        return CryptoPriceData(
+        price_data = CryptoPriceData(
             symbol=symbol,
             timeframe=self.config.name,
             timestamp=interval_start_ts,
@@ -127,6 +143,29 @@ class CryptoTimeframeFetcher(CryptoFetcherBase):
             completed=raw_data.get('completed', False) or raw_data.get('cached', False),
             incomplete=raw_data.get('incomplete', False)
         )
+        
+        if price_data.open_price is not None:
+            self.price_cache.put(
+                symbol,
+                self.config.name,
+                interval_start_ts,
+                price_data.open_price,
+                interval_start_ts + self.config.duration_seconds
+            )
+        
+        return price_data
+    
+    def get_price_to_beat(
+        self,
+        interval_start_ts: int,
+        symbol: str = 'BTC'
+    ) -> Optional[float]:
+        cached = self.price_cache.get(symbol, self.config.name, interval_start_ts)
+        if cached is not None:
+            return cached
+        
+        price_data = self.get_price_data(interval_start_ts, symbol)
+        return price_data.open_price if price_data else None
     
     def get_market_data(
         self,
@@ -134,11 +173,20 @@ class CryptoTimeframeFetcher(CryptoFetcherBase):
         symbol: str = 'BTC'
     ) -> Optional[CryptoMarketData]:
         slug = generate_market_slug(interval_start_ts, symbol, self.config.name)
-        market = self._fetch_market_by_slug(slug)
+        market = self._fetch_market_by_slug(slug, interval_start_ts + self.config.duration_seconds)
         
         if not market:
             return None
         
+        return self._build_market_data(market, slug, symbol, interval_start_ts)
+    
+    def _build_market_data(
+        self,
+        market: Dict,
+        slug: str,
+        symbol: str,
+        interval_start_ts: int
+    ) -> CryptoMarketData:
         return CryptoMarketData(
             condition_id=market.get('conditionId', ''),
             symbol=symbol,
@@ -153,56 +201,61 @@ class CryptoTimeframeFetcher(CryptoFetcherBase):
             outcomes=market.get('outcomes', [])
         )
     
-    def get_active_markets(
-        self,
-        symbols: List[str] = None
-    ) -> List[CryptoMarketData]:
+    def _market_lookups(self, symbols: List[str] = None) -> Dict[str, Tuple[str, int]]:
         if symbols is None:
             symbols = ['BTC', 'ETH', 'SOL', 'XRP']
         
+        lookups = {}
+        for symbol, interval_ts, slug in get_interval_calendar().candidates(self.config.name, symbols):
+            if slug not in lookups:
+                lookups[slug] = (symbol, interval_ts)
+        
+        return lookups
+    
+    def _market_expiries(self, lookups: Dict[str, Tuple[str, int]]) -> Dict[str, float]:
+        return {slug: ts + self.config.duration_seconds for slug, (_, ts) in lookups.items()}
+    
+    def _collect_active_markets(
+        self,
+        lookups: Dict[str, Tuple[str, int]],
+        resolved: Dict[str, Dict]
+    ) -> List[CryptoMarketData]:
         active_markets = []
-        seen_slugs = set()
+        for slug, (symbol, interval_ts) in lookups.items():
+            market = resolved.get(slug)
+            if not market:
+                continue
+            market_data = self._build_market_data(market, slug, symbol, interval_ts)
+            if market_data.active and not market_data.closed:
+                active_markets.append(market_data)
         
+        active_markets.sort(key=lambda x: x.start_date, reverse=True)
+        return active_markets
+    
+    def get_active_markets(
+        self,
+        symbols: List[str] = None
+    ) -> List[CryptoMarketData]:
         try:
-            intervals = get_interval_timestamps(self.config.name)
-            
-            for symbol in symbols:
-                for interval_ts in intervals:
-                    slug = generate_market_slug(interval_ts, symbol, self.config.name)
-                    
-                    if slug in seen_slugs:
-                        continue
-                    seen_slugs.add(slug)
-                    
-                    market_data = self.get_market_data(interval_ts, symbol)
-                    if market_data and market_data.active and not market_data.closed:
-                        active_markets.append(market_data)
+            lookups = self._market_lookups(symbols)
+            resolved = resolve_market_slugs(self.session, list(lookups), self._market_expiries(lookups))
+            return self._collect_active_markets(lookups, resolved)
         except Exception as e:
             print(f"Error fetching active {self.config.name} markets: {e}")
+            return []
+    
+    def _price_calls(self, symbols: List[str] = None) -> List[Callable[[], Optional[CryptoPriceData]]]:
+        if symbols is None:
+            symbols = ['BTC', 'ETH', 'SOL', 'XRP']
         
-        active_markets.sort(key=lambda x: x.start_date, reverse=True)
-        return active_markets
+        current_interval = get_interval_calendar().interval_start(self.config.name)
+        return [partial(self.get_price_data, current_interval, symbol) for symbol in symbols]
     
     def get_current_interval_prices(
         self,
         symbols: List[str] = None
     ) -> List[CryptoPriceData]:
-        if symbols is None:
-            symbols = ['BTC', 'ETH', 'SOL', 'XRP']
-        
-        prices = []
-        intervals = get_interval_timestamps(self.config.name)
-        current_interval = intervals[0] if intervals else None
-        
-        if not current_interval:
-            return prices
-        
-        for symbol in symbols:
-            price_data = self.get_price_data(current_interval, symbol)
-            if price_data:
-                prices.append(price_data)
-        
-        return prices
+        return [p for p in fan_out(self._price_calls(symbols)) if p]
 
 
 class CryptoFetcherManager(CryptoFetcherBase):
@@ -234,13 +287,25 @@ class CryptoFetcherManager(CryptoFetcherBase):
         if timeframes is None:
             timeframes = list(Timeframe)
         
-        result = {}
-        for timeframe in timeframes:
-            fetcher = self.get_fetcher(timeframe)
-            markets = fetcher.get_active_markets(symbols)
-            result[fetcher.config.name] = markets
+        fetchers = [self.get_fetcher(timeframe) for timeframe in timeframes]
+        lookups = [fetcher._market_lookups(symbols) for fetcher in fetchers]
         
-        return result
+        slugs = []
+        expiries = {}
+        for fetcher, group in zip(fetchers, lookups):
+            slugs.extend(group)
+            expiries.update(fetcher._market_expiries(group))
+        
+        try:
+            resolved = resolve_market_slugs(self.session, slugs, expiries)
+        except Exception as e:
+            print(f"Error fetching active markets: {e}")
+            resolved = {}
+        
+        return {
+            fetcher.config.name: fetcher._collect_active_markets(group, resolved)
+            for fetcher, group in zip(fetchers, lookups)
+        }
     
     def get_all_current_prices(
         self,
@@ -250,11 +315,15 @@ class CryptoFetcherManager(CryptoFetcherBase):
         if timeframes is None:
             timeframes = list(Timeframe)
         
+        fetchers = [self.get_fetcher(timeframe) for timeframe in timeframes]
+        calls = [fetcher._price_calls(symbols) for fetcher in fetchers]
+        results = fan_out([call for group in calls for call in group])
+        
         result = {}
-        for timeframe in timeframes:
-            fetcher = self.get_fetcher(timeframe)
-            prices = fetcher.get_current_interval_prices(symbols)
-            result[fetcher.config.name] = prices
+        offset = 0
+        for fetcher, group in zip(fetchers, calls):
+            result[fetcher.config.name] = [p for p in results[offset:offset + len(group)] if p]
+            offset += len(group)
         
         return result
 
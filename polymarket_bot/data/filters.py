@@ -1,24 +1,111 @@
-from typing import List, Dict
+import re
+from typing import List, Dict, Iterable, Tuple, Any
 
-
-def filter_financial_markets(markets: List[Dict], min_volume: float) -> List[Dict]:
-    financial_keywords = [
+KEYWORD_CATEGORIES: Dict[str, List[str]] = {
+    'finance': [
         'sp500', 'sp 500', 's&p', 'dow', 'nasdaq', 'stock', 'equity',
         'financial', 'fed', 'interest rate', 'inflation', 'gdp', 'treasury',
         'bond', 'yield', 'federal reserve', 'unemployment', 'cpi', 'ppi',
         'federal spending', 'budget'
-    ]
+    ],
+    'crypto': [
+        'bitcoin', 'btc', 'ethereum', 'solana', 'xrp', 'crypto', 'blockchain',
+        'stablecoin', 'dogecoin', 'memecoin', 'coinbase', 'binance'
+    ],
+    'politics': [
+        'election', 'president', 'senate', 'congress', 'governor', 'parliament',
+        'prime minister', 'democrat', 'republican', 'primary', 'nominee', 'cabinet'
+    ],
+}
+
+
+class KeywordMatcher:
+    def __init__(self, keywords: Iterable[str], cache_size: int = 100000):
+        self.keywords = tuple(dict.fromkeys(kw.lower() for kw in keywords if kw))
+        # Longest first so the alternation prefers the most specific keyword
+        ordered = sorted(self.keywords, key=len, reverse=True)
+        self.pattern = re.compile('|'.join(re.escape(kw) for kw in ordered)) if ordered else None
+        # Every way a multi-word keyword can straddle a tag boundary: (end of one tag, start of what follows)
+        self.splits = [(kw[:i], kw[i + 1:]) for kw in self.keywords for i, c in enumerate(kw) if c == ' ']
+        self.heads = tuple(dict.fromkeys(head for head, _ in self.splits))
+        self.cache_size = cache_size
+        self._tags: Dict[Any, Tuple[str, bool, bool]] = {}
+    
+    def matches(self, text: str) -> bool:
+        return self.pattern is not None and self.pattern.search(text) is not None
+    
+    def tag(self, tag: Any) -> Tuple[str, bool, bool]:
+        # Tag vocabulary is small and repeats across calls, so each distinct tag is lowered and matched once
+        info = self._tags.get(tag)
+        if info is None:
+            text = str(tag).lower()
+            info = (text, self.matches(text), bool(self.heads) and text.endswith(self.heads))
+            if len(self._tags) >= self.cache_size:
+                self._tags.clear()
+            self._tags[tag] = info
+        return info
+    
+    def _straddles(self, texts: List[str], i: int) -> bool:
+        for head, tail in self.splits:
+            if not texts[i].endswith(head):
+                continue
+            rest = tail
+            for text in texts[i + 1:]:
+                if len(rest) <= len(text):
+                    if text.startswith(rest):
+                        return True
+                    break
+                if not rest.startswith(text + ' '):
+                    break
+                rest = rest[len(text) + 1:]
+        return False
+    
+    def matches_tags(self, tags: List[Any]) -> bool:
+        infos = [self.tag(t) for t in tags]
+        if any(matched for _, matched, _ in infos):
+            return True
+        
+        # Tags used to be matched as one space-joined string, so a multi-word keyword
+        # may run across adjacent tags; walk the token sequence only where a tag ends in a keyword head
+        texts = None
+        for i in range(len(infos) - 1):
+            if infos[i][2]:
+                texts = texts or [text for text, _, _ in infos]
+                if self._straddles(texts, i):
+                    return True
+        return False
+
+
+_matchers: Dict[str, KeywordMatcher] = {}
+
+
+def register_category(category: str, keywords: Iterable[str]):
+    KEYWORD_CATEGORIES[category] = list(keywords)
+    _matchers.pop(category, None)
+
+
+def get_matcher(category: str) -> KeywordMatcher:
+    matcher = _matchers.get(category)
+    if matcher is None:
+        matcher = KeywordMatcher(KEYWORD_CATEGORIES.get(category, []))
+        _matchers[category] = matcher
+    return matcher
+
+
+def filter_markets_by_category(markets: List[Dict], category: str, min_volume: float) -> List[Dict]:
+    matcher = get_matcher(category)
     
     filtered = []
     for m in markets:
-        question = str(m.get('question', '')).lower()
-        tags = [str(t).lower() for t in (m.get('tags', []) or [])]
-        tag_str = ' '.join(tags)
-        
-        is_financial = any(kw in question for kw in financial_keywords) or any(kw in tag_str for kw in financial_keywords)
         vol = float(m.get('volume', 0) or 0)
+        if vol < min_volume:
+            continue
         
-        if is_financial and vol >= min_volume:
+        if matcher.matches_tags(m.get('tags', []) or []) or matcher.matches(str(m.get('question', '')).lower()):
             filtered.append(m)
     
     return filtered
+
+
+def filter_financial_markets(markets: List[Dict], min_volume: float) -> List[Dict]:
+    return filter_markets_by_category(markets, 'finance', min_volume)
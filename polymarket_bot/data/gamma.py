@@ -0,0 +1,176 @@
+import heapq
+import json
+import requests
+from functools import partial
+from typing import List, Dict, Optional, Callable, Set
+from ..config import GAMMA_SLUG_BATCH_SIZE
+from ..utils.concurrency import fan_out
+from ..utils.market import normalize_market, parse_json_fields
+from .cache import MarketCache, get_market_cache
+from .filters import filter_financial_markets
+
+GAMMA_URL = 'https://gamma-api.polymarket.com'
+
+
+def _fetch_slug_batch(session: requests.Session, slugs: List[str]) -> Optional[List[Dict]]:
+    try:
+        resp = session.get(
+            f'{GAMMA_URL}/markets',
+            params={'slug': slugs, 'limit': len(slugs)},
+            timeout=10
+        )
+        if resp.status_code == 200:
+            data = resp.json()
+            return data if isinstance(data, list) else []
+        return None
+    except Exception as e:
+        print(f"Error fetching {len(slugs)} markets by slug: {e}")
+        return None
+
+
+def _refresh_prices(
+    cache: MarketCache,
+    slugs: List[str],
+    price_source: Callable[[List[str]], Dict[str, float]],
+    held_until: Optional[float] = None
+) -> Dict[str, Dict]:
+    known = {}
+    for slug in slugs:
+        market = cache.peek(slug)
+        if not market:
+            continue
+        try:
+            tokens = parse_json_fields(dict(market)).get('clobTokenIds') or []
+        except ValueError:
+            continue
+        if tokens:
+            known[slug] = (market, tokens)
+    
+    if not known:
+        return {}
+    
+    try:
+        prices = price_source([t for _, tokens in known.values() for t in tokens])
+    except Exception as e:
+        print(f"Error refreshing prices for {len(known)} markets: {e}")
+        return {}
+    
+    result = {}
+    for slug, (market, tokens) in known.items():
+        if not all(t in prices for t in tokens):
+            continue
+        outcome_prices = json.dumps([str(prices[t]) for t in tokens])
+        cache.update_dynamic(slug, {'outcomePrices': outcome_prices})
+        if held_until is not None:
+            cache.hold(slug, held_until)
+        result[slug] = {**market, 'outcomePrices': outcome_prices}
+    return result
+
+
+def resolve_market_slugs(
+    session: requests.Session,
+    slugs: List[str],
+    expires_at: Optional[Dict[str, float]] = None,
+    cache: Optional[MarketCache] = None,
+    batch_size: int = GAMMA_SLUG_BATCH_SIZE,
+    held_until: Optional[float] = None,
+    price_source: Optional[Callable[[List[str]], Dict[str, float]]] = None,
+    failed: Optional[Set[str]] = None
+) -> Dict[str, Dict]:
+    cache = cache or get_market_cache()
+    expires_at = expires_at or {}
+    
+    result = {}
+    pending = []
+    for slug in dict.fromkeys(slugs):
+        cached = cache.get(slug)
+        if cached:
+            result[slug] = cached
+            cache.observe(slug, True)
+            if held_until is not None:
+                cache.hold(slug, held_until)
+        elif not cache.is_missing(slug):
+            pending.append(slug)
+    
+    # Markets with recent metadata only need new prices, not the full gamma document
+    if price_source is not None and pending:
+        refreshed = _refresh_prices(cache, pending, price_source, held_until)
+        result.update(refreshed)
+        pending = [slug for slug in pending if slug not in refreshed]
+        for slug in refreshed:
+            cache.observe(slug, True)
+    
+    for slug in pending:
+        cache.observe(slug, False)
+    
+    batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+    pages = fan_out([partial(_fetch_slug_batch, session, batch) for batch in batches])
+    
+    for batch, markets in zip(batches, pages):
+        # A failed or late batch says nothing about whether its slugs exist
+        if markets is None:
+            if failed is not None:
+                failed.update(batch)
+            continue
+        
+        found = {
+            m.get('slug'): m for m in markets
+            if m.get('slug') and 'question' in m and 'conditionId' in m
+        }
+        for slug in batch:
+            market = found.get(slug)
+            if market:
+                cache.put(slug, market, expires_at.get(slug), held_until)
+                result[slug] = market
+            else:
+                cache.put_missing(slug)
+    
+    return result
+
+
+def market_page_params(offset: int, page_size: int, active: bool) -> Dict:
+    return {
+        "limit": page_size,
+        "offset": offset,
+        "active": str(active).lower(),
+        "closed": "false",
+        "order": "volumeNum",
+        "ascending": "false"
+    }
+
+
+class TopFinancialMarkets:
+    def __init__(self, limit: int, min_volume: float, min_liquidity: float, seen_condition_ids: Set[str]):
+        self.limit = limit
+        self.min_volume = min_volume
+        self.min_liquidity = min_liquidity
+        self.seen_condition_ids = seen_condition_ids
+        self.heap: List = []
+    
+    def add_page(self, page: List[Dict]) -> bool:
+        for m in filter_financial_markets(page, self.min_volume):
+            cid = m.get('conditionId') or m.get('condition_id')
+            if not cid or cid in self.seen_condition_ids:
+                continue
+            normalized = normalize_market(m)
+            if not normalized or normalized['liquidity'] < self.min_liquidity:
+                continue
+            self.seen_condition_ids.add(cid)
+            
+            entry = (normalized['volume'], len(self.seen_condition_ids), normalized)
+            if len(self.heap) < self.limit:
+                heapq.heappush(self.heap, entry)
+            elif self.heap and entry[0] > self.heap[0][0]:
+                heapq.heapreplace(self.heap, entry)
+        
+        # Pages arrive by descending volume, so once a page tails off below the
+        # volume floor or the heap minimum nothing later can enter the top-K
+        volumes = [float(m.get('volume', 0) or 0) for m in page]
+        if volumes and all(a >= b for a, b in zip(volumes, volumes[1:])):
+            floor = self.heap[0][0] if self.heap and len(self.heap) >= self.limit else self.min_volume
+            if volumes[-1] < floor:
+                return False
+        return True
+    
+    def markets(self) -> List[Dict]:
+        return [entry[2] for entry in self.heap]
@@ -0,0 +1,248 @@
+import time
+import threading
+from collections import deque
+from dataclasses import dataclass, field, asdict
+from functools import partial
+from typing import List, Dict, Optional, Deque, Set
+from ..config import PREFETCH_LEAD, PREFETCH_GRACE, INTERVAL_HORIZON
+from ..utils.concurrency import fan_out
+from ..utils.intervals import get_interval_calendar
+from .models import Timeframe
+from .gamma import resolve_market_slugs
+from .fetchers import CryptoFetcherManager, CryptoTimeframeFetcher
+
+
+@dataclass
+class BoundaryStats:
+    timeframe: str
+    boundary: int
+    prefetched_at: float
+    slugs: List[str]
+    markets_prefetched: int
+    market_hits: int = 0
+    market_misses: int = 0
+    price_hits: int = 0
+    price_misses: int = 0
+    price_latency: Optional[float] = None
+    pending_prices: Set[str] = field(default_factory=set)
+
+
+class BoundaryPrefetcher:
+    def __init__(
+        self,
+        symbols: List[str] = None,
+        timeframes: List[Timeframe] = None,
+        lead: float = PREFETCH_LEAD,
+        grace: float = PREFETCH_GRACE,
+        offsets: tuple = None,
+        history: int = 100
+    ):
+        self.manager = CryptoFetcherManager()
+        self.calendar = get_interval_calendar()
+        self.symbols = list(symbols or ['BTC', 'ETH', 'SOL', 'XRP'])
+        self.timeframes = list(timeframes or list(Timeframe))
+        self.lead = lead
+        self.grace = grace
+        self.offsets = offsets or tuple(range(1, INTERVAL_HORIZON + 1))
+        self.history: Deque[BoundaryStats] = deque(maxlen=history)
+        self._upcoming: Dict[str, BoundaryStats] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+    
+    def _fetchers(self) -> List[CryptoTimeframeFetcher]:
+        return [self.manager.get_fetcher(timeframe) for timeframe in self.timeframes]
+    
+    def warm(self, fetchers: List[CryptoTimeframeFetcher], now: Optional[float] = None):
+        now = time.time() if now is None else now
+        
+        lookups = {}
+        expiries = {}
+        boundaries = {}
+        for fetcher in fetchers:
+            name = fetcher.config.name
+            boundaries[name] = self.calendar.interval_end(name, 0, now)
+            group = {}
+            for symbol, interval_ts, slug in self.calendar.candidates(name, self.symbols, self.offsets, now):
+                group.setdefault(slug, (symbol, interval_ts))
+            lookups[name] = group
+            expiries.update(fetcher._market_expiries(group))
+        
+        # Warmed metadata is held until just past the boundary so the first poll of the
+        # new interval only needs fresh prices, not the full gamma document
+        held_until = max(boundaries.values()) + self.grace if boundaries else None
+        try:
+            resolved = resolve_market_slugs(self.manager.session, list(expiries), expiries, held_until=held_until)
+        except Exception as e:
+            print(f"Error prefetching markets: {e}")
+            resolved = {}
+        
+        with self._lock:
+            for fetcher in fetchers:
+                name = fetcher.config.name
+                boundary = boundaries[name]
+                slugs = [slug for slug, (_, ts) in lookups[name].items() if ts == boundary]
+                self.manager.market_cache.watch(slugs, boundary)
+                self._upcoming[name] = BoundaryStats(
+                    timeframe=name,
+                    boundary=boundary,
+                    prefetched_at=time.time(),
+                    slugs=slugs,
+                    markets_prefetched=sum(1 for slug in lookups[name] if slug in resolved),
+                    pending_prices=set(self.symbols)
+                )
+    
+    def _check_markets(self, stats: BoundaryStats, release: bool = False) -> bool:
+        # Hit or miss is whatever the first real poll after the boundary saw
+        observed = self.manager.market_cache.observed(stats.slugs, release)
+        stats.market_hits = sum(1 for hit in observed.values() if hit)
+        stats.market_misses = sum(1 for hit in observed.values() if hit is False)
+        return all(hit is not None for hit in observed.values())
+    
+    def _capture_prices(self, settling: List[BoundaryStats]):
+        calls = []
+        owners = []
+        for stats in settling:
+            fetcher = self.manager.get_fetcher(Timeframe(stats.timeframe))
+            for symbol in sorted(stats.pending_prices):
+                calls.append(partial(fetcher.get_price_to_beat, stats.boundary, symbol))
+                owners.append((stats, symbol))
+        
+        for (stats, symbol), price in zip(owners, fan_out(calls)):
+            if price is not None:
+                stats.pending_prices.discard(symbol)
+                stats.price_hits += 1
+                if not stats.pending_prices:
+                    stats.price_latency = time.time() - stats.boundary
+    
+    def settle(self, now: Optional[float] = None):
+        now = time.time() if now is None else now
+        with self._lock:
+            settling = [s for s in self._upcoming.values() if s.boundary <= now]
+        
+        if not settling:
+            return
+        
+        self._capture_prices([s for s in settling if s.pending_prices])
+        
+        done = time.time()
+        with self._lock:
+            for stats in settling:
+                expired = done >= stats.boundary + self.grace
+                polled = self._check_markets(stats, release=expired)
+                if (stats.pending_prices or not polled) and not expired:
+                    continue
+                if not expired:
+                    self.manager.market_cache.observed(stats.slugs, release=True)
+                
+                stats.price_misses = len(stats.pending_prices)
+                stats.pending_prices = set()
+                self.history.append(stats)
+                if self._upcoming.get(stats.timeframe) is stats:
+                    del self._upcoming[stats.timeframe]
+                
+                print(
+                    f"Prefetch {stats.timeframe} @ {stats.boundary}: "
+                    f"markets {stats.market_hits}/{stats.market_hits + stats.market_misses}, "
+                    f"prices {stats.price_hits}/{stats.price_hits + stats.price_misses}"
+                )
+    
+    def _next_wake(self, now: float) -> float:
+        wake = now + 30
+        with self._lock:
+            upcoming = dict(self._upcoming)
+        
+        for fetcher in self._fetchers():
+            name = fetcher.config.name
+            stats = upcoming.get(name)
+            if stats is None:
+                wake = min(wake, self.calendar.interval_end(name, 0, now) - self.lead)
+            elif stats.boundary <= now:
+                wake = min(wake, now + 0.5)
+            else:
+                wake = min(wake, stats.boundary)
+        
+        return max(wake - now, 0)
+    
+    def step(self, now: Optional[float] = None):
+        now = time.time() if now is None else now
+        
+        due = []
+        with self._lock:
+            upcoming = dict(self._upcoming)
+        for fetcher in self._fetchers():
+            name = fetcher.config.name
+            boundary = self.calendar.interval_end(name, 0, now)
+            stats = upcoming.get(name)
+            # A timeframe still settling its last boundary is warmed once that finishes
+            if stats is None and boundary - now <= self.lead:
+                due.append(fetcher)
+        
+        self.settle(now)
+        if due:
+            self.warm(due, now)
+    
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.step()
+            except Exception as e:
+                print(f"Prefetcher error: {e}")
+            self._stop.wait(self._next_wake(time.time()))
+    
+    def start(self):
+        if self.thread and self.thread.is_alive():
+            return
+        
+        self._stop.clear()
+        self.thread = threading.Thread(target=self._run, name='polybrain-prefetch', daemon=True)
+        self.thread.start()
+    
+    def stop(self):
+        self._stop.set()
+        if self.thread:
+            self.thread.join(timeout=5)
+    
+    @property
+    def running(self) -> bool:
+        return self.thread is not None and self.thread.is_alive()
+    
+    def stats(self, timeframe: Optional[str] = None) -> Dict:
+        with self._lock:
+            boundaries = [s for s in self.history if timeframe is None or s.timeframe == timeframe]
+        
+        market_hits = sum(s.market_hits for s in boundaries)
+        market_lookups = market_hits + sum(s.market_misses for s in boundaries)
+        price_hits = sum(s.price_hits for s in boundaries)
+        price_lookups = price_hits + sum(s.price_misses for s in boundaries)
+        
+        recent = []
+        for s in boundaries[-10:]:
+            item = asdict(s)
+            item.pop('pending_prices')
+            item.pop('slugs')
+            recent.append(item)
+        
+        return {
+            'boundaries': len(boundaries),
+            'market_hits': market_hits,
+            'market_misses': market_lookups - market_hits,
+            'market_hit_rate': market_hits / market_lookups if market_lookups else 0.0,
+            'price_hits': price_hits,
+            'price_misses': price_lookups - price_hits,
+            'price_hit_rate': price_hits / price_lookups if price_lookups else 0.0,
+            'recent': recent
+        }
+
+
+_prefetcher: Optional[BoundaryPrefetcher] = None
+_prefetcher_lock = threading.Lock()
+
+
+def get_boundary_prefetcher() -> BoundaryPrefetcher:
+    global _prefetcher
+    if _prefetcher is None:
+        with _prefetcher_lock:
+            if _prefetcher is None:
+                _prefetcher = BoundaryPrefetcher()
+    return _prefetcher
@@ -0,0 +1,244 @@
+import asyncio
+import json
+import random
+import threading
+import time
+import websockets
+from typing import List, Dict, Optional, Iterable
+from ..config import (
+    REFERENCE_WS_URL,
+    REFERENCE_REST_URL,
+    REFERENCE_HISTORY,
+    REFERENCE_STALE_AFTER,
+    MARKET_STREAM_MAX_BACKOFF
+)
+from ..utils.aio import get_loop
+from ..utils.http import get_session
+from ..utils.intervals import get_interval_calendar
+from ..utils.ring import SecondSeries
+from .cache import get_price_cache
+
+DEFAULT_SYMBOLS = ['BTC', 'ETH', 'SOL', 'XRP']
+QUOTE_ASSET = 'USDT'
+
+
+class ReferencePriceService:
+    def __init__(
+        self,
+        symbols: List[str] = None,
+        ws_url: str = REFERENCE_WS_URL,
+        rest_url: str = REFERENCE_REST_URL,
+        history: int = REFERENCE_HISTORY,
+        stale_after: float = REFERENCE_STALE_AFTER,
+        max_backoff: float = MARKET_STREAM_MAX_BACKOFF
+    ):
+        self.ws_url = ws_url
+        self.rest_url = rest_url
+        self.history = history
+        self.stale_after = stale_after
+        self.max_backoff = max_backoff
+        self.series: Dict[str, SecondSeries] = {}
+        self.session = get_session()
+        self.calendar = get_interval_calendar()
+        self.price_cache = get_price_cache()
+        self._task: Optional[asyncio.Future] = None
+        self._ws = None
+        self._lock = threading.Lock()
+        self._last_poll = 0.0
+        self.connected = False
+        self.ticks = 0
+        self.polls = 0
+        self.reconnects = 0
+        self.add_symbols(symbols or DEFAULT_SYMBOLS)
+    
+    def _stream_name(self, symbol: str) -> str:
+        return f'{symbol.lower()}{QUOTE_ASSET.lower()}@aggTrade'
+    
+    def add_symbols(self, symbols: Iterable[str]):
+        added = []
+        with self._lock:
+            for symbol in symbols:
+                symbol = symbol.upper()
+                if symbol not in self.series:
+                    self.series[symbol] = SecondSeries(self.history)
+                    added.append(symbol)
+        
+        ws = self._ws
+        if added and ws is not None:
+            message = {'method': 'SUBSCRIBE', 'params': [self._stream_name(s) for s in added], 'id': int(time.time())}
+            asyncio.run_coroutine_threadsafe(ws.send(json.dumps(message)), get_loop())
+    
+    @property
+    def symbols(self) -> List[str]:
+        return list(self.series)
+    
+    def _push(self, symbol: str, timestamp: float, price: float):
+        series = self.series.get(symbol)
+        if series is not None:
+            series.push(timestamp, price)
+    
+    def _handle(self, raw: str):
+        try:
+            message = json.loads(raw)
+        except ValueError:
+            return
+        
+        data = message.get('data', message) if isinstance(message, dict) else None
+        if not isinstance(data, dict) or data.get('e') not in ('aggTrade', 'trade'):
+            return
+        
+        pair = str(data.get('s', ''))
+        if not pair.endswith(QUOTE_ASSET):
+            return
+        try:
+            price = float(data['p'])
+            timestamp = float(data.get('T') or data.get('E')) / 1000
+        except (KeyError, TypeError, ValueError):
+            return
+        
+        self.ticks += 1
+        self._push(pair[:-len(QUOTE_ASSET)], timestamp, price)
+    
+    async def _run(self):
+        attempt = 0
+        while True:
+            streams = '/'.join(self._stream_name(s) for s in self.symbols)
+            try:
+                async with websockets.connect(f'{self.ws_url}?streams={streams}', max_size=None) as ws:
+                    self._ws = ws
+                    self.connected = True
+                    attempt = 0
+                    async for raw in ws:
+                        self._handle(raw if isinstance(raw, str) else raw.decode())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Reference price stream disconnected: {e}")
+            finally:
+                self._ws = None
+                self.connected = False
+            
+            attempt += 1
+            self.reconnects += 1
+            delay = min(self.max_backoff, 0.5 * 2 ** min(attempt, 10))
+            await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+    
+    def start(self):
+        if self.running:
+            return
+        self._task = asyncio.run_coroutine_threadsafe(self._run(), get_loop())
+    
+    def stop(self):
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+    
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+    
+    def poll(self, symbols: List[str] = None) -> Dict[str, float]:
+        symbols = [s.upper() for s in (symbols or self.symbols)]
+        self._last_poll = time.time()
+        try:
+            pairs = json.dumps([f'{s}{QUOTE_ASSET}' for s in symbols], separators=(',', ':'))
+            resp = self.session.get(self.rest_url, params={'symbols': pairs}, timeout=5)
+            if resp.status_code != 200:
+                return {}
+            data = resp.json()
+        except Exception as e:
+            print(f"Error polling reference prices: {e}")
+            return {}
+        
+        self.polls += 1
+        now = time.time()
+        prices = {}
+        for item in data if isinstance(data, list) else []:
+            pair = str(item.get('symbol', ''))
+            if not pair.endswith(QUOTE_ASSET):
+                continue
+            try:
+                price = float(item['price'])
+            except (KeyError, TypeError, ValueError):
+                continue
+            symbol = pair[:-len(QUOTE_ASSET)]
+            self._push(symbol, now, price)
+            prices[symbol] = price
+        return prices
+    
+    def _is_fresh(self, symbol: str, now: float) -> bool:
+        series = self.series.get(symbol)
+        return series is not None and series.last_price is not None and now - series.last_time <= self.stale_after
+    
+    def _ensure_fresh(self, symbols: List[str]):
+        now = time.time()
+        stale = [s for s in symbols if not self._is_fresh(s, now)]
+        # REST is the fallback while the stream is down, throttled to one call per second
+        if stale and now - self._last_poll >= 1:
+            self.add_symbols(stale)
+            self.poll(stale)
+    
+    def last_price(self, symbol: str) -> Optional[float]:
+        symbol = symbol.upper()
+        self._ensure_fresh([symbol])
+        series = self.series.get(symbol)
+        return series.last_price if series else None
+    
+    def prices(self, symbols: List[str] = None) -> Dict[str, float]:
+        # Symbols with no price yet are left out rather than reported as 0
+        symbols = [s.upper() for s in (symbols or self.symbols)]
+        self._ensure_fresh(symbols)
+        result = {}
+        for s in symbols:
+            series = self.series.get(s)
+            if series is not None and series.last_price is not None:
+                result[s] = series.last_price
+        return result
+    
+    def returns(self, symbol: str, seconds: int) -> Optional[float]:
+        series = self.series.get(symbol.upper())
+        return series.returns(seconds, time.time()) if series else None
+    
+    def price_to_beat(self, symbol: str, timeframe: str = '15m') -> Optional[float]:
+        symbol = symbol.upper()
+        start = self.calendar.interval_start(timeframe)
+        # Lookups only: the official open captured by the boundary prefetch, else our own feed at the
+        # open; a miss returns None instead of blocking on the crypto-price endpoint
+        price = self.price_cache.get(symbol, timeframe, start)
+        if price is None:
+            series = self.series.get(symbol)
+            price = series.at(start) if series else None
+        return price
+    
+    def distance_to_beat(self, symbol: str, timeframe: str = '15m') -> Optional[float]:
+        last = self.last_price(symbol)
+        target = self.price_to_beat(symbol, timeframe)
+        if last is None or not target:
+            return None
+        return last / target - 1
+    
+    def stats(self) -> Dict:
+        now = time.time()
+        return {
+            'connected': self.connected,
+            'ticks': self.ticks,
+            'polls': self.polls,
+            'reconnects': self.reconnects,
+            'symbols': {
+                s: {'last': series.last_price, 'age': now - series.last_time if series.last_time else None}
+                for s, series in self.series.items()
+            }
+        }
+
+
+_service: Optional[ReferencePriceService] = None
+_service_lock = threading.Lock()
+
+
+def get_reference_service() -> ReferencePriceService:
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = ReferencePriceService()
+    return _service
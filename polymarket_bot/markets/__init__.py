@@ -1,3 +1,4 @@
-from .crypto import CryptoMarkets
+from .crypto import CryptoMarkets, Market
+from .hub import MarketSnapshot, MarketEvent, MarketHub, get_market_hub
 
-__all__ = ['CryptoMarkets']
+__all__ = ['CryptoMarkets', 'Market', 'MarketSnapshot', 'MarketEvent', 'MarketHub', 'get_market_hub']
@@ -1,7 +1,11 @@
-import requests
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Set, Tuple
 from dataclasses import dataclass, asdict
-from datetime import datetime, timezone, timedelta
+from ..core.client import PolymarketClient
+from ..data.cache import get_market_cache
+from ..data.gamma import resolve_market_slugs
+from ..utils.market import INTERVAL_DURATIONS
+from ..utils.http import get_session
+from ..utils.intervals import get_interval_calendar
 
 
 @dataclass
@@ -22,10 +26,10 @@ class Market:
 class CryptoMarkets:
     SYMBOLS = ['BTC', 'ETH', 'SOL', 'XRP']
     TIMEFRAMES = ['15m', '1h', '4h']
+    LOOKAHEAD = 6
     
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.session = get_session({
             'User-Agent': 'Mozilla/5.0',
             'Content-Type': 'application/json',
             'Referer': 'https://polymarket.com/',
@@ -33,47 +37,9 @@ class CryptoMarkets:
         })
         self.gamma_url = 'https://gamma-api.polymarket.com'
         self.price_url = 'https://polymarket.com/api/crypto/crypto-price'
-    
-    def _get_slug(self, timestamp: int, symbol: str, timeframe: str) -> str:
-        symbol_lower = symbol.lower()
-        name = {'BTC': 'bitcoin', 'ETH': 'ethereum', 'SOL': 'solana', 'XRP': 'xrp'}.get(symbol, symbol_lower)
-        
-        if timeframe in ['1h', '4h']:
-            et = timezone(timedelta(hours=-5))
-            dt = datetime.fromtimestamp(timestamp, tz=et)
-            month = dt.strftime('%B').lower()
-            day = dt.day
-            hour = dt.strftime('%I').lstrip('0') or '12'
-            ampm = dt.strftime('%p').lower()
-            return f"{name}-up-or-down-{month}-{day}-{hour}{ampm}-et"
-        
-        return f"{symbol_lower}-updown-{timeframe}-{timestamp}"
-    
-    def _get_intervals(self, timeframe: str) -> List[int]:
-        durations = {'15m': 900, '1h': 3600, '4h': 14400}
-        duration = durations.get(timeframe, 900)
-        
-        et = timezone(timedelta(hours=-5))
-        now = int(datetime.now(et).timestamp())
-        current = (now // duration) * duration
-        
-        # Check current + next 5 intervals to find active markets
-        intervals = []
-        for i in range(6):
-            intervals.append(current + (i * duration))
-        
-        return intervals
-    
-    def _fetch_market(self, slug: str) -> Optional[Dict]:
-        try:
-            resp = self.session.get(f'{self.gamma_url}/markets/slug/{slug}', timeout=10)
-            if resp.status_code == 200:
-                data = resp.json()
-                if 'conditionId' in data:
-                    return data
-        except Exception:
-            pass
-        return None
+        self.market_cache = get_market_cache()
+        self.calendar = get_interval_calendar()
+        self.clob = PolymarketClient()
     
     def _parse_json(self, market: Dict, field: str) -> List:
         import json
@@ -85,38 +51,73 @@ class CryptoMarkets:
                 return []
         return val or []
     
-    def get_market(self, symbol: str, timeframe: str) -> Optional[Market]:
-        intervals = self._get_intervals(timeframe)
+    def _build_market(self, data: Dict, symbol: str, timeframe: str, slug: str) -> Market:
+        outcomes = self._parse_json(data, 'outcomes')
+        token_ids = self._parse_json(data, 'clobTokenIds')
+        outcome_prices = self._parse_json(data, 'outcomePrices')
+        
+        prices = {}
+        for i, outcome in enumerate(outcomes):
+            if i < len(outcome_prices):
+                prices[outcome] = float(outcome_prices[i])
         
-        for ts in intervals:
-            slug = self._get_slug(ts, symbol, timeframe)
-            data = self._fetch_market(slug)
-            
-            if data and data.get('active') and not data.get('closed'):
-                outcomes = self._parse_json(data, 'outcomes')
-                token_ids = self._parse_json(data, 'clobTokenIds')
-                outcome_prices = self._parse_json(data, 'outcomePrices')
-                
-                prices = {}
-                for i, outcome in enumerate(outcomes):
-                    if i < len(outcome_prices):
-                        prices[outcome] = float(outcome_prices[i])
-                
-                return Market(
-                    symbol=symbol,
-                    timeframe=timeframe,
-                    slug=slug,
-                    condition_id=data.get('conditionId', ''),
-                    question=data.get('question', ''),
-                    volume=float(data.get('volume', 0) or 0),
-                    liquidity=float(data.get('liquidity', 0) or 0),
-                    active=True,
-                    outcomes=outcomes,
-                    token_ids=token_ids,
-                    prices=prices
-                )
+        return Market(
+            symbol=symbol,
+            timeframe=timeframe,
+            slug=slug,
+            condition_id=data.get('conditionId', ''),
+            question=data.get('question', ''),
+            volume=float(data.get('volume', 0) or 0),
+            liquidity=float(data.get('liquidity', 0) or 0),
+            active=True,
+            outcomes=outcomes,
+            token_ids=token_ids,
+            prices=prices
+        )
+    
+    def _get_markets(
+        self,
+        timeframes: List[str],
+        symbols: List[str],
+        unresolved: Optional[Set[Tuple[str, str]]] = None
+    ) -> Dict[str, List[Market]]:
+        candidates = {}
+        expiries = {}
+        
+        for timeframe in timeframes:
+            duration = INTERVAL_DURATIONS.get(timeframe, 900)
+            for symbol, ts, slug in self.calendar.candidates(timeframe, symbols, range(self.LOOKAHEAD)):
+                candidates.setdefault((timeframe, symbol), []).append(slug)
+                expiries[slug] = ts + duration
+        
+        failed = set()
+        resolved = resolve_market_slugs(
+            self.session,
+            list(expiries),
+            expiries,
+            self.market_cache,
+            price_source=self.clob.get_midpoints,
+            failed=failed
+        )
         
-        return None
+        result = {timeframe: [] for timeframe in timeframes}
+        for (timeframe, symbol), slugs in candidates.items():
+            for slug in slugs:
+                # Don't skip ahead to a later interval when the current one just failed to load
+                if slug in failed:
+                    if unresolved is not None:
+                        unresolved.add((timeframe, symbol))
+                    break
+                data = resolved.get(slug)
+                if data and data.get('active') and not data.get('closed'):
+                    result[timeframe].append(self._build_market(data, symbol, timeframe, slug))
+                    break
+        
+        return result
+    
+    def get_market(self, symbol: str, timeframe: str) -> Optional[Market]:
+        markets = self._get_markets([timeframe], [symbol])[timeframe]
+        return markets[0] if markets else None
     
     def get_15m(self, symbols: List[str] = None) -> List[Market]:
         return self._get_timeframe('15m', symbols)
@@ -131,20 +132,13 @@ class CryptoMarkets:
         if symbols is None:
             symbols = self.SYMBOLS
         
-        markets = []
-        for symbol in symbols:
-            market = self.get_market(symbol, timeframe)
-            if market:
-                markets.append(market)
-        
-        return markets
+        return self._get_markets([timeframe], symbols)[timeframe]
     
     def get_all(self, symbols: List[str] = None) -> Dict[str, List[Market]]:
-        return {
-            '15m': self.get_15m(symbols),
-            '1h': self.get_1h(symbols),
-            '4h': self.get_4h(symbols)
-        }
+        if symbols is None:
+            symbols = self.SYMBOLS
+        
+        return self._get_markets(self.TIMEFRAMES, symbols)
     
     def to_dict(self, markets: List[Market]) -> List[Dict]:
         return [asdict(m) for m in markets]
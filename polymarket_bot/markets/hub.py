@@ -0,0 +1,273 @@
+import queue
+import time
+import threading
+from dataclasses import dataclass, field, replace
+from typing import List, Dict, Optional, Callable, Tuple
+from ..config import POLL_INTERVAL, ENABLE_MARKET_STREAM
+from ..core.market_stream import MarketStream, TokenQuote, get_market_stream
+from .crypto import CryptoMarkets, Market
+
+
+@dataclass(frozen=True)
+class MarketSnapshot:
+    version: int
+    updated_at: float
+    markets: Dict[str, List[Market]] = field(default_factory=dict)
+    
+    def timeframe(self, timeframe: str, symbols: List[str] = None) -> List[Market]:
+        markets = self.markets.get(timeframe, [])
+        if symbols is None:
+            return list(markets)
+        return [m for m in markets if m.symbol in symbols]
+    
+    def get(self, symbol: str, timeframe: str) -> Optional[Market]:
+        return next((m for m in self.markets.get(timeframe, []) if m.symbol == symbol), None)
+    
+    def by_slug(self, slug: str) -> Optional[Market]:
+        for markets in self.markets.values():
+            for m in markets:
+                if m.slug == slug:
+                    return m
+        return None
+
+
+@dataclass
+class MarketEvent:
+    kind: str
+    version: int
+    market: Market
+    previous: Optional[Market] = None
+
+
+Subscriber = Callable[[List[MarketEvent], MarketSnapshot], None]
+
+
+class MarketHub:
+    def __init__(
+        self,
+        markets: CryptoMarkets = None,
+        timeframes: List[str] = None,
+        symbols: List[str] = None,
+        interval: float = POLL_INTERVAL,
+        stream: Optional[MarketStream] = None
+    ):
+        self.markets = markets or CryptoMarkets()
+        self.timeframes = list(timeframes or CryptoMarkets.TIMEFRAMES)
+        self.symbols = list(symbols or CryptoMarkets.SYMBOLS)
+        self.interval = interval
+        self._snapshot = MarketSnapshot(version=0, updated_at=0.0)
+        self._subscribers: List[Subscriber] = []
+        self._tokens: Dict[str, Tuple[str, str, str]] = {}
+        self.stream = stream
+        if stream is not None:
+            stream.on_quote(self._on_quote)
+        self._outbox: queue.Queue = queue.Queue()
+        self._dispatcher: Optional[threading.Thread] = None
+        self._dispatch_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._changed = threading.Condition()
+        self._stop = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+    
+    def _diff(self, old: MarketSnapshot, new: Dict[str, List[Market]], version: int) -> List[MarketEvent]:
+        previous = {m.slug: m for markets in old.markets.values() for m in markets}
+        current = {m.slug: m for markets in new.values() for m in markets}
+        
+        events = []
+        for slug, market in current.items():
+            before = previous.get(slug)
+            if before is None:
+                events.append(MarketEvent('added', version, market))
+            elif before != market:
+                events.append(MarketEvent('updated', version, market, before))
+        for slug, market in previous.items():
+            if slug not in current:
+                events.append(MarketEvent('removed', version, market, market))
+        return events
+    
+    def _publish(self, events: List[MarketEvent], snapshot: MarketSnapshot):
+        # Quotes arrive on the shared asyncio loop, so subscribers run on their own thread
+        if not self._subscribers:
+            return
+        self._outbox.put((events, snapshot))
+        if self._dispatcher is None or not self._dispatcher.is_alive():
+            with self._dispatch_lock:
+                if self._dispatcher is None or not self._dispatcher.is_alive():
+                    self._dispatcher = threading.Thread(target=self._dispatch, name='polybrain-hub-events', daemon=True)
+                    self._dispatcher.start()
+    
+    def _dispatch(self):
+        while True:
+            events, snapshot = self._outbox.get()
+            # A slow subscriber gets one merged batch and the latest snapshot, not a backlog of stale ones
+            while True:
+                try:
+                    more, snapshot = self._outbox.get_nowait()
+                except queue.Empty:
+                    break
+                events = events + more
+            
+            for callback in list(self._subscribers):
+                try:
+                    callback(events, snapshot)
+                except Exception as e:
+                    print(f"Market hub subscriber error: {e}")
+    
+    def refresh(self) -> MarketSnapshot:
+        with self._refresh_lock:
+            unresolved = set()
+            try:
+                markets = self.markets._get_markets(self.timeframes, self.symbols, unresolved)
+            except Exception as e:
+                print(f"Market hub refresh error: {e}")
+                return self._snapshot
+            
+            with self._changed:
+                old = self._snapshot
+                markets = self._overlay_quotes(self._carry_forward(old, markets, unresolved))
+                events = self._diff(old, markets, old.version + 1)
+                if not events and old.version:
+                    snapshot = MarketSnapshot(old.version, time.time(), old.markets)
+                else:
+                    snapshot = MarketSnapshot(old.version + 1, time.time(), markets)
+                
+                self._snapshot = snapshot
+                self._tokens = {
+                    token: (m.timeframe, m.slug, outcome)
+                    for tf_markets in markets.values() for m in tf_markets
+                    for outcome, token in zip(m.outcomes, m.token_ids)
+                }
+                self._changed.notify_all()
+            
+            self._sync_stream()
+        
+        if events:
+            self._publish(events, snapshot)
+        return snapshot
+    
+    def _carry_forward(
+        self,
+        old: MarketSnapshot,
+        markets: Dict[str, List[Market]],
+        unresolved: set
+    ) -> Dict[str, List[Market]]:
+        # A slow or failed gamma batch is not a closed market; keep what the last snapshot had
+        for timeframe, symbol in unresolved:
+            previous = old.get(symbol, timeframe)
+            if previous is not None and all(m.symbol != symbol for m in markets.get(timeframe, [])):
+                markets.setdefault(timeframe, []).append(previous)
+        return markets
+    
+    def _overlay_quotes(self, markets: Dict[str, List[Market]]) -> Dict[str, List[Market]]:
+        if self.stream is None:
+            return markets
+        
+        # Streamed quotes are newer than the outcomePrices gamma just returned
+        result = {}
+        for timeframe, tf_markets in markets.items():
+            result[timeframe] = []
+            for m in tf_markets:
+                prices = dict(m.prices)
+                for outcome, token in zip(m.outcomes, m.token_ids):
+                    quote = self.stream.get_quote(token)
+                    if quote is not None and quote.price is not None:
+                        prices[outcome] = quote.price
+                result[timeframe].append(replace(m, prices=prices) if prices != m.prices else m)
+        return result
+    
+    def _sync_stream(self):
+        if self.stream is None:
+            return
+        tokens = set(self._tokens)
+        self.stream.unsubscribe(self.stream.tokens - tokens)
+        self.stream.subscribe(tokens)
+    
+    def _on_quote(self, quote: TokenQuote):
+        price = quote.price
+        if price is None:
+            return
+        
+        with self._changed:
+            location = self._tokens.get(quote.asset_id)
+            if location is None:
+                return
+            timeframe, slug, outcome = location
+            old = self._snapshot
+            tf_markets = old.markets.get(timeframe, [])
+            index = next((i for i, m in enumerate(tf_markets) if m.slug == slug), None)
+            if index is None or tf_markets[index].prices.get(outcome) == price:
+                return
+            
+            previous = tf_markets[index]
+            market = replace(previous, prices={**previous.prices, outcome: price})
+            markets = dict(old.markets)
+            markets[timeframe] = tf_markets[:index] + [market] + tf_markets[index + 1:]
+            snapshot = MarketSnapshot(old.version + 1, old.updated_at, markets)
+            self._snapshot = snapshot
+            self._changed.notify_all()
+        
+        self._publish([MarketEvent('updated', snapshot.version, market, previous)], snapshot)
+    
+    def snapshot(self) -> MarketSnapshot:
+        snapshot = self._snapshot
+        # Without the poll thread the hub refreshes on demand, at most once per interval
+        if not snapshot.version or (not self.running and time.time() - snapshot.updated_at >= self.interval):
+            snapshot = self.refresh()
+        return snapshot
+    
+    def wait(self, version: int, timeout: Optional[float] = None) -> MarketSnapshot:
+        with self._changed:
+            self._changed.wait_for(lambda: self._snapshot.version > version, timeout)
+            return self._snapshot
+    
+    def get_market(self, symbol: str, timeframe: str) -> Optional[Market]:
+        return self.snapshot().get(symbol, timeframe)
+    
+    def subscribe(self, callback: Subscriber) -> Callable[[], None]:
+        self._subscribers.append(callback)
+        
+        def unsubscribe():
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+        
+        return unsubscribe
+    
+    def _run(self):
+        while not self._stop.is_set():
+            started = time.time()
+            self.refresh()
+            self._stop.wait(max(self.interval - (time.time() - started), 0))
+    
+    def start(self):
+        if self.running:
+            return
+        
+        self._stop.clear()
+        if self.stream is not None:
+            self.stream.start()
+        self.thread = threading.Thread(target=self._run, name='polybrain-market-hub', daemon=True)
+        self.thread.start()
+    
+    def stop(self):
+        self._stop.set()
+        if self.stream is not None:
+            self.stream.stop()
+        if self.thread:
+            self.thread.join(timeout=5)
+    
+    @property
+    def running(self) -> bool:
+        return self.thread is not None and self.thread.is_alive()
+
+
+_hub: Optional[MarketHub] = None
+_hub_lock = threading.Lock()
+
+
+def get_market_hub() -> MarketHub:
+    global _hub
+    if _hub is None:
+        with _hub_lock:
+            if _hub is None:
+                _hub = MarketHub(stream=get_market_stream() if ENABLE_MARKET_STREAM else None)
+    return _hub
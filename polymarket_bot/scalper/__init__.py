@@ -1,3 +1,4 @@
 from .bot import ScalperBot
+from .indicators import EMA, RollingVolatility, MarketIndicators
 
-__all__ = ['ScalperBot']
+__all__ = ['ScalperBot', 'EMA', 'RollingVolatility', 'MarketIndicators']
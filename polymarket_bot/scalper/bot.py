@@ -3,9 +3,11 @@ from typing import Dict, List, Optional
 from dataclasses import dataclass
 from datetime import datetime
 
-from ..markets import CryptoMarkets
-from ..core import PolymarketTrader
+from ..markets import MarketSnapshot, get_market_hub
+from ..data.prefetch import get_boundary_prefetcher
+from ..core import PolymarketTrader, get_orderbook_store
 from ..config import ENABLE_TRADING, MAX_POSITION_SIZE
+from .indicators import MarketIndicators
 
 
 @dataclass
@@ -24,36 +26,67 @@ class Position:
 
 class ScalperBot:
     def __init__(self):
-        self.markets = CryptoMarkets()
+        self.hub = get_market_hub()
+        self.markets = self.hub.markets
         self.trader = PolymarketTrader()
+        self.books = get_orderbook_store()
         self.positions: Dict[str, Position] = {}
         self.take_profit_pct = 0.05  # 5% profit target
         self.stop_loss_pct = 0.10    # 10% stop loss
         self.max_positions = 3
         self.min_edge = 0.02         # Min 2% edge to enter
+        self.max_adverse_momentum = 0.02  # Skip entries when price is still moving against the side
+        self.indicators: Dict[str, MarketIndicators] = {}
         self.running = False
     
+    def update_indicators(self, market) -> MarketIndicators:
+        indicators = self.indicators.get(market.slug)
+        if indicators is None:
+            indicators = self.indicators[market.slug] = MarketIndicators()
+        indicators.update(
+            time.time(),
+            market.prices.get('Up', 0.5),
+            market.prices.get('Down', 0.5),
+            market.volume
+        )
+        return indicators
+    
+    def _adverse_momentum(self, side: str, indicators: Optional[MarketIndicators]) -> float:
+        if indicators is None or indicators.momentum is None:
+            return 0.0
+        # Momentum tracks Up, so a falling Up price is adverse for Up and favourable for Down
+        momentum = indicators.momentum if side == 'Up' else -indicators.momentum
+        return max(-momentum, 0.0)
+    
     def find_opportunity(self, market) -> Optional[Dict]:
         up_price = market.prices.get('Up', 0.5)
         down_price = market.prices.get('Down', 0.5)
+        indicators = self.indicators.get(market.slug)
         
         # Look for mispriced markets (deviation from 50/50)
         if up_price < 0.48:  # Up is underpriced
-            return {
+            opportunity = {
                 'side': 'Up',
                 'price': up_price,
                 'edge': 0.50 - up_price,
                 'token_id': market.token_ids[0] if market.token_ids else None
             }
         elif down_price < 0.48:  # Down is underpriced
-            return {
+            opportunity = {
                 'side': 'Down',
                 'price': down_price,
                 'edge': 0.50 - down_price,
                 'token_id': market.token_ids[1] if len(market.token_ids) > 1 else None
             }
+        else:
+            return None
         
-        return None
+        # A cheap side that is still falling is a trend, not a mispricing
+        if self._adverse_momentum(opportunity['side'], indicators) > self.max_adverse_momentum:
+            return None
+        if indicators is not None:
+            opportunity['trend'] = indicators.trend if opportunity['side'] == 'Up' else -indicators.trend
+        return opportunity
     
     def calculate_size(self, edge: float) -> float:
         # Kelly-inspired sizing: bet more when edge is higher
@@ -74,11 +107,25 @@ class ScalperBot:
         
         entry_price = opportunity['price']
         size = self.calculate_size(opportunity['edge'])
+        limit_price = entry_price
+        
+        # Price the entry against the live book rather than the quoted mid
+        book = self.books.get(token_id)
+        if book is not None:
+            fill_price = book.vwap('BUY', size)
+            if fill_price is None:
+                print(f"Not enough liquidity on {market.symbol} {opportunity['side']} for {size:.2f}")
+                return None
+            if 0.50 - fill_price < self.min_edge:
+                return None
+            entry_price = fill_price
+            limit_price = book.price_for_size('BUY', size)
+        
         target = entry_price * (1 + self.take_profit_pct)
         stop = entry_price * (1 - self.stop_loss_pct)
         
         if ENABLE_TRADING:
-            result = self.trader.buy(token_id, size, entry_price)
+            result = self.trader.buy(token_id, size, limit_price)
             if not result:
                 print(f"Failed to open position on {market.symbol}")
                 return None
@@ -113,19 +160,33 @@ class ScalperBot:
             print(f"STOP LOSS: {position.symbol} | Entry: ${position.entry_price:.3f} -> ${current_price:.3f} | PnL: ${pnl:.2f}")
             return True
         
+        # Trend exit: cut a losing position once momentum turns hard against it
+        adverse = self._adverse_momentum(position.side, self.indicators.get(position.market_slug))
+        if current_price < position.entry_price and adverse > 2 * self.max_adverse_momentum:
+            pnl = (current_price - position.entry_price) * position.size
+            print(f"TREND EXIT: {position.symbol} | Entry: ${position.entry_price:.3f} -> ${current_price:.3f} | PnL: ${pnl:.2f}")
+            return True
+        
         return False
     
     def close_position(self, position: Position, current_price: float):
         if ENABLE_TRADING:
-            self.trader.sell(position.token_id, position.size, current_price)
+            book = self.books.get(position.token_id)
+            exit_price = book.price_for_size('SELL', position.size) if book else None
+            self.trader.sell(position.token_id, position.size, exit_price or current_price)
         
         del self.positions[position.market_slug]
     
-    def scan_markets(self):
+    def scan_markets(self, snapshot: Optional[MarketSnapshot] = None):
+        snapshot = snapshot or self.hub.snapshot()
+        live = set()
         for timeframe in ['15m', '1h']:
-            markets = self.markets._get_timeframe(timeframe)
+            markets = snapshot.timeframe(timeframe)
             
             for market in markets:
+                live.add(market.slug)
+                self.update_indicators(market)
+                
                 # Check existing position
                 if market.slug in self.positions:
                     pos = self.positions[market.slug]
@@ -138,16 +199,28 @@ class ScalperBot:
                 opp = self.find_opportunity(market)
                 if opp and opp['edge'] >= self.min_edge:
                     self.open_position(market, opp)
+        
+        # Expired markets never tick again
+        for slug in set(self.indicators) - live - set(self.positions):
+            del self.indicators[slug]
     
     def run(self, interval: int = 30):
         print(f"ScalperBot started | TP: {self.take_profit_pct*100}% | SL: {self.stop_loss_pct*100}%")
         self.running = True
+        get_boundary_prefetcher().start()
+        self.hub.start()
         
+        version = 0
+        last_status = 0.0
         while self.running:
             try:
-                self.scan_markets()
-                print(f"[{datetime.now().strftime('%H:%M:%S')}] Positions: {len(self.positions)}/{self.max_positions}")
-                time.sleep(interval)
+                # Streamed quotes bump the snapshot version, so exits react to each tick
+                snapshot = self.hub.wait(version, timeout=interval)
+                version = snapshot.version
+                self.scan_markets(snapshot)
+                if time.time() - last_status >= interval:
+                    print(f"[{datetime.now().strftime('%H:%M:%S')}] Positions: {len(self.positions)}/{self.max_positions}")
+                    last_status = time.time()
             except KeyboardInterrupt:
                 break
             except Exception as e:
@@ -0,0 +1,110 @@
+import math
+from typing import Dict, Optional
+from ..utils.ring import RingBuffer
+
+
+class EMA:
+    def __init__(self, period: int):
+        self.alpha = 2 / (period + 1)
+        self.value: Optional[float] = None
+    
+    def update(self, price: float) -> float:
+        if self.value is None:
+            self.value = price
+        else:
+            self.value += self.alpha * (price - self.value)
+        return self.value
+
+
+class RollingVolatility:
+    def __init__(self, window: int):
+        self.returns = RingBuffer(window)
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._last: Optional[float] = None
+    
+    def update(self, price: float) -> Optional[float]:
+        last, self._last = self._last, price
+        if last is None or last <= 0 or price <= 0:
+            return self.value
+        
+        r = math.log(price / last)
+        evicted = self.returns.push(r)
+        self._sum += r
+        self._sum_sq += r * r
+        if evicted is not None:
+            self._sum -= evicted
+            self._sum_sq -= evicted * evicted
+        return self.value
+    
+    @property
+    def value(self) -> Optional[float]:
+        n = len(self.returns)
+        if n < 2:
+            return None
+        mean = self._sum / n
+        # Running sums can drift a hair below zero on flat series
+        return math.sqrt(max(self._sum_sq / n - mean * mean, 0.0))
+
+
+class MarketIndicators:
+    def __init__(self, capacity: int = 120, fast: int = 5, slow: int = 20, momentum: int = 10):
+        self.times = RingBuffer(capacity)
+        self.up_prices = RingBuffer(capacity)
+        self.down_prices = RingBuffer(capacity)
+        self.volumes = RingBuffer(capacity)
+        self.momentum_ticks = min(momentum, capacity - 1)
+        self.ema_fast = EMA(fast)
+        self.ema_slow = EMA(slow)
+        self.volatility = RollingVolatility(capacity - 1)
+    
+    def __len__(self) -> int:
+        return len(self.times)
+    
+    def update(self, timestamp: float, up_price: float, down_price: float, volume: float) -> bool:
+        if len(self.times) and up_price == self.up_prices.last and volume == self.volumes.last:
+            return False
+        self.times.push(timestamp)
+        self.up_prices.push(up_price)
+        self.down_prices.push(down_price)
+        self.volumes.push(volume)
+        self.ema_fast.update(up_price)
+        self.ema_slow.update(up_price)
+        self.volatility.update(up_price)
+        return True
+    
+    @property
+    def trend(self) -> float:
+        # Positive when Up is gaining, negative when Down is
+        if self.ema_fast.value is None or self.ema_slow.value is None:
+            return 0.0
+        return self.ema_fast.value - self.ema_slow.value
+    
+    @property
+    def momentum(self) -> Optional[float]:
+        past = self.up_prices.get(self.momentum_ticks)
+        if past is None:
+            return None
+        return self.up_prices.last - past
+    
+    @property
+    def volume_velocity(self) -> Optional[float]:
+        # Gamma volume is cumulative, so the window's growth per second is the traded rate
+        oldest = len(self.times) - 1
+        if oldest < 1:
+            return None
+        elapsed = self.times.last - self.times.get(oldest)
+        if elapsed <= 0:
+            return None
+        return (self.volumes.last - self.volumes.get(oldest)) / elapsed
+    
+    def snapshot(self) -> Dict:
+        return {
+            'ticks': len(self),
+            'ema_fast': self.ema_fast.value,
+            'ema_slow': self.ema_slow.value,
+            'trend': self.trend,
+            'momentum': self.momentum,
+            'volatility': self.volatility.value,
+            'volume_velocity': self.volume_velocity
+        }
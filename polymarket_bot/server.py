@@ -3,15 +3,16 @@ from typing import List, Dict, Optional
 from datetime import datetime
 
 from .core import PolymarketClient, PolymarketTrader
-from .api import GigaBrainClient, DuneClient
-from .data import Timeframe, CryptoFetcherManager
-from .markets import CryptoMarkets
+from .api import GigaBrainClient, DuneClient, get_decision_cache, get_llm_scheduler
+from .data import Timeframe, CryptoFetcherManager, get_boundary_prefetcher, get_reference_service
+from .markets import get_market_hub
 from .scalper import ScalperBot
 from .strategy import SmartStrategy
 from .copytrading import CopyTradingService, HourlyScheduler
 from .db import Database, TradeRepository
 from .agent import CopyTradeAgent
 from .config import WALLET_ADDRESS, POLYMARKET_API_KEY, ENABLE_TRADING
+from .utils.http import get_transport
 
 
 class PolyBrainServer:
@@ -22,8 +23,11 @@ class PolyBrainServer:
         self.trader = PolymarketTrader()
         self.copytrading = CopyTradingService()
         self.crypto_fetcher = CryptoFetcherManager()
-        self.markets = CryptoMarkets()
+        self.hub = get_market_hub()
+        self.markets = self.hub.markets
         self.smart = SmartStrategy()
+        self.prefetcher = get_boundary_prefetcher()
+        self.reference = get_reference_service()
         self.wallet_address = WALLET_ADDRESS
         self.connected = False
         self.trading_enabled = ENABLE_TRADING
@@ -113,6 +117,10 @@ class PolyBrainServer:
         print("PolyBrain Server Starting...")
         print("=" * 50)
         
+        get_transport().warm()
+        self.prefetcher.start()
+        self.hub.start()
+        self.reference.start()
         self.connect()
         db_connected = self.connect_db()
         
@@ -134,6 +142,9 @@ class PolyBrainServer:
         print("\nShutting down...")
         self.stop_agent()
         self.stop_scalper()
+        self.prefetcher.stop()
+        self.hub.stop()
+        self.reference.stop()
         if self.scheduler:
             self.scheduler.stop()
         if self.db:
@@ -194,6 +205,16 @@ class PolyBrainServer:
     def get_dune_whales(self, limit: int = 1000) -> List[Dict]:
         return self.dune.get_polymarket_whales(limit)
     
+    def sync_dune_whales(self, limit: int = 1000) -> Dict:
+        return self.copytrading.sync_whale_rows(self.get_dune_whales(limit)).to_dict()
+    
+    def get_sync_stats(self) -> Dict:
+        report = self.copytrading.last_sync
+        return {
+            'last_sync': report.to_dict() if report else None,
+            'rate_limits': get_transport().limiter.stats()
+        }
+    
     def sync_whales(self, top_n: int = 20):
         return self.copytrading.run_hourly_sync(top_n=top_n)
     
@@ -209,6 +230,18 @@ class PolyBrainServer:
         scheduler.start()
         return scheduler
     
+    def get_prefetch_stats(self, timeframe: Optional[str] = None) -> Dict:
+        return self.prefetcher.stats(timeframe)
+    
+    def get_decision_cache_stats(self) -> Dict:
+        return get_decision_cache().stats()
+    
+    def get_llm_stats(self) -> Dict:
+        return get_llm_scheduler().stats()
+    
+    def get_analysis_stats(self) -> Dict:
+        return self.agent.get_analysis_stats() if self.agent else {}
+    
     def get_markets(self, limit: int = 50) -> List[Dict]:
         return self.polymarket.get_markets(limit=limit)
     
@@ -225,17 +258,17 @@ class PolyBrainServer:
         return result
     
     def get_15m_markets(self, symbols: List[str] = None) -> List[Dict]:
-        return self.markets.to_dict(self.markets.get_15m(symbols))
+        return self.markets.to_dict(self.hub.snapshot().timeframe('15m', symbols))
     
     def get_1h_markets(self, symbols: List[str] = None) -> List[Dict]:
-        return self.markets.to_dict(self.markets.get_1h(symbols))
+        return self.markets.to_dict(self.hub.snapshot().timeframe('1h', symbols))
     
     def get_4h_markets(self, symbols: List[str] = None) -> List[Dict]:
-        return self.markets.to_dict(self.markets.get_4h(symbols))
+        return self.markets.to_dict(self.hub.snapshot().timeframe('4h', symbols))
     
     def get_all_markets(self, symbols: List[str] = None) -> Dict[str, List[Dict]]:
-        all_markets = self.markets.get_all(symbols)
-        return {tf: self.markets.to_dict(mkts) for tf, mkts in all_markets.items()}
+        snapshot = self.hub.snapshot()
+        return {tf: self.markets.to_dict(snapshot.timeframe(tf, symbols)) for tf in snapshot.markets}
     
     def scan_opportunities(self) -> List[Dict]:
         return self.smart.status()
@@ -290,6 +323,9 @@ class PolyBrainServer:
                 'database': self.db is not None,
                 'copytrading': True,
                 'crypto_fetcher': True,
+                'prefetcher': self.prefetcher.running,
+                'market_hub': self.hub.running,
+                'reference_prices': self.reference.running,
                 'trading': bool(self.trader.api_key and self.trader.api_secret),
                 'agent': self.agent is not None,
                 'scalper': self.scalper is not None
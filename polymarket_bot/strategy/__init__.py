@@ -1,3 +1,4 @@
 from .smart import SmartStrategy, market_status, ask_ai, get_bets, get_pnl
+from .decision import DecisionParser
 
-__all__ = ['SmartStrategy', 'market_status', 'ask_ai', 'get_bets', 'get_pnl']
+__all__ = ['SmartStrategy', 'market_status', 'ask_ai', 'get_bets', 'get_pnl', 'DecisionParser']
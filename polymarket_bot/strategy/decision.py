@@ -0,0 +1,56 @@
+import re
+from typing import Dict, Optional, Tuple
+
+SYMBOLS = ['BTC', 'ETH', 'SOL', 'XRP']
+SIDES = [('Up', re.compile(r'\bUp\b|\bUP\b')), ('Down', re.compile(r'\bDown\b|\bDOWN\b'))]
+# The lookahead keeps ", No" from firing on a half-streamed ", Now"
+DECISIONS = [
+    ('YES', re.compile(r'\*\*Yes(?=\W)|, Yes(?=\W)|Yes,')),
+    ('NO', re.compile(r'\*\*No(?=\W)|, No(?=\W)|No,'))
+]
+PRICE = re.compile(r'\$?(0\.\d+)')
+
+
+class DecisionParser:
+    def __init__(self):
+        self.text = ''
+        self.decision: Optional[Dict] = None
+        self.settled = False
+    
+    def feed(self, chunk: str) -> Optional[Dict]:
+        self.text += chunk
+        if not self.settled:
+            self.decision = self._parse()
+        return self.decision
+    
+    def _marker(self) -> Optional[Tuple[int, str]]:
+        best = None
+        for decision, pattern in DECISIONS:
+            match = pattern.search(self.text)
+            if match and (best is None or match.end() < best[0]):
+                best = (match.end(), decision)
+        return best
+    
+    def _parse(self) -> Optional[Dict]:
+        marker = self._marker()
+        if marker is None:
+            return None
+        
+        # The reply leads with Symbol, Timeframe, Side, Price, Yes/No, so everything
+        # needed is in the text before the marker; anything unclear waits for the full reply
+        end, decision = marker
+        self.settled = True
+        head = self.text[:end]
+        symbols = [s for s in SYMBOLS if s in head.upper()]
+        sides = [side for side, pattern in SIDES if pattern.search(head)]
+        if len(symbols) != 1 or len(sides) != 1:
+            return None
+        
+        prices = PRICE.findall(head)
+        return {
+            'symbol': symbols[0],
+            'side': sides[0],
+            'price': float(prices[0]) if prices else None,
+            'decision': decision,
+            'reason': head
+        }
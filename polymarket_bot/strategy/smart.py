@@ -1,14 +1,20 @@
 import re
-import requests
+import threading
 from dataclasses import dataclass
 from typing import List, Optional, Dict
 from datetime import date
 
-from ..markets import CryptoMarkets
+from ..markets import MarketSnapshot, get_market_hub
 from ..core.trader import PolymarketTrader
 from ..api.gigabrain import GigaBrainClient
+from ..api.decisions import get_decision_cache
+from ..api.scheduler import DeadlineExceeded, get_llm_scheduler
 from ..db.postgres import Database
 from ..db.repository import TradeRepository
+from ..data.reference import get_reference_service
+from ..utils.intervals import get_interval_calendar
+from ..config import BRAIN_STREAMING
+from .decision import DecisionParser
 
 
 @dataclass 
@@ -28,13 +34,19 @@ class SmartStrategy:
     BUY_MAX = 0.80
     
     def __init__(self):
-        self.markets = CryptoMarkets()
+        self.hub = get_market_hub()
+        self.markets = self.hub.markets
         self.trader = PolymarketTrader()
         self.brain = GigaBrainClient()
+        self.decisions = get_decision_cache()
+        self.scheduler = get_llm_scheduler()
+        self.calendar = get_interval_calendar()
+        self.reference = get_reference_service()
         self.db = None
         self.repo = None
         self.trades_today: List = []
         self.today: date = date.today()
+        self._trade_lock = threading.Lock()
         self._connect_db()
     
     def _connect_db(self):
@@ -49,36 +61,50 @@ class SmartStrategy:
             self.repo = None
     
     def _reset(self):
+        with self._trade_lock:
+            self._roll_day()
+    
+    def _roll_day(self):
         if date.today() != self.today:
             self.trades_today = []
             self.today = date.today()
     
     def _get_crypto_prices(self) -> Dict[str, float]:
-        try:
-            resp = requests.get(
-                'https://api.binance.com/api/v3/ticker/price',
-                params={'symbols': '["BTCUSDT","ETHUSDT","SOLUSDT","XRPUSDT"]'},
-                timeout=5
-            )
-            data = resp.json()
-            return {
-                'BTC': float(next((x['price'] for x in data if x['symbol'] == 'BTCUSDT'), 0)),
-                'ETH': float(next((x['price'] for x in data if x['symbol'] == 'ETHUSDT'), 0)),
-                'SOL': float(next((x['price'] for x in data if x['symbol'] == 'SOLUSDT'), 0)),
-                'XRP': float(next((x['price'] for x in data if x['symbol'] == 'XRPUSDT'), 0))
-            }
-        except Exception:
-            return {'BTC': 0, 'ETH': 0, 'SOL': 0, 'XRP': 0}
+        return self.reference.prices(['BTC', 'ETH', 'SOL', 'XRP'])
+    
+    def _get_distances(self, symbols: List[str]) -> Dict[str, Dict[str, float]]:
+        distances = {}
+        for sym in symbols:
+            for tf in ['15m', '1h']:
+                distance = self.reference.distance_to_beat(sym, tf)
+                if distance is not None:
+                    distances.setdefault(sym, {})[tf] = distance
+        return distances
     
     def remaining(self) -> int:
-        self._reset()
-        return self.MAX_TRADES - len(self.trades_today)
+        with self._trade_lock:
+            self._roll_day()
+            return self.MAX_TRADES - len(self.trades_today)
+    
+    def _reserve(self, parsed: Dict) -> bool:
+        # Early bets run on scheduler workers, so the limit check and the slot it takes must be one step
+        with self._trade_lock:
+            self._roll_day()
+            if len(self.trades_today) >= self.MAX_TRADES:
+                return False
+            self.trades_today.append(parsed)
+            return True
+    
+    def _release(self, parsed: Dict):
+        with self._trade_lock:
+            self.trades_today = [t for t in self.trades_today if t is not parsed]
     
-    def get_market_context(self) -> Dict:
-        result = {'markets': [], 'opportunities': []}
+    def get_market_context(self, snapshot: Optional[MarketSnapshot] = None) -> Dict:
+        snapshot = snapshot or self.hub.snapshot()
+        result = {'markets': [], 'opportunities': [], 'version': snapshot.version}
         
         for tf in ['15m', '1h']:
-            mkts = self.markets.get_15m() if tf == '15m' else self.markets.get_1h()
+            mkts = snapshot.timeframe(tf)
             
             for m in mkts:
                 up = m.prices.get('Up', 0.5)
@@ -143,9 +169,14 @@ class SmartStrategy:
         prompt += "- 'Up' wins if price at END >= price at START\n"
         prompt += "- 'Down' wins if price at END < price at START\n\n"
         
+        distances = self._get_distances(list(crypto_prices))
+        
         prompt += "CURRENT CRYPTO PRICES (Binance):\n"
+        if not crypto_prices:
+            prompt += "  unavailable\n"
         for sym, price in crypto_prices.items():
-            prompt += f"  {sym}: ${price:,.2f}\n"
+            moves = ', '.join(f"{tf} {d * 100:+.2f}% vs start" for tf, d in distances.get(sym, {}).items())
+            prompt += f"  {sym}: ${price:,.2f}" + (f" ({moves})" if moves else "") + "\n"
         
         prompt += "\nMARKET ODDS (what bettors think):\n"
         for m in ctx['markets']:
@@ -172,13 +203,81 @@ STRATEGY:
 
 Pick ONE bet. Reply: Symbol, Timeframe, Side, Price, Yes/No, reason (include price prediction)."""
         
-        response = self.brain.chat(prompt)
+        # Same rounded odds and moves inside one interval would get the same answer
+        key = self.decisions.key('smart', {
+            'interval': self.calendar.interval_start('15m'),
+            'markets': [
+                [m['symbol'], m['timeframe'], m['up_price'], m['down_price'], m['in_sweet_spot']]
+                for m in ctx['markets']
+            ],
+            'distances': distances
+        }, precision=3)
+        parser = DecisionParser()
+        early = {}
+        early_lock = threading.Lock()
+        early_placed = threading.Event()
+        closed = threading.Event()
+        
+        def on_token(chunk: str):
+            # Bet as soon as the reply commits to one, while the reasoning is still streaming
+            decision = parser.feed(chunk)
+            if not decision or decision['decision'] != 'YES':
+                return
+            with early_lock:
+                # The stream outlives a missed deadline; once the caller has moved on it must not bet
+                if early or closed.is_set():
+                    return
+                early['parsed'] = decision
+            try:
+                outcome = self._place_bet(decision, size)
+            except Exception as e:
+                outcome = {'trade_placed': False, 'order': None, 'error': str(e), 'bet': None}
+            early['outcome'] = outcome
+            early_placed.set()
         
-        if 'error' in response:
+        cached = self.decisions.get(key)
+        if cached is not None:
+            # The first caller already placed or skipped this interval's bet; report it, don't repeat it
+            ai_text = cached.get('content', '')
+            return {
+                'ai_response': ai_text,
+                'parsed': self._parse_ai_response(ai_text),
+                'context': ctx,
+                'trade_placed': False,
+                'order': None,
+                'db_id': None,
+                'cached': True
+            }
+        
+        # The answer is about the current 15m interval, so it is useless once that closes
+        deadline = self.calendar.interval_end('15m')
+        
+        def call(timeout: Optional[float]) -> Dict:
+            if BRAIN_STREAMING:
+                return self.brain.chat_stream(prompt, on_token, timeout)
+            return self.brain.chat(prompt, timeout)
+        
+        try:
+            response = self.scheduler.run(call, deadline=deadline, label='smart')
+        except DeadlineExceeded:
+            response = {'error': 'deadline', 'success': False}
+        with early_lock:
+            closed.set()
+        if early:
+            # A bet claimed before the deadline is still being placed on the worker; its outcome goes in brain_bets
+            early_placed.wait()
+        if 'error' not in response:
+            self.decisions.put(key, response, expires_at=self.calendar.interval_end('15m'))
+        
+        if 'error' in response and not early:
             return {'success': False, 'error': response['error']}
         
-        ai_text = response.get('content', '')
-        parsed = self._parse_ai_response(ai_text)
+        ai_text = response.get('content', '') or parser.text
+        if early:
+            parsed = early['parsed']
+            parsed['reason'] = ai_text
+        else:
+            parsed = self._parse_ai_response(ai_text)
         
         result = {
             'ai_response': ai_text,
@@ -199,61 +298,28 @@ Pick ONE bet. Reply: Symbol, Timeframe, Side, Price, Yes/No, reason (include pri
         entry_price = parsed['price'] or (market_info['dominant_price'] if market_info else 0)
         
         if parsed['decision'] == 'YES' and parsed['symbol'] and parsed['side']:
-            if self.remaining() <= 0:
-                result['error'] = 'Daily limit reached'
-            else:
-                market = self.markets.get_market(parsed['symbol'], '15m')
-                if not market:
-                    market = self.markets.get_market(parsed['symbol'], '1h')
-                
-                if market:
-                    try:
-                        idx = market.outcomes.index(parsed['side'])
-                        token_id = market.token_ids[idx]
-                        price = market.prices.get(parsed['side'])
-                        
-                        order = self.trader.buy(token_id, size, price)
-                        
-                        order_status = 'placed' if order else 'failed'
-                        order_id = str(order.get('orderID', '')) if order else None
-                        
-                        if order:
-                            result['trade_placed'] = True
-                            result['order'] = order
-                            self.trades_today.append(parsed)
-                        else:
-                            result['error'] = 'Order failed (no balance?)'
-                        
-                        if self.repo:
-                            db_id = self.repo.save_brain_bet(
-                                symbol=parsed['symbol'],
-                                timeframe=market.timeframe,
-                                side=parsed['side'],
-                                entry_price=price,
-                                volume=volume,
-                                brain_reason=ai_text,
-                                brain_decision='YES',
-                                order_id=order_id,
-                                size=size,
-                                status=order_status
-                            )
-                            result['db_id'] = db_id
-                    except Exception as e:
-                        result['error'] = str(e)
-                        if self.repo:
-                            db_id = self.repo.save_brain_bet(
-                                symbol=parsed['symbol'],
-                                timeframe='15m',
-                                side=parsed['side'],
-                                entry_price=entry_price,
-                                volume=volume,
-                                brain_reason=ai_text,
-                                brain_decision='YES',
-                                status='error'
-                            )
-                            result['db_id'] = db_id
-                else:
-                    result['error'] = 'Market not found'
+            outcome = early['outcome'] if early else self._place_bet(parsed, size)
+            result['trade_placed'] = outcome['trade_placed']
+            result['order'] = outcome['order']
+            if outcome['error']:
+                result['error'] = outcome['error']
+            
+            # Saved only now so brain_reason holds the full streamed text
+            bet = outcome['bet']
+            if self.repo and bet:
+                db_id = self.repo.save_brain_bet(
+                    symbol=parsed['symbol'],
+                    timeframe=bet['timeframe'],
+                    side=parsed['side'],
+                    entry_price=entry_price if bet['status'] == 'error' else bet['entry_price'],
+                    volume=volume,
+                    brain_reason=ai_text,
+                    brain_decision='YES',
+                    order_id=bet.get('order_id'),
+                    size=bet.get('size'),
+                    status=bet['status']
+                )
+                result['db_id'] = db_id
         else:
             if self.repo and parsed['symbol'] and parsed['side']:
                 db_id = self.repo.save_brain_bet(
@@ -270,6 +336,53 @@ Pick ONE bet. Reply: Symbol, Timeframe, Side, Price, Yes/No, reason (include pri
         
         return result
     
+    def _place_bet(self, parsed: Dict, size: float) -> Dict:
+        outcome = {'trade_placed': False, 'order': None, 'error': None, 'bet': None}
+        if self.remaining() <= 0:
+            outcome['error'] = 'Daily limit reached'
+            return outcome
+        
+        snapshot = self.hub.snapshot()
+        market = snapshot.get(parsed['symbol'], '15m') or snapshot.get(parsed['symbol'], '1h')
+        if not market:
+            outcome['error'] = 'Market not found'
+            return outcome
+        
+        if not self._reserve(parsed):
+            outcome['error'] = 'Daily limit reached'
+            return outcome
+        
+        try:
+            idx = market.outcomes.index(parsed['side'])
+            token_id = market.token_ids[idx]
+            price = market.prices.get(parsed['side'])
+            
+            order = self.trader.buy(token_id, size, price)
+            
+            order_status = 'placed' if order else 'failed'
+            order_id = str(order.get('orderID', '')) if order else None
+            
+            if order:
+                outcome['trade_placed'] = True
+                outcome['order'] = order
+            else:
+                outcome['error'] = 'Order failed (no balance?)'
+            
+            outcome['bet'] = {
+                'timeframe': market.timeframe,
+                'entry_price': price,
+                'order_id': order_id,
+                'size': size,
+                'status': order_status
+            }
+        except Exception as e:
+            outcome['error'] = str(e)
+            outcome['bet'] = {'timeframe': '15m', 'entry_price': None, 'status': 'error'}
+        finally:
+            if not outcome['trade_placed']:
+                self._release(parsed)
+        return outcome
+    
     def update_bet_pnl(self, bet_id: int) -> Dict:
         if not self.repo:
             return {'error': 'No DB connection'}
@@ -280,7 +393,7 @@ Pick ONE bet. Reply: Symbol, Timeframe, Side, Price, Yes/No, reason (include pri
         if not bet:
             return {'error': 'Bet not found'}
         
-        market = self.markets.get_market(bet['symbol'], bet['timeframe'])
+        market = self.hub.get_market(bet['symbol'], bet['timeframe'])
         if not market:
             return {'error': 'Market not found'}
         
@@ -322,9 +435,10 @@ Pick ONE bet. Reply: Symbol, Timeframe, Side, Price, Yes/No, reason (include pri
     
     def scan(self) -> List[Trade]:
         trades = []
+        snapshot = self.hub.snapshot()
         
         for tf in ['15m', '1h']:
-            mkts = self.markets.get_15m() if tf == '15m' else self.markets.get_1h()
+            mkts = snapshot.timeframe(tf)
             
             for m in mkts:
                 if m.volume < self.MIN_VOLUME:
@@ -1,3 +1,23 @@
-from .market import generate_market_slug, get_interval_timestamps, normalize_market, parse_json_fields
+from .market import INTERVAL_DURATIONS, generate_market_slug, get_interval_timestamps, normalize_market, parse_json_fields
+from .concurrency import fan_out
+from .aio import run_sync
+from .http import HttpTransport, get_transport, get_session
+from .intervals import IntervalCalendar, get_interval_calendar
+from .ring import RingBuffer, SecondSeries
 
-__all__ = ['generate_market_slug', 'get_interval_timestamps', 'normalize_market', 'parse_json_fields']
+__all__ = [
+    'INTERVAL_DURATIONS',
+    'generate_market_slug',
+    'get_interval_timestamps',
+    'normalize_market',
+    'parse_json_fields',
+    'fan_out',
+    'run_sync',
+    'HttpTransport',
+    'get_transport',
+    'get_session',
+    'IntervalCalendar',
+    'get_interval_calendar',
+    'RingBuffer',
+    'SecondSeries'
+]
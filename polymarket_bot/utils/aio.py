@@ -0,0 +1,32 @@
+import asyncio
+import threading
+from typing import Any, Coroutine, Optional
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_thread: Optional[threading.Thread] = None
+_loop_lock = threading.Lock()
+
+
+def _run_loop(loop: asyncio.AbstractEventLoop):
+    asyncio.set_event_loop(loop)
+    loop.run_forever()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    global _loop, _loop_thread
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                _loop_thread = threading.Thread(target=_run_loop, args=(loop,), name='polybrain-aio', daemon=True)
+                _loop_thread.start()
+                _loop = loop
+    return _loop
+
+
+def run_sync(coro: Coroutine, timeout: Optional[float] = None) -> Any:
+    loop = get_loop()
+    if threading.current_thread() is _loop_thread:
+        coro.close()
+        raise RuntimeError("run_sync called from the shared event loop thread; await the coroutine instead")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
@@ -0,0 +1,75 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, List, Optional, Any
+from ..config import FETCH_MAX_WORKERS, FETCH_DEADLINE
+
+_executor: Optional[ThreadPoolExecutor] = None
+_nested_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_local = threading.local()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=FETCH_MAX_WORKERS,
+                    thread_name_prefix='polybrain-fetch'
+                )
+    return _executor
+
+
+def get_nested_executor() -> ThreadPoolExecutor:
+    global _nested_executor
+    if _nested_executor is None:
+        with _executor_lock:
+            if _nested_executor is None:
+                _nested_executor = ThreadPoolExecutor(
+                    max_workers=FETCH_MAX_WORKERS,
+                    thread_name_prefix='polybrain-fetch-nested'
+                )
+    return _nested_executor
+
+
+def _run_at(depth: int, call: Callable[[], Any]) -> Any:
+    _local.depth = depth
+    try:
+        return call()
+    finally:
+        _local.depth = 0
+
+
+def _safe_call(call: Callable[[], Any]) -> Optional[Any]:
+    try:
+        return call()
+    except Exception:
+        return None
+
+
+def fan_out(calls: List[Callable[[], Any]], deadline: Optional[float] = None) -> List[Optional[Any]]:
+    if not calls:
+        return []
+    
+    # A call that fans out again (gamma lookups refreshing prices, say) gets its own pool, so it never
+    # waits on workers its parent holds; late calls are not cancelled and may keep them past the deadline
+    depth = getattr(_local, 'depth', 0)
+    if depth >= 2:
+        return [_safe_call(call) for call in calls]
+    
+    executor = get_nested_executor() if depth else get_executor()
+    futures = [executor.submit(_run_at, depth + 1, call) for call in calls]
+    done, pending = wait(futures, timeout=FETCH_DEADLINE if deadline is None else deadline)
+    
+    for future in pending:
+        future.cancel()
+    
+    results = []
+    for future in futures:
+        if future in done and future.exception() is None:
+            results.append(future.result())
+        else:
+            results.append(None)
+    
+    return results
@@ -0,0 +1,183 @@
+import threading
+import time
+import requests
+from email.utils import parsedate_to_datetime
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from ..config import HTTP_TIMEOUT, HTTP_POOL_SIZE, HTTP_RETRIES, HTTP_BACKOFF
+from .concurrency import fan_out
+from .ratelimit import HostRateLimiter
+
+HOST_POOL_SIZES = {
+    'gamma-api.polymarket.com': 32,
+    'clob.polymarket.com': 32,
+    'data-api.polymarket.com': 32,
+    'polymarket.com': 16,
+    'api.binance.com': 4,
+    'api.dune.com': 4,
+    'api.gigabrain.gg': 8,
+}
+
+# (requests per second, burst); other hosts only get a bucket once they answer 429
+HOST_RATE_LIMITS: Dict[str, Tuple[float, float]] = {
+    'data-api.polymarket.com': (20.0, 40.0),
+    'api.dune.com': (2.0, 4.0),
+}
+
+WARM_URLS = [
+    'https://gamma-api.polymarket.com/',
+    'https://clob.polymarket.com/',
+    'https://data-api.polymarket.com/',
+    'https://polymarket.com/',
+]
+
+
+def _retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveRetry(Retry):
+    limiter: Optional[HostRateLimiter] = None
+    
+    def new(self, **kwargs):
+        retry = super().new(**kwargs)
+        retry.limiter = self.limiter
+        return retry
+    
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        # urllib3 retries 429s internally, so the limiter hears about them here rather than in send()
+        if self.limiter is not None and response is not None and response.status == 429 and _pool is not None:
+            self.limiter.throttle(_pool.host, _retry_after(response.headers.get('Retry-After')))
+        return super().increment(method, url, response, error, _pool, _stacktrace)
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    def __init__(self, timeout: float = HTTP_TIMEOUT, limiter: Optional[HostRateLimiter] = None, **kwargs):
+        self.timeout = timeout
+        self.limiter = limiter
+        super().__init__(**kwargs)
+    
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        if self.limiter is None:
+            return super().send(request, **kwargs)
+        
+        host = urlparse(request.url).hostname or ''
+        self.limiter.acquire(host)
+        response = super().send(request, **kwargs)
+        if response.status_code == 429:
+            retry_after = response.headers.get('Retry-After')
+            # AdaptiveRetry.increment already throttled every 429 urllib3 was allowed to retry, the last one included
+            if not self.max_retries.is_retry(request.method, 429, bool(retry_after)):
+                self.limiter.throttle(host, _retry_after(retry_after))
+        elif response.status_code < 500:
+            self.limiter.success(host)
+        return response
+
+
+class SharedSession(requests.Session):
+    def close(self):
+        # Adapters belong to the transport; closing one client must not drop everyone's pools
+        pass
+
+
+class HttpTransport:
+    def __init__(
+        self,
+        timeout: float = HTTP_TIMEOUT,
+        retries: int = HTTP_RETRIES,
+        backoff: float = HTTP_BACKOFF,
+        pool_sizes: Optional[Dict[str, int]] = None,
+        default_pool_size: int = HTTP_POOL_SIZE,
+        rate_limits: Optional[Dict[str, Tuple[float, float]]] = None
+    ):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.pool_sizes = pool_sizes if pool_sizes is not None else dict(HOST_POOL_SIZES)
+        self.default_pool_size = default_pool_size
+        self.limiter = HostRateLimiter(rate_limits if rate_limits is not None else dict(HOST_RATE_LIMITS))
+        self._adapters: Dict[str, TimeoutHTTPAdapter] = {}
+        self._lock = threading.Lock()
+    
+    def _retry(self) -> Retry:
+        retry = AdaptiveRetry(
+            total=self.retries,
+            backoff_factor=self.backoff,
+            backoff_jitter=self.backoff,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET', 'HEAD', 'OPTIONS']),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        retry.limiter = self.limiter
+        return retry
+    
+    def adapter(self, host: Optional[str] = None) -> TimeoutHTTPAdapter:
+        key = host or '*'
+        with self._lock:
+            adapter = self._adapters.get(key)
+            if adapter is None:
+                size = self.pool_sizes.get(host, self.default_pool_size) if host else self.default_pool_size
+                adapter = TimeoutHTTPAdapter(
+                    timeout=self.timeout,
+                    limiter=self.limiter,
+                    pool_connections=size,
+                    pool_maxsize=size,
+                    max_retries=self._retry()
+                )
+                self._adapters[key] = adapter
+            return adapter
+    
+    def session(self, headers: Optional[Dict[str, str]] = None) -> requests.Session:
+        session = SharedSession()
+        if headers:
+            session.headers.update(headers)
+        
+        default = self.adapter()
+        session.mount('https://', default)
+        session.mount('http://', default)
+        for host in self.pool_sizes:
+            session.mount(f'https://{host}/', self.adapter(host))
+        
+        return session
+    
+    def warm(self, urls: List[str] = None):
+        session = self.session()
+        fan_out([partial(session.head, url, timeout=self.timeout) for url in (urls or WARM_URLS)])
+    
+    def close(self):
+        with self._lock:
+            for adapter in self._adapters.values():
+                adapter.close()
+            self._adapters.clear()
+
+
+_transport: Optional[HttpTransport] = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> HttpTransport:
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = HttpTransport()
+    return _transport
+
+
+def get_session(headers: Optional[Dict[str, str]] = None) -> requests.Session:
+    return get_transport().session(headers)
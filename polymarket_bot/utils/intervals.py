@@ -0,0 +1,120 @@
+import time
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple, Iterable
+from ..config import INTERVAL_HORIZON
+from .market import INTERVAL_DURATIONS, ACTIVE_INTERVAL_OFFSETS, generate_market_slug
+
+DEFAULT_SYMBOLS = ['BTC', 'ETH', 'SOL', 'XRP']
+DEFAULT_TIMEFRAMES = ['15m', '1h', '4h']
+
+
+@dataclass
+class IntervalTable:
+    timeframe: str
+    duration: int
+    current: int
+    slugs: Dict[Tuple[str, int], str] = field(default_factory=dict)
+
+
+class IntervalCalendar:
+    def __init__(
+        self,
+        symbols: List[str] = None,
+        timeframes: List[str] = None,
+        horizon: int = INTERVAL_HORIZON,
+        history: int = 1
+    ):
+        self.symbols = list(symbols or DEFAULT_SYMBOLS)
+        self.timeframes = list(timeframes or DEFAULT_TIMEFRAMES)
+        self.horizon = horizon
+        self.history = history
+        self._tables: Dict[str, IntervalTable] = {}
+        self._lock = threading.Lock()
+    
+    def _offsets(self) -> range:
+        return range(-self.history, self.horizon)
+    
+    def _roll(self, timeframe: str, current: int) -> IntervalTable:
+        duration = INTERVAL_DURATIONS.get(timeframe, 900)
+        previous = self._tables.get(timeframe)
+        table = IntervalTable(timeframe, duration, current)
+        
+        for offset in self._offsets():
+            start = current + offset * duration
+            for symbol in self.symbols:
+                key = (symbol, start)
+                # Intervals still inside the window keep the slug built on an earlier roll
+                slug = previous.slugs.get(key) if previous else None
+                table.slugs[key] = slug or generate_market_slug(start, symbol, timeframe)
+        
+        self._tables[timeframe] = table
+        return table
+    
+    def _table(self, timeframe: str, now: Optional[float] = None) -> IntervalTable:
+        duration = INTERVAL_DURATIONS.get(timeframe, 900)
+        current = (int(time.time() if now is None else now) // duration) * duration
+        
+        table = self._tables.get(timeframe)
+        if table is not None and table.current == current:
+            return table
+        
+        with self._lock:
+            table = self._tables.get(timeframe)
+            if table is None or table.current != current:
+                table = self._roll(timeframe, current)
+            return table
+    
+    def interval_start(self, timeframe: str, offset: int = 0, now: Optional[float] = None) -> int:
+        table = self._table(timeframe, now)
+        return table.current + offset * table.duration
+    
+    def interval_end(self, timeframe: str, offset: int = 0, now: Optional[float] = None) -> int:
+        table = self._table(timeframe, now)
+        return table.current + (offset + 1) * table.duration
+    
+    def seconds_until_boundary(self, timeframe: str, now: Optional[float] = None) -> float:
+        now = time.time() if now is None else now
+        return self.interval_end(timeframe, 0, now) - now
+    
+    def slug(self, symbol: str, timeframe: str, offset: int = 0, now: Optional[float] = None) -> str:
+        table = self._table(timeframe, now)
+        return self._slug(table, symbol, table.current + offset * table.duration)
+    
+    def _slug(self, table: IntervalTable, symbol: str, start: int) -> str:
+        slug = table.slugs.get((symbol, start))
+        if slug is None:
+            slug = generate_market_slug(start, symbol, table.timeframe)
+            table.slugs[(symbol, start)] = slug
+        return slug
+    
+    def candidates(
+        self,
+        timeframe: str,
+        symbols: Iterable[str] = None,
+        offsets: Iterable[int] = None,
+        now: Optional[float] = None
+    ) -> List[Tuple[str, int, str]]:
+        table = self._table(timeframe, now)
+        if offsets is None:
+            offsets = ACTIVE_INTERVAL_OFFSETS.get(timeframe, (0, 1))
+        
+        result = []
+        for symbol in (symbols or self.symbols):
+            for offset in offsets:
+                start = table.current + offset * table.duration
+                result.append((symbol, start, self._slug(table, symbol, start)))
+        return result
+
+
+_calendar: Optional[IntervalCalendar] = None
+_calendar_lock = threading.Lock()
+
+
+def get_interval_calendar() -> IntervalCalendar:
+    global _calendar
+    if _calendar is None:
+        with _calendar_lock:
+            if _calendar is None:
+                _calendar = IntervalCalendar()
+    return _calendar
@@ -1,46 +1,40 @@
 import json
+import time
 from datetime import datetime, timezone, timedelta
 from typing import Dict, Optional
 
+INTERVAL_DURATIONS = {'15m': 900, '1h': 3600, '4h': 14400}
+ACTIVE_INTERVAL_OFFSETS = {'15m': (0, 1), '1h': (0, 1, -1), '4h': (0, 1)}
+SYMBOL_NAMES = {'BTC': 'bitcoin', 'ETH': 'ethereum', 'SOL': 'solana', 'XRP': 'xrp'}
+ET_TIMEZONE = timezone(timedelta(hours=-5))
+MONTH_NAMES = (
+    'january', 'february', 'march', 'april', 'may', 'june',
+    'july', 'august', 'september', 'october', 'november', 'december'
+)
+
 
 def generate_market_slug(timestamp: int, symbol: str = 'BTC', timeframe: str = '15m') -> str:
     symbol_lower = symbol.lower()
     
     if timeframe == '1h':
-        et_offset = timedelta(hours=-5)
-        et_timezone_obj = timezone(et_offset)
-        dt = datetime.fromtimestamp(timestamp, tz=et_timezone_obj)
-        
-        month_name = dt.strftime('%B').lower()
-        day = dt.day
-        hour_12 = dt.strftime('%I').lstrip('0') or '12'
-        am_pm = dt.strftime('%p').lower()
+        dt = datetime.fromtimestamp(timestamp, tz=ET_TIMEZONE)
         
-        symbol_map = {'BTC': 'bitcoin', 'ETH': 'ethereum', 'SOL': 'solana', 'XRP': 'xrp'}
-        symbol_name = symbol_map.get(symbol, symbol_lower)
+        month_name = MONTH_NAMES[dt.month - 1]
+        hour_12 = dt.hour % 12 or 12
+        am_pm = 'am' if dt.hour < 12 else 'pm'
+        symbol_name = SYMBOL_NAMES.get(symbol, symbol_lower)
         
-        return f"{symbol_name}-up-or-down-{month_name}-{day}-{hour_12}{am_pm}-et"
+        return f"{symbol_name}-up-or-down-{month_name}-{dt.day}-{hour_12}{am_pm}-et"
     else:
         timeframe_slug = {'15m': '15m', '4h': '4h'}.get(timeframe, '15m')
         return f"{symbol_lower}-updown-{timeframe_slug}-{timestamp}"
 
 
 def get_interval_timestamps(timeframe: str) -> tuple:
-    interval_durations = {'15m': 900, '1h': 3600, '4h': 14400}
-    interval_duration = interval_durations.get(timeframe, 900)
-    
-    et_offset = timedelta(hours=-5)
-    et_timezone_obj = timezone(et_offset)
-    now_ts = int(datetime.now(et_timezone_obj).timestamp())
-    
-    current_interval = (now_ts // interval_duration) * interval_duration
-    next_interval = current_interval + interval_duration
-    
-    intervals = [current_interval, next_interval]
-    if timeframe == '1h':
-        intervals.append(current_interval - interval_duration)
-    
-    return intervals
+    interval_duration = INTERVAL_DURATIONS.get(timeframe, 900)
+    current_interval = (int(time.time()) // interval_duration) * interval_duration
+    offsets = ACTIVE_INTERVAL_OFFSETS.get(timeframe, (0, 1))
+    return [current_interval + offset * interval_duration for offset in offsets]
 
 
 def normalize_market(market: Dict) -> Optional[Dict]:
@@ -0,0 +1,107 @@
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+
+class TokenBucket:
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        min_rate: float = 0.5,
+        recovery: float = 0.1,
+        cooldown: float = 1.0
+    ):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst or rate
+        self.min_rate = min_rate
+        self.recovery = recovery
+        self.cooldown = cooldown
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._decreased_at = float('-inf')
+        self._lock = threading.Lock()
+        self.throttled = 0
+        self.waited = 0.0
+    
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        started = time.monotonic()
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self._blocked_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    self.waited += now - started
+                    return True
+                delay = max(self._blocked_until - now, (1 - self._tokens) / self.rate)
+            if timeout is not None and time.monotonic() - started + delay > timeout:
+                return False
+            time.sleep(delay)
+    
+    def penalize(self, retry_after: Optional[float] = None):
+        # Multiplicative decrease on 429, and nobody sends before the server's Retry-After
+        with self._lock:
+            now = time.monotonic()
+            self.throttled += 1
+            # Requests already in flight answer 429 for the same overload; halve once for all of them
+            if now - self._decreased_at >= self.cooldown:
+                self.rate = max(self.min_rate, self.rate / 2)
+                self._decreased_at = now
+            self._tokens = min(self._tokens, 0.0)
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+    
+    def reward(self):
+        # Additive increase back toward the configured rate
+        if self.rate < self.max_rate:
+            with self._lock:
+                self.rate = min(self.max_rate, self.rate + self.recovery)
+    
+    def stats(self) -> Dict:
+        return {
+            'rate': self.rate,
+            'max_rate': self.max_rate,
+            'throttled': self.throttled,
+            'waited_s': self.waited
+        }
+
+
+class HostRateLimiter:
+    def __init__(self, limits: Dict[str, Tuple[float, float]], default: Tuple[float, float] = (10.0, 20.0)):
+        self.limits = limits
+        self.default = default
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+    
+    def bucket(self, host: str, create: bool = False) -> Optional[TokenBucket]:
+        bucket = self._buckets.get(host)
+        if bucket is None and (create or host in self.limits):
+            with self._lock:
+                bucket = self._buckets.get(host)
+                if bucket is None:
+                    rate, burst = self.limits.get(host, self.default)
+                    bucket = self._buckets[host] = TokenBucket(rate, burst)
+        return bucket
+    
+    def acquire(self, host: str, timeout: Optional[float] = None) -> bool:
+        # Hosts without a configured limit run free until they first answer 429
+        bucket = self.bucket(host)
+        return bucket.acquire(timeout) if bucket else True
+    
+    def throttle(self, host: str, retry_after: Optional[float] = None):
+        self.bucket(host, create=True).penalize(retry_after)
+    
+    def success(self, host: str):
+        bucket = self.bucket(host)
+        if bucket:
+            bucket.reward()
+    
+    def stats(self) -> Dict:
+        return {host: bucket.stats() for host, bucket in self._buckets.items()}
@@ -0,0 +1,94 @@
+import math
+from array import array
+from typing import List, Optional
+
+
+class RingBuffer:
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._values = array('d', [0.0]) * capacity
+        self._start = 0
+        self._size = 0
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def push(self, value: float) -> Optional[float]:
+        evicted = None
+        if self._size < self.capacity:
+            self._values[(self._start + self._size) % self.capacity] = value
+            self._size += 1
+        else:
+            evicted = self._values[self._start]
+            self._values[self._start] = value
+            self._start = (self._start + 1) % self.capacity
+        return evicted
+    
+    def get(self, back: int = 0) -> Optional[float]:
+        if back < 0 or back >= self._size:
+            return None
+        return self._values[(self._start + self._size - 1 - back) % self.capacity]
+    
+    @property
+    def last(self) -> Optional[float]:
+        return self.get(0)
+    
+    @property
+    def full(self) -> bool:
+        return self._size == self.capacity
+    
+    def values(self) -> List[float]:
+        return [self._values[(self._start + i) % self.capacity] for i in range(self._size)]
+    
+    def clear(self):
+        self._start = 0
+        self._size = 0
+
+
+class SecondSeries:
+    def __init__(self, capacity: int = 3600):
+        self.capacity = capacity
+        self._prices = array('d', [math.nan]) * capacity
+        self._seconds = array('q', [-1]) * capacity
+        self.last_second = -1
+        self.last_price: Optional[float] = None
+        self.last_time = 0.0
+    
+    def push(self, timestamp: float, price: float):
+        second = int(timestamp)
+        if second < self.last_second:
+            return
+        
+        # Carry the last price through seconds without ticks so every slot in the window is filled
+        if self.last_price is not None:
+            for s in range(max(self.last_second + 1, second - self.capacity + 1), second):
+                slot = s % self.capacity
+                self._prices[slot] = self.last_price
+                self._seconds[slot] = s
+        
+        slot = second % self.capacity
+        self._prices[slot] = price
+        self._seconds[slot] = second
+        self.last_second = second
+        self.last_price = price
+        self.last_time = timestamp
+    
+    def at(self, second: int) -> Optional[float]:
+        if self.last_price is None:
+            return None
+        if second >= self.last_second:
+            return self.last_price
+        slot = second % self.capacity
+        if self._seconds[slot] != second:
+            return None
+        return self._prices[slot]
+    
+    def ago(self, seconds: int, now: Optional[float] = None) -> Optional[float]:
+        current = self.last_second if now is None else int(now)
+        return self.at(current - seconds)
+    
+    def returns(self, seconds: int, now: Optional[float] = None) -> Optional[float]:
+        past = self.ago(seconds, now)
+        if past is None or not past or self.last_price is None:
+            return None
+        return self.last_price / past - 1
@@ -0,0 +1,74 @@
+import argparse
+import asyncio
+import json
+import subprocess
+import time
+from polymarket_bot.api.gigabrain import GigaBrainClient
+from .standins import HttpStandIn
+
+
+def curl_chat(base_url: str, api_key: str, message: str) -> dict:
+    # The subprocess client this package used before the pooled one, kept here as the baseline
+    cmd = [
+        'curl', '-s', '-X', 'POST',
+        f'{base_url}/v1/chat',
+        '-H', f'Authorization: Bearer {api_key}',
+        '-H', 'Content-Type: application/json',
+        '-d', json.dumps({'message': message, 'stream': False}),
+        '--max-time', '90'
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=100)
+    if result.returncode != 0:
+        return {'error': 'curl failed', 'success': False}
+    return json.loads(result.stdout)
+
+
+def summary(samples) -> str:
+    samples = sorted(samples)
+    p50 = samples[len(samples) // 2] * 1000
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000
+    return f'p50={p50:7.2f}ms p99={p99:7.2f}ms'
+
+
+def timed(call, calls: int):
+    samples = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        reply = call()
+        samples.append(time.perf_counter() - started)
+        assert reply.get('success'), reply
+    return samples
+
+
+def run(calls: int, prompt_kb: int, concurrency: int):
+    reply = {'content': 'BTC 15m Up $0.55, Yes', 'success': True}
+    standin = HttpStandIn({('POST', '/v1/chat'): lambda query, body: (200, reply)}).start()
+    message = 'x' * (prompt_kb * 1024)
+    client = GigaBrainClient(api_key='key', base_url=standin.url)
+    
+    try:
+        print(f'{calls} calls, {prompt_kb} KiB prompt, local stand-in at {standin.url}')
+        print(f'curl subprocess   {summary(timed(lambda: curl_chat(standin.url, "key", message), calls))}')
+        print(f'pooled requests   {summary(timed(lambda: client.chat(message), calls))}')
+        
+        async def burst():
+            # The first call builds the httpx pool; time the warm burst like the sync rows
+            await client.achat(message)
+            started = time.perf_counter()
+            replies = await asyncio.gather(*[client.achat(message) for _ in range(concurrency)])
+            assert all(r.get('success') for r in replies)
+            return time.perf_counter() - started
+        
+        elapsed = asyncio.run(burst())
+        print(f'pooled httpx      {concurrency} concurrent calls in {elapsed * 1000:.2f}ms')
+    finally:
+        standin.stop()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='GigaBrain client latency: curl subprocess versus pooled HTTP')
+    parser.add_argument('--calls', type=int, default=100)
+    parser.add_argument('--prompt-kb', type=int, default=8)
+    parser.add_argument('--concurrency', type=int, default=8)
+    args = parser.parse_args()
+    run(args.calls, args.prompt_kb, args.concurrency)
@@ -0,0 +1,80 @@
+import argparse
+import threading
+import time
+from polymarket_bot.core.market_stream import MarketStream
+from polymarket_bot.markets.crypto import Market
+from polymarket_bot.markets.hub import MarketHub
+from .standins import ClobMarketFeed
+
+
+class StaticMarkets:
+    def __init__(self, markets):
+        self.markets = markets
+    
+    def _get_markets(self, timeframes, symbols, unresolved=None):
+        return {'15m': list(self.markets)}
+
+
+def summary(samples):
+    samples = sorted(samples)
+    if not samples:
+        return 'no samples'
+    p50 = samples[len(samples) // 2] * 1000
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000
+    return f'n={len(samples)} p50={p50:.2f}ms p99={p99:.2f}ms max={samples[-1] * 1000:.2f}ms'
+
+
+def run(updates: int, rate: float):
+    feed = ClobMarketFeed().start()
+    stream = MarketStream(url=feed.url)
+    market = Market('BTC', '15m', 'btc-15m', 'cond', 'q', 0.0, 0.0, True, ['Up', 'Down'], ['up', 'down'], {'Up': 0.5, 'Down': 0.5})
+    hub = MarketHub(markets=StaticMarkets([market]), timeframes=['15m'], symbols=['BTC'], stream=stream)
+    
+    sent = {}
+    handler_latency = []
+    subscriber_latency = []
+    done = threading.Event()
+    
+    def on_quote(quote):
+        started = sent.get(quote.best_bid)
+        if started is not None:
+            handler_latency.append(time.perf_counter() - started)
+    
+    def on_events(events, snapshot):
+        now = time.perf_counter()
+        for event in events:
+            bid = round(event.market.prices['Up'] - 0.01, 4)
+            if bid in sent:
+                subscriber_latency.append(now - sent[bid])
+                if len(subscriber_latency) >= updates:
+                    done.set()
+    
+    stream.on_quote(on_quote)
+    hub.subscribe(on_events)
+    hub.refresh()
+    stream.start()
+    feed.wait_for(lambda: 'up' in feed.subscribed)
+    
+    try:
+        for i in range(updates):
+            # Unique 4-decimal bids so both ends can recover which update they saw
+            bid = round(0.1 + (i % 5000) / 1e4, 4)
+            sent[bid] = time.perf_counter()
+            feed.best('up', bid, round(bid + 0.02, 4))
+            time.sleep(1 / rate)
+        done.wait(5)
+    finally:
+        stream.stop()
+        feed.stop()
+    
+    print(f'update -> MarketStream handler: {summary(handler_latency)}')
+    print(f'update -> MarketHub subscriber: {summary(subscriber_latency)}')
+    print(f'stream stats: {stream.stats()["handler_latency"]}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Update-to-handler latency against a local market-channel stand-in')
+    parser.add_argument('--updates', type=int, default=500)
+    parser.add_argument('--rate', type=float, default=200.0)
+    args = parser.parse_args()
+    run(args.updates, args.rate)
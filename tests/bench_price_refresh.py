@@ -0,0 +1,105 @@
+import argparse
+import json
+import time
+from polymarket_bot.core.client import PolymarketClient
+from polymarket_bot.data import gamma
+from polymarket_bot.data.cache import MarketCache
+from polymarket_bot.data.gamma import resolve_market_slugs
+from polymarket_bot.utils.http import get_session
+from .standins import HttpStandIn
+
+DESCRIPTION = (
+    'This market will resolve to "Up" if the close price is greater than or equal to the open price '
+    'for the interval specified in the title. Otherwise, it resolves to "Down". The resolution source '
+    'is the exchange candle for the pair at 1-minute granularity. '
+) * 6
+
+
+def gamma_market(slug: str, i: int) -> dict:
+    up, down = f'{10 ** 76 + 2 * i}', f'{10 ** 76 + 2 * i + 1}'
+    event = {'id': str(9000 + i), 'slug': slug, 'title': slug, 'description': DESCRIPTION, 'tags': [{'label': 'Crypto'}] * 4}
+    return {
+        'id': str(i),
+        'slug': slug,
+        'question': f'{slug} Up or Down?',
+        'conditionId': f'0x{i:064x}',
+        'questionID': f'0x{i + 1:064x}',
+        'description': DESCRIPTION,
+        'outcomes': json.dumps(['Up', 'Down']),
+        'outcomePrices': json.dumps(['0.5', '0.5']),
+        'clobTokenIds': json.dumps([up, down]),
+        'volume': '12345.67',
+        'liquidity': '2345.6',
+        'active': True,
+        'closed': False,
+        'endDate': '2030-01-01T00:00:00Z',
+        'image': 'https://polymarket-upload.s3.us-east-2.amazonaws.com/' + 'x' * 80,
+        'icon': 'https://polymarket-upload.s3.us-east-2.amazonaws.com/' + 'y' * 80,
+        'events': [event],
+        'umaResolutionStatuses': '[]',
+        'rewardsMinSize': 50,
+        'rewardsMaxSpread': 4.5,
+    }
+
+
+def run(markets: int, ticks: int, latency: float):
+    slugs = [f'btc-updown-15m-{1700000000 + 900 * i}' for i in range(markets)]
+    documents = {slug: gamma_market(slug, i) for i, slug in enumerate(slugs)}
+    
+    def gamma_route(query, body):
+        return 200, [documents[slug] for slug in query.get('slug', []) if slug in documents]
+    
+    def midpoint_route(query, body):
+        return 200, {item['token_id']: '0.51' for item in json.loads(body)}
+    
+    standin = HttpStandIn({('GET', '/markets'): gamma_route, ('POST', '/midpoints'): midpoint_route}, latency).start()
+    gamma.GAMMA_URL = standin.url
+    client = PolymarketClient()
+    client.api_url = standin.url
+    session = get_session()
+    
+    def decode_time(bodies, repeat: int = 20) -> float:
+        # Client-side parse cost for one tick's responses, free of the stand-in's share of the GIL
+        started = time.perf_counter()
+        for _ in range(repeat):
+            for body in bodies:
+                json.loads(body)
+        return (time.perf_counter() - started) / repeat
+    
+    full_bodies = [json.dumps(list(documents.values()))]
+    tokens = [t for doc in documents.values() for t in json.loads(doc['clobTokenIds'])]
+    fast_bodies = [json.dumps({t: '0.51' for t in tokens})]
+    
+    def measure(label: str, price_source, bodies):
+        # refresh_ttl=0 makes every tick a refresh; metadata_ttl decides whether gamma is needed again
+        cache = MarketCache(refresh_ttl=0, metadata_ttl=0 if price_source is None else 3600)
+        resolve_market_slugs(session, slugs, cache=cache)
+        standin.bytes_out = 0
+        started = time.perf_counter()
+        for _ in range(ticks):
+            resolved = resolve_market_slugs(session, slugs, cache=cache, price_source=price_source)
+            assert len(resolved) == markets
+        elapsed = (time.perf_counter() - started) / ticks
+        per_tick = standin.bytes_out / ticks
+        parse = decode_time(bodies)
+        print(f'{label:<22} {elapsed * 1000:8.2f} ms/tick {per_tick / 1024:9.1f} KiB/tick {parse * 1000:8.3f} ms parse/tick')
+        return elapsed, per_tick, parse
+    
+    try:
+        full_time, full_bytes, full_parse = measure('full gamma document', None, full_bodies)
+        fast_time, fast_bytes, fast_parse = measure('midpoints only', client.get_midpoints, fast_bodies)
+    finally:
+        standin.stop()
+    print(
+        f'wall {full_time / fast_time:.1f}x faster, payload {full_bytes / fast_bytes:.1f}x smaller, '
+        f'parse {full_parse / fast_parse:.1f}x faster'
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Per-tick cost of the full gamma refresh versus the midpoint refresh')
+    parser.add_argument('--markets', type=int, default=72)
+    parser.add_argument('--ticks', type=int, default=50)
+    parser.add_argument('--latency', type=float, default=0.0, help='added server latency per request, seconds')
+    args = parser.parse_args()
+    run(args.markets, args.ticks, args.latency)
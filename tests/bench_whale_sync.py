@@ -0,0 +1,89 @@
+import argparse
+import threading
+import time
+from polymarket_bot.copytrading.service import CopyTradingService
+from polymarket_bot.utils.http import HttpTransport, TimeoutHTTPAdapter
+from .standins import HttpStandIn
+
+DATA_API = 'https://data-api.polymarket.com'
+
+
+class ServerLimit:
+    def __init__(self, rate: float, retry_after: float):
+        self.rate = rate
+        self.retry_after = retry_after
+        self.window: list = []
+        self.served = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+    
+    def admit(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self.window = [t for t in self.window if now - t < 1.0]
+            if len(self.window) >= self.rate:
+                self.rejected += 1
+                return False
+            self.window.append(now)
+            self.served += 1
+            return True
+
+
+def run(wallets: int, workers: int, server_rate: float, client_rate: float, latency: float):
+    limit = ServerLimit(server_rate, 1)
+    
+    def user_data(kind: str):
+        def route(query, body):
+            if not limit.admit():
+                return 429, {'error': 'rate limited'}, {'Retry-After': str(limit.retry_after)}
+            user = query['user'][0]
+            return 200, [{'proxyWallet': user, 'kind': kind, 'size': 10.0 * i} for i in range(20)]
+        return route
+    
+    standin = HttpStandIn({('GET', '/trades'): user_data('trade'), ('GET', '/positions'): user_data('position')}, latency).start()
+    transport = HttpTransport(retries=6, backoff=0.05, rate_limits={'127.0.0.1': (client_rate, client_rate)})
+    
+    class StandInAdapter(TimeoutHTTPAdapter):
+        def send(self, request, **kwargs):
+            request.url = request.url.replace(DATA_API, standin.url)
+            return super().send(request, **kwargs)
+    
+    adapter = StandInAdapter(
+        timeout=transport.timeout,
+        limiter=transport.limiter,
+        pool_connections=32,
+        pool_maxsize=32,
+        max_retries=transport._retry()
+    )
+    service = CopyTradingService()
+    service.polymarket_client.session.mount(f'{DATA_API}/', adapter)
+    
+    seen = []
+    started = time.time()
+    try:
+        _, report = service.sync_wallets(
+            [f'0x{i:040x}' for i in range(wallets)],
+            workers=workers,
+            progress=lambda r: seen.append((r.done, r.total))
+        )
+    finally:
+        standin.stop()
+    elapsed = time.time() - started
+    
+    bucket = transport.limiter.bucket('127.0.0.1').stats()
+    print(
+        f'workers={workers:2d} {elapsed:6.2f}s synced={report.synced} failed={len(report.failures)} '
+        f'progress={seen[-1][0]}/{seen[-1][1]} served={limit.served} 429s={limit.rejected} '
+        f'throttled={bucket["throttled"]} final_rate={bucket["rate"]:.1f}/s'
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Whale sync throughput against a rate-limited data-api stand-in')
+    parser.add_argument('--wallets', type=int, default=200)
+    parser.add_argument('--server-rate', type=float, default=60, help='requests per second before the stand-in answers 429')
+    parser.add_argument('--client-rate', type=float, default=80, help='starting token bucket rate, set above the server to force 429s')
+    parser.add_argument('--latency', type=float, default=0.05)
+    args = parser.parse_args()
+    for workers in (1, 8):
+        run(args.wallets, workers, args.server_rate, args.client_rate, args.latency)
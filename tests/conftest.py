@@ -0,0 +1,16 @@
+import pytest
+from .standins import ClobMarketFeed, ReferenceFeed
+
+
+@pytest.fixture
+def clob_feed():
+    feed = ClobMarketFeed().start()
+    yield feed
+    feed.stop()
+
+
+@pytest.fixture
+def reference_feed():
+    feed = ReferenceFeed().start()
+    yield feed
+    feed.stop()
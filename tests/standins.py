@@ -0,0 +1,193 @@
+import asyncio
+import json
+import threading
+import time
+import websockets
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import List, Dict, Optional, Callable, Tuple, Set
+from urllib.parse import urlparse, parse_qs
+
+
+class WebSocketStandIn:
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.clients: Set = set()
+        self.received: List[str] = []
+        self.connections = 0
+        self.port = 0
+        self._ready = threading.Event()
+        self._server = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+    
+    @property
+    def url(self) -> str:
+        return f'ws://127.0.0.1:{self.port}'
+    
+    async def _listen(self):
+        self._server = await websockets.serve(self._handler, '127.0.0.1', 0)
+        self.port = next(iter(self._server.sockets)).getsockname()[1]
+        self._ready.set()
+    
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_until_complete(self._listen())
+        self.loop.run_forever()
+    
+    def start(self) -> 'WebSocketStandIn':
+        self.thread.start()
+        self._ready.wait(5)
+        return self
+    
+    def stop(self):
+        async def close():
+            self._server.close()
+            await self._server.wait_closed()
+        asyncio.run_coroutine_threadsafe(close(), self.loop).result(5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+    
+    async def _handler(self, ws):
+        self.connections += 1
+        self.clients.add(ws)
+        try:
+            async for message in ws:
+                self.received.append(message)
+                reply = self.on_message(message)
+                if reply is not None:
+                    await ws.send(reply)
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self.clients.discard(ws)
+    
+    def on_message(self, message: str) -> Optional[str]:
+        return None
+    
+    def send(self, payload):
+        text = payload if isinstance(payload, str) else json.dumps(payload)
+        
+        async def broadcast():
+            for ws in list(self.clients):
+                await ws.send(text)
+        asyncio.run_coroutine_threadsafe(broadcast(), self.loop).result(5)
+    
+    def drop(self):
+        async def close():
+            for ws in list(self.clients):
+                await ws.close()
+        asyncio.run_coroutine_threadsafe(close(), self.loop).result(5)
+    
+    def wait_for(self, predicate: Callable[[], bool], timeout: float = 5.0) -> bool:
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if predicate():
+                return True
+            time.sleep(0.01)
+        return predicate()
+
+
+class ClobMarketFeed(WebSocketStandIn):
+    def __init__(self):
+        super().__init__()
+        self.subscribed: Set[str] = set()
+    
+    def on_message(self, message: str) -> Optional[str]:
+        if message == 'PING':
+            return 'PONG'
+        data = json.loads(message)
+        assets = set(data.get('assets_ids', []))
+        if data.get('operation') == 'unsubscribe':
+            self.subscribed -= assets
+        else:
+            self.subscribed |= assets
+        return None
+    
+    def book(self, asset_id: str, bids: List[Tuple[float, float]], asks: List[Tuple[float, float]]):
+        self.send({
+            'event_type': 'book',
+            'asset_id': asset_id,
+            'bids': [{'price': str(p), 'size': str(s)} for p, s in bids],
+            'asks': [{'price': str(p), 'size': str(s)} for p, s in asks],
+            'timestamp': str(int(time.time() * 1000))
+        })
+    
+    def best(self, asset_id: str, bid: float, ask: float, sent_at: Optional[float] = None):
+        self.send({
+            'event_type': 'best_bid_ask',
+            'asset_id': asset_id,
+            'best_bid': str(bid),
+            'best_ask': str(ask),
+            'timestamp': str(int((sent_at or time.time()) * 1000))
+        })
+
+
+class ReferenceFeed(WebSocketStandIn):
+    def trade(self, symbol: str, price: float, ts: Optional[float] = None):
+        pair = f'{symbol.lower()}usdt'
+        self.send({
+            'stream': f'{pair}@aggTrade',
+            'data': {'e': 'aggTrade', 's': pair.upper(), 'p': str(price), 'T': int((ts or time.time()) * 1000)}
+        })
+
+
+# A route returns (status, payload) or (status, payload, headers)
+Route = Callable[[Dict[str, List[str]], Optional[bytes]], Tuple]
+
+
+class HttpStandIn:
+    def __init__(self, routes: Dict[Tuple[str, str], Route], latency: float = 0.0):
+        self.routes = routes
+        self.latency = latency
+        self.calls: List[Tuple[str, str]] = []
+        self.bytes_out = 0
+        standin = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+            
+            def _serve(self, method: str):
+                url = urlparse(self.path)
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else None
+                standin.calls.append((method, url.path))
+                route = standin.routes.get((method, url.path))
+                if standin.latency:
+                    time.sleep(standin.latency)
+                reply = route(parse_qs(url.query), body) if route else (404, {'error': 'not found'})
+                status, payload, headers = reply if len(reply) == 3 else (*reply, {})
+                # Bytes payloads go out as-is; a None header value leaves that header off
+                data = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+                standin.bytes_out += len(data)
+                self.send_response(status)
+                headers = {'Content-Type': 'application/json', **headers}
+                for name, value in headers.items():
+                    if value is not None:
+                        self.send_header(name, value)
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            
+            def do_GET(self):
+                self._serve('GET')
+            
+            def do_POST(self):
+                self._serve('POST')
+            
+            def log_message(self, *args):
+                pass
+        
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+    
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.server.server_port}'
+    
+    def start(self) -> 'HttpStandIn':
+        self.thread.start()
+        return self
+    
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,31 @@
+import time
+from functools import partial
+from polymarket_bot.config import FETCH_MAX_WORKERS
+from polymarket_bot.utils.concurrency import fan_out
+
+
+def slow(value: int) -> int:
+    time.sleep(0.05)
+    return value
+
+
+def inner(n: int):
+    # Let every outer call take a worker before any inner call is queued
+    time.sleep(0.2)
+    return fan_out([partial(slow, n * 10 + i) for i in range(4)], deadline=1.0)
+
+
+def test_nested_fan_out_does_not_starve_the_outer_pool():
+    # Enough outer calls to hold every worker of the shared pool while their inner calls wait
+    calls = 2 * FETCH_MAX_WORKERS
+    outer = fan_out([partial(inner, n) for n in range(calls)], deadline=5.0)
+    assert outer == [[n * 10 + i for i in range(4)] for n in range(calls)]
+
+
+def test_third_level_runs_inline():
+    def level(depth: int):
+        if depth == 3:
+            return 'leaf'
+        return fan_out([partial(level, depth + 1), partial(slow, depth)])
+    
+    assert level(0) == [[['leaf', 2], 1], 0]
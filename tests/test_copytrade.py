@@ -0,0 +1,95 @@
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from polymarket_bot.agent.copytrade import CopyTradeAgent
+from polymarket_bot.agent.rules import MovePrefilter
+from polymarket_bot.api.decisions import DecisionCache
+from polymarket_bot.api.scheduler import LLMScheduler
+
+WHALE = {'wallet': '0xwhale', 'profit': 50000}
+
+
+def activity(i: int) -> dict:
+    return {'id': f'move-{i}', 'conditionId': f'0xmarket{i}', 'title': f'Market {i}?', 'side': 'BUY', 'size': 250, 'price': 0.5}
+
+
+def agent(replies: list) -> CopyTradeAgent:
+    prompts = []
+    
+    def chat(prompt, timeout=None):
+        prompts.append(prompt)
+        return replies.pop(0)
+    
+    copier = CopyTradeAgent.__new__(CopyTradeAgent)
+    copier.gigabrain = SimpleNamespace(chat=chat, prompts=prompts)
+    copier.decisions = DecisionCache()
+    copier.scheduler = LLMScheduler(max_concurrency=1)
+    copier.prefilter = MovePrefilter(auto_profit=0)
+    copier.tiers = {}
+    copier.llm_calls = 0
+    copier.llm_time = 0.0
+    return copier
+
+
+def test_gigabrain_error_falls_back_without_caching():
+    copier = agent([
+        {'error': 'timeout', 'success': False},
+        {'response': '{"copy": true, "confidence": 0.8, "reasoning": "strong whale"}'}
+    ])
+    try:
+        analysis = copier.analyze_trade(WHALE, activity(1))
+        assert analysis['tier'] == 'fallback' and 'timeout' in analysis['reasoning']
+        assert copier.decisions.get(copier._decision_key(WHALE, activity(1))) is None
+        
+        # The next poll asks again instead of replaying the outage
+        analysis = copier.analyze_trade(WHALE, activity(1))
+        assert analysis['tier'] == 'llm' and analysis['copy'] is True
+        assert copier.analyze_trade(WHALE, activity(1))['tier'] == 'cache'
+        assert len(copier.gigabrain.prompts) == 2
+    finally:
+        copier.scheduler.shutdown()
+
+
+def test_batch_error_falls_back_for_every_move_in_one_call():
+    copier = agent([{'error': 'curl failed', 'success': False}])
+    moves = [{'id': f'm{i}', 'whale': WHALE, 'activity': activity(i)} for i in range(3)]
+    try:
+        results = copier.analyze_trades(moves)
+        assert [results[m['id']]['tier'] for m in moves] == ['fallback'] * 3
+        assert len(copier.gigabrain.prompts) == 1
+        assert copier.decisions.stats()['size'] == 0
+    finally:
+        copier.scheduler.shutdown()
+
+
+def iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def test_whale_move_calls_carry_the_market_close_as_deadline():
+    reply = {'response': '[{"id": 1, "copy": false, "confidence": 0.7, "reasoning": "late"}, {"id": 2, "copy": true, "confidence": 0.7, "reasoning": "ok"}]'}
+    copier = agent([{'response': '{"copy": false, "confidence": 0.7, "reasoning": "late"}'}, reply])
+    seen = []
+    run = copier.scheduler.run
+    
+    def record(call, priority=None, deadline=None, label='llm'):
+        seen.append((priority, deadline))
+        return run(call, priority, deadline, label)
+    
+    copier.scheduler.run = record
+    soon, later = time.time() + 600, time.time() + 3600
+    try:
+        copier.analyze_trade(WHALE, dict(activity(1), endDate=iso(soon)))
+        assert abs(seen[0][1] - soon) < 1
+        
+        moves = [
+            {'id': 'a', 'whale': WHALE, 'activity': dict(activity(2), endDate=iso(soon))},
+            {'id': 'b', 'whale': WHALE, 'activity': dict(activity(3), endDate=iso(later))}
+        ]
+        copier.analyze_trades(moves)
+        priority, deadline = seen[1]
+        # Queued by the soonest close, kept until the last one
+        assert abs(deadline - later) < 1
+        assert priority < copier.scheduler.priority(later, 250)
+    finally:
+        copier.scheduler.shutdown()
@@ -0,0 +1,40 @@
+from polymarket_bot.strategy.decision import DecisionParser
+
+
+def feed(parser: DecisionParser, text: str, size: int = 3):
+    decisions = []
+    for i in range(0, len(text), size):
+        decisions.append(parser.feed(text[i:i + size]))
+    return decisions
+
+
+def test_decision_settles_as_soon_as_the_marker_streams_in():
+    parser = DecisionParser()
+    decisions = feed(parser, 'ETH 15m Down $0.62, Yes, because the move is fading and then more reasoning')
+    first = next(i for i, d in enumerate(decisions) if d)
+    assert all(d is None for d in decisions[:first])
+    assert decisions[first] == {
+        'symbol': 'ETH',
+        'side': 'Down',
+        'price': 0.62,
+        'decision': 'YES',
+        'reason': 'ETH 15m Down $0.62, Yes'
+    }
+    assert parser.settled and first < len(decisions) - 10
+
+
+def test_no_decision_and_half_streamed_words():
+    parser = DecisionParser()
+    assert feed(parser, 'SOL 1h Up $0.41, No')[-1] is None
+    assert parser.feed(',')['decision'] == 'NO'
+    
+    parser = DecisionParser()
+    assert feed(parser, 'XRP 15m Up, Now the odds')[-1] is None
+    assert not parser.settled
+
+
+def test_ambiguous_head_waits_for_the_full_reply():
+    parser = DecisionParser()
+    assert feed(parser, 'BTC or ETH 15m Up $0.5, Yes, reasons')[-1] is None
+    assert parser.settled
+    assert parser.text == 'BTC or ETH 15m Up $0.5, Yes, reasons'
@@ -0,0 +1,80 @@
+import time
+from polymarket_bot.api.decisions import DecisionCache
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.client = self
+    
+    def get(self, key):
+        return self.data.get(key)
+    
+    def set(self, key, value, ttl):
+        self.data[key] = value
+    
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+def test_key_normalizes_floats_and_order():
+    cache = DecisionCache()
+    a = cache.key('smart', {'b': [0.5001, 1], 'a': {'x': 0.12345}}, precision=2)
+    b = cache.key('smart', {'a': {'x': 0.12}, 'b': [0.5, 1]}, precision=2)
+    assert a == b and a.startswith('smart:')
+    assert cache.key('smart', {'a': 0.13}) != cache.key('smart', {'a': 0.12})
+
+
+def test_lru_eviction_keeps_recently_used_entries():
+    cache = DecisionCache(max_size=3, ttl=60)
+    for key in 'abc':
+        cache.put(key, key.upper())
+    assert cache.get('a') == 'A'
+    cache.put('d', 'D')
+    
+    assert cache.get('b') is None
+    assert [cache.get(k) for k in 'acd'] == ['A', 'C', 'D']
+    stats = cache.stats()
+    assert stats['evictions'] == 1 and stats['size'] == 3
+    assert stats['hits'] == 4 and stats['misses'] == 1
+
+
+def test_ttl_and_interval_expiry():
+    cache = DecisionCache(ttl=0.1)
+    cache.put('short', 1)
+    cache.put('capped', 2, ttl=60, expires_at=time.time() + 0.1)
+    cache.put('closed', 3, expires_at=time.time() - 1)
+    cache.put('long', 4, ttl=60)
+    assert cache.get('closed') is None
+    assert cache.get('short') == 1 and cache.get('capped') == 2
+    
+    time.sleep(0.15)
+    assert cache.get('short') is None and cache.get('capped') is None
+    assert cache.get('long') == 4
+    assert cache.stats()['size'] == 1
+
+
+def succeeded(value) -> bool:
+    return 'error' not in value
+
+
+def test_get_or_compute_and_redis_fallback():
+    redis = FakeRedis()
+    first = DecisionCache(redis=redis)
+    calls = []
+    
+    def compute():
+        calls.append(1)
+        return {'error': 'timeout'} if len(calls) == 1 else {'content': 'ok'}
+    
+    assert first.get_or_compute('k', compute, cacheable=succeeded) == {'error': 'timeout'}
+    assert first.get_or_compute('k', compute, cacheable=succeeded) == {'content': 'ok'}
+    assert first.get_or_compute('k', compute, cacheable=succeeded) == {'content': 'ok'}
+    assert len(calls) == 2
+    
+    # Another process sees the shared entry and keeps it locally afterwards
+    second = DecisionCache(redis=redis)
+    assert second.get('k') == {'content': 'ok'}
+    assert second.stats()['redis_hits'] == 1 and second.stats()['size'] == 1
+    second.invalidate('k')
+    assert DecisionCache(redis=redis).get('k') is None
@@ -0,0 +1,55 @@
+import random
+from polymarket_bot.data.filters import KEYWORD_CATEGORIES, filter_markets_by_category, filter_financial_markets
+
+
+def joined_filter(markets, keywords, min_volume):
+    # The original filter: every keyword against the question and the space-joined tags
+    filtered = []
+    for m in markets:
+        question = str(m.get('question', '')).lower()
+        tag_str = ' '.join(str(t).lower() for t in (m.get('tags', []) or []))
+        matched = any(kw in question for kw in keywords) or any(kw in tag_str for kw in keywords)
+        if matched and float(m.get('volume', 0) or 0) >= min_volume:
+            filtered.append(m)
+    return filtered
+
+
+def random_markets(rng: random.Random, count: int):
+    words = sorted({w for kws in KEYWORD_CATEGORIES.values() for kw in kws for w in kw.split(' ')})
+    fragments = words + [w[:2] for w in words] + [w[2:] for w in words] + ['sports', 'weather', 'Rate', 'FED', 'x', '']
+    
+    def phrase():
+        return ' '.join(rng.choice(fragments) for _ in range(rng.randint(1, 3)))
+    
+    markets = []
+    for i in range(count):
+        tags = [phrase() for _ in range(rng.randint(0, 5))]
+        if rng.random() < 0.1:
+            tags.append(rng.randint(0, 9))
+        markets.append({
+            'id': i,
+            'question': phrase() + '?',
+            'tags': tags if rng.random() > 0.05 else None,
+            'volume': rng.choice([0, '', None, '5000', 20000.0, 1e6])
+        })
+    return markets
+
+
+def test_filters_match_the_joined_tag_implementation():
+    rng = random.Random(7)
+    markets = random_markets(rng, 20000)
+    for category, keywords in KEYWORD_CATEGORIES.items():
+        for min_volume in (0, 10000):
+            expected = joined_filter(markets, keywords, min_volume)
+            assert filter_markets_by_category(markets, category, min_volume) == expected, (category, min_volume)
+    assert filter_financial_markets(markets, 0) == joined_filter(markets, KEYWORD_CATEGORIES['finance'], 0)
+
+
+def test_multi_word_keyword_across_adjacent_tags():
+    markets = [
+        {'question': 'Q?', 'tags': ['Interest', 'Rate cuts'], 'volume': 1},
+        {'question': 'Q?', 'tags': ['the sp', '500 index'], 'volume': 1},
+        {'question': 'Q?', 'tags': ['interest', 'x', 'rate'], 'volume': 1},
+        {'question': 'Q?', 'tags': ['s', 'p 500'], 'volume': 1}
+    ]
+    assert filter_financial_markets(markets, 0) == markets[:2]
@@ -0,0 +1,73 @@
+import asyncio
+import json
+import socket
+from polymarket_bot.api.gigabrain import GigaBrainClient, TRANSPORT_ERROR
+from .standins import HttpStandIn
+
+
+def _closed_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def test_chat_returns_the_json_body():
+    standin = HttpStandIn({('POST', '/v1/chat'): lambda query, body: (200, {'content': 'BTC 15m Up, Yes', 'success': True})}).start()
+    try:
+        client = GigaBrainClient(api_key='key', base_url=standin.url)
+        assert client.chat('hi') == {'content': 'BTC 15m Up, Yes', 'success': True}
+        assert asyncio.run(client.achat('hi'))['content'] == 'BTC 15m Up, Yes'
+    finally:
+        standin.stop()
+
+
+def test_error_contract_matches_the_curl_client():
+    client = GigaBrainClient(api_key='key', base_url=f'http://127.0.0.1:{_closed_port()}')
+    assert client.chat('hi') == {'error': TRANSPORT_ERROR, 'success': False}
+    assert asyncio.run(client.achat('hi')) == {'error': TRANSPORT_ERROR, 'success': False}
+    assert client.chat_stream('hi')['error'] == TRANSPORT_ERROR
+    assert TRANSPORT_ERROR == 'curl failed'
+    
+    slow = HttpStandIn({('POST', '/v1/chat'): lambda query, body: (200, {})}, latency=0.5).start()
+    try:
+        client = GigaBrainClient(api_key='key', base_url=slow.url, chat_timeout=0.1)
+        assert client.chat('hi') == {'error': 'timeout', 'success': False}
+    finally:
+        slow.stop()
+
+
+REPLY = 'BTC 15m Up $0.55, Yes, momentum → +0.4% by close'
+
+
+def _stream(content_type, body: bytes):
+    standin = HttpStandIn({('POST', '/v1/chat'): lambda query, data: (200, body, {'Content-Type': content_type})}).start()
+    tokens = []
+    try:
+        result = GigaBrainClient(api_key='key', base_url=standin.url).chat_stream('hi', tokens.append)
+    finally:
+        standin.stop()
+    return result, tokens
+
+
+def test_chat_stream_decodes_utf8_whatever_the_content_type():
+    words = REPLY.split(' ')
+    chunks = [w + ' ' for w in words[:-1]] + [words[-1]]
+    ndjson = ''.join(json.dumps({'delta': c}) + '\n' for c in chunks).encode()
+    sse = (''.join(f'data: {json.dumps({"content": c})}\n\n' for c in chunks) + 'data: [DONE]\n\n').encode()
+    
+    for content_type, body in [
+        ('application/x-ndjson', ndjson),
+        (None, ndjson),
+        ('text/plain', ndjson),
+        ('text/event-stream', sse),
+        ('text/event-stream; charset=utf-8', sse)
+    ]:
+        result, tokens = _stream(content_type, body)
+        assert result == {'content': REPLY}, content_type
+        assert ''.join(tokens) == REPLY
+
+
+def test_chat_stream_accepts_a_plain_json_body():
+    result, tokens = _stream('application/json', json.dumps({'content': REPLY, 'success': True}).encode())
+    assert result == {'content': REPLY}
+    assert tokens == [REPLY]
@@ -0,0 +1,22 @@
+from polymarket_bot.utils.http import HttpTransport
+from .standins import HttpStandIn
+
+
+def test_each_429_throttles_the_host_once():
+    def limited(query, body):
+        return 429, {'error': 'rate limited'}, {'Retry-After': '0'}
+    
+    standin = HttpStandIn({('GET', '/data'): limited, ('POST', '/data'): limited}).start()
+    transport = HttpTransport(retries=2, backoff=0)
+    try:
+        session = transport.session()
+        # urllib3 retries the GET twice, so three 429s, the last one after retries ran out
+        assert session.get(f'{standin.url}/data').status_code == 429
+        assert transport.limiter.bucket('127.0.0.1').throttled == 3
+        # POSTs are not retried, so only the adapter sees their 429
+        assert session.post(f'{standin.url}/data', json={}).status_code == 429
+        assert transport.limiter.bucket('127.0.0.1').throttled == 4
+        assert len(standin.calls) == 4
+    finally:
+        transport.close()
+        standin.stop()
@@ -0,0 +1,56 @@
+import math
+import random
+import statistics
+from polymarket_bot.scalper.indicators import EMA, MarketIndicators, RollingVolatility
+
+
+def test_ema_matches_the_recursive_definition():
+    ema = EMA(5)
+    prices = [0.5, 0.52, 0.51, 0.55, 0.6, 0.58]
+    assert ema.update(prices[0]) == prices[0]
+    expected = prices[0]
+    for price in prices[1:]:
+        expected += (2 / 6) * (price - expected)
+        assert abs(ema.update(price) - expected) < 1e-12
+
+
+def test_rolling_volatility_matches_population_stdev_of_the_window():
+    rng = random.Random(5)
+    vol = RollingVolatility(20)
+    prices = [0.5]
+    assert vol.update(prices[0]) is None
+    for _ in range(300):
+        prices.append(min(max(prices[-1] + rng.uniform(-0.02, 0.02), 0.01), 0.99))
+        value = vol.update(prices[-1])
+        returns = [math.log(b / a) for a, b in zip(prices, prices[1:])][-20:]
+        if len(returns) < 2:
+            assert value is None
+        else:
+            assert abs(value - statistics.pstdev(returns)) < 1e-9
+    
+    flat = RollingVolatility(10)
+    for _ in range(12):
+        flat.update(0.5)
+    assert flat.value == 0.0
+
+
+def test_market_indicators_outputs():
+    ind = MarketIndicators(capacity=30, fast=3, slow=10, momentum=5)
+    assert ind.snapshot()['momentum'] is None and ind.trend == 0.0
+    
+    for i in range(20):
+        assert ind.update(1000 + 10 * i, 0.40 + 0.01 * i, 0.60 - 0.01 * i, 1000 + 50 * i)
+    # An unchanged poll is not a new tick
+    assert not ind.update(1200, ind.up_prices.last, ind.down_prices.last, ind.volumes.last)
+    
+    snap = ind.snapshot()
+    assert snap['ticks'] == 20
+    assert abs(snap['momentum'] - 0.05) < 1e-9
+    assert snap['trend'] > 0
+    assert abs(snap['volume_velocity'] - 5.0) < 1e-9
+    assert snap['volatility'] is not None and snap['volatility'] > 0
+    
+    for i in range(20, 60):
+        ind.update(1000 + 10 * i, 0.79 - 0.01 * (i - 20), 0.21, 2000 + 50 * i)
+    assert len(ind) == 30
+    assert ind.trend < 0 and ind.momentum < 0
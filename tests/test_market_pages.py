@@ -0,0 +1,60 @@
+import asyncio
+import random
+from polymarket_bot.core.async_client import AsyncPolymarketClient
+from polymarket_bot.core.client import PolymarketClient
+from .standins import HttpStandIn
+
+
+def gamma_pages(count: int):
+    rng = random.Random(3)
+    topics = ['Fed rate cut', 'S&P 500 close', 'Inflation print', 'Championship winner', 'Treasury yield']
+    markets = [{
+        'conditionId': f'0x{i:04x}',
+        'question': f'{rng.choice(topics)} #{i}?',
+        'volume': str(rng.uniform(1e3, 1e6)),
+        'liquidity': str(rng.choice([0, 500, 5000, 50000])),
+        'outcomes': '["Yes", "No"]',
+        'outcomePrices': '["0.4", "0.6"]',
+        'clobTokenIds': f'["{i}1", "{i}2"]',
+        'active': True,
+        'closed': False
+    } for i in range(count)]
+    markets.sort(key=lambda m: float(m['volume']), reverse=True)
+    
+    def route(query, body):
+        offset, limit = int(query['offset'][0]), int(query['limit'][0])
+        return 200, markets[offset:offset + limit]
+    return HttpStandIn({('GET', '/markets'): route}).start()
+
+
+def test_sync_and_async_clients_return_the_same_markets():
+    standin = gamma_pages(2000)
+    sync_client = PolymarketClient()
+    async_client = AsyncPolymarketClient()
+    sync_client.gamma_base_url = async_client.gamma_base_url = standin.url
+    try:
+        for limit, min_volume, min_liquidity in [(50, 50000, 0), (20, 200000, 1000), (500, 1000, 5000)]:
+            kwargs = dict(limit=limit, filter_crypto_timeframes=False, min_volume=min_volume, min_liquidity=min_liquidity)
+            expected = sync_client.get_markets(**kwargs)
+            assert expected and all(m['liquidity'] >= min_liquidity for m in expected)
+            assert asyncio.run(async_client.get_markets(**kwargs)) == expected
+        
+        # Both stop paging once the volume tail drops below the floor
+        standin.calls.clear()
+        asyncio.run(async_client.get_markets(limit=10, filter_crypto_timeframes=False, min_volume=900000))
+        assert 0 < len(standin.calls) < 4
+    finally:
+        standin.stop()
+
+
+def test_async_client_closes_the_pool_of_a_previous_loop():
+    standin = gamma_pages(10)
+    client = AsyncPolymarketClient()
+    client.gamma_base_url = standin.url
+    try:
+        asyncio.run(client.get_markets(filter_crypto_timeframes=False, min_volume=0))
+        first = client._client
+        asyncio.run(client.get_markets(filter_crypto_timeframes=False, min_volume=0))
+        assert first.is_closed and client._client is not first
+    finally:
+        standin.stop()
@@ -0,0 +1,84 @@
+import threading
+import time
+from polymarket_bot.core.market_stream import MarketStream
+from polymarket_bot.markets.crypto import Market
+from polymarket_bot.markets.hub import MarketHub
+
+
+class StaticMarkets:
+    def __init__(self, markets):
+        self.markets = markets
+    
+    def _get_markets(self, timeframes, symbols, unresolved=None):
+        return {'15m': list(self.markets)}
+
+
+def _market(slug='btc-15m'):
+    return Market('BTC', '15m', slug, 'cond', 'q', 0.0, 0.0, True, ['Up', 'Down'], ['up-token', 'down-token'], {'Up': 0.5, 'Down': 0.5})
+
+
+def test_stream_subscribes_and_tracks_top_of_book(clob_feed):
+    stream = MarketStream(url=clob_feed.url)
+    stream.subscribe(['up-token'])
+    stream.start()
+    try:
+        assert clob_feed.wait_for(lambda: 'up-token' in clob_feed.subscribed)
+        clob_feed.book('up-token', [(0.48, 10), (0.47, 5)], [(0.52, 10)])
+        assert clob_feed.wait_for(lambda: stream.get_quote('up-token') is not None)
+        quote = stream.get_quote('up-token')
+        assert (quote.best_bid, quote.best_ask, quote.price) == (0.48, 0.52, 0.5)
+        
+        stream.subscribe(['down-token'])
+        assert clob_feed.wait_for(lambda: 'down-token' in clob_feed.subscribed)
+        stream.unsubscribe(['down-token'])
+        assert clob_feed.wait_for(lambda: 'down-token' not in clob_feed.subscribed)
+    finally:
+        stream.stop()
+
+
+def test_stream_resubscribes_after_reconnect(clob_feed):
+    stream = MarketStream(url=clob_feed.url, max_backoff=0.2)
+    stream.subscribe(['up-token', 'down-token'])
+    stream.start()
+    try:
+        assert clob_feed.wait_for(lambda: clob_feed.connections == 1 and stream.connected)
+        clob_feed.subscribed.clear()
+        clob_feed.drop()
+        assert clob_feed.wait_for(lambda: clob_feed.connections == 2 and stream.connected)
+        assert clob_feed.wait_for(lambda: clob_feed.subscribed == {'up-token', 'down-token'})
+        assert stream.reconnects >= 1
+    finally:
+        stream.stop()
+
+
+def test_hub_publishes_quotes_off_the_stream_loop(clob_feed):
+    stream = MarketStream(url=clob_feed.url)
+    hub = MarketHub(markets=StaticMarkets([_market()]), timeframes=['15m'], symbols=['BTC'], stream=stream)
+    seen = []
+    hub.subscribe(lambda events, snapshot: seen.append((threading.current_thread().name, snapshot)))
+    hub.refresh()
+    stream.start()
+    try:
+        assert clob_feed.wait_for(lambda: 'up-token' in clob_feed.subscribed)
+        clob_feed.best('up-token', 0.60, 0.62)
+        assert clob_feed.wait_for(lambda: any(s.get('BTC', '15m').prices['Up'] == 0.61 for _, s in seen))
+        assert all(name == 'polybrain-hub-events' for name, _ in seen)
+    finally:
+        stream.stop()
+
+
+def test_slow_subscriber_does_not_stall_the_stream(clob_feed):
+    stream = MarketStream(url=clob_feed.url)
+    hub = MarketHub(markets=StaticMarkets([_market()]), timeframes=['15m'], symbols=['BTC'], stream=stream)
+    hub.subscribe(lambda events, snapshot: time.sleep(0.5))
+    hub.refresh()
+    stream.start()
+    try:
+        assert clob_feed.wait_for(lambda: 'up-token' in clob_feed.subscribed)
+        started = time.time()
+        for i in range(5):
+            clob_feed.best('up-token', 0.50 + i / 100, 0.52 + i / 100)
+        assert clob_feed.wait_for(lambda: hub.snapshot().get('BTC', '15m').prices['Up'] == 0.55, timeout=1.0)
+        assert time.time() - started < 0.5
+    finally:
+        stream.stop()
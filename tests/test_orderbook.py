@@ -0,0 +1,85 @@
+import random
+from polymarket_bot.core.orderbook import BookSide, OrderBook
+
+
+def test_book_side_insert_update_delete_keeps_price_order():
+    bids = BookSide(descending=True)
+    bids.load([(0.40, 10), (0.45, 5), (0.30, 0), (0.42, 7)])
+    assert bids.levels() == [(0.45, 5), (0.42, 7), (0.40, 10)]
+    
+    bids.set(0.44, 3)
+    bids.set(0.42, 9)
+    bids.set(0.45, 0)
+    bids.set(0.10, 0)
+    assert bids.levels() == [(0.44, 3), (0.42, 9), (0.40, 10)]
+    assert bids.best() == (0.44, 3)
+    assert bids.levels(2) == [(0.44, 3), (0.42, 9)]
+    assert len(bids) == 3 and bids.total_size == 22
+    
+    asks = BookSide(descending=False)
+    asks.set(0.60, 4)
+    asks.set(0.55, 2)
+    assert asks.best() == (0.55, 2)
+
+
+def test_book_side_matches_a_brute_force_book():
+    rng = random.Random(11)
+    for descending in (True, False):
+        side = BookSide(descending)
+        book = {}
+        for _ in range(2000):
+            price = rng.randint(1, 99) / 100
+            size = rng.choice([0, 0, rng.uniform(1, 100)])
+            side.set(price, size)
+            if size > 0:
+                book[price] = size
+            else:
+                book.pop(price, None)
+            
+            if rng.random() < 0.1:
+                expected = sorted(book.items(), reverse=descending)
+                assert side.levels() == expected
+                limit = rng.randint(1, 99) / 100
+                inside = [s for p, s in expected if (p >= limit if descending else p <= limit)]
+                assert abs(side.depth(limit) - sum(inside)) < 1e-9
+                
+                want = rng.uniform(0, sum(book.values()) * 1.1)
+                filled, notional, worst = 0.0, 0.0, None
+                for p, s in expected:
+                    take = min(s, want - filled)
+                    filled += take
+                    notional += take * p
+                    worst = p
+                    if filled >= want - 1e-12:
+                        break
+                if filled < want - 1e-9:
+                    assert side.vwap(want) is None and side.price_for_size(want) is None
+                else:
+                    assert abs(side.vwap(want) - notional / want) < 1e-9
+                    assert side.price_for_size(want) == worst
+
+
+def test_order_book_best_prices_and_stale_deltas():
+    book = OrderBook('token')
+    book.apply_snapshot(
+        [{'price': '0.48', 'size': '100'}, {'price': '0.47', 'size': '50'}],
+        [{'price': '0.52', 'size': '80'}, ['0.55', '20'], {'price': 'bad'}],
+        timestamp=100
+    )
+    assert (book.best_bid, book.best_ask) == (0.48, 0.52)
+    assert abs(book.spread - 0.04) < 1e-9 and abs(book.mid - 0.50) < 1e-9
+    
+    assert book.apply_delta('BUY', 0.49, 10, timestamp=101)
+    assert book.best_bid == 0.49
+    assert not book.apply_delta('SELL', 0.51, 10, timestamp=99)
+    assert book.best_ask == 0.52
+    assert book.apply_delta('SELL', 0.52, 0, timestamp=102)
+    assert book.best_ask == 0.55
+    
+    # A taker buy walks the asks, a taker sell the bids
+    assert book.vwap('BUY', 20) == 0.55
+    assert book.price_for_size('SELL', 60) == 0.48
+    assert book.depth('SELL', 0.48) == 110
+    
+    book.apply_snapshot([], [], timestamp=50)
+    assert book.best_bid == 0.49
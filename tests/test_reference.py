@@ -0,0 +1,79 @@
+import json
+import time
+from polymarket_bot.data.cache import IntervalPriceCache
+from polymarket_bot.data.reference import ReferencePriceService
+from .standins import HttpStandIn
+
+
+def _service(feed, rest_url='http://127.0.0.1:9/ticker'):
+    service = ReferencePriceService(['BTC', 'ETH'], ws_url=f'{feed.url}/stream', rest_url=rest_url, max_backoff=0.2)
+    service.price_cache = IntervalPriceCache()
+    return service
+
+
+def test_stream_ticks_feed_prices_without_polling(reference_feed):
+    service = _service(reference_feed)
+    service.start()
+    try:
+        assert reference_feed.wait_for(lambda: service.connected)
+        for price in (100.0, 101.0, 102.5):
+            reference_feed.trade('BTC', price)
+        reference_feed.trade('ETH', 3000.0)
+        assert reference_feed.wait_for(lambda: service.ticks == 4)
+        assert service.prices(['BTC', 'ETH']) == {'BTC': 102.5, 'ETH': 3000.0}
+        assert service.polls == 0
+    finally:
+        service.stop()
+
+
+def test_missing_prices_are_omitted_not_zero(reference_feed):
+    standin = HttpStandIn({('GET', '/ticker'): lambda query, body: (404, {})}).start()
+    service = _service(reference_feed, rest_url=f'{standin.url}/ticker')
+    service.start()
+    try:
+        assert reference_feed.wait_for(lambda: service.connected)
+        reference_feed.trade('BTC', 100.0)
+        assert reference_feed.wait_for(lambda: service.ticks == 1)
+        assert service.prices(['BTC', 'ETH']) == {'BTC': 100.0}
+        assert service.distance_to_beat('ETH') is None
+    finally:
+        service.stop()
+        standin.stop()
+
+
+def test_price_to_beat_is_a_lookup(reference_feed):
+    service = _service(reference_feed)
+    start = service.calendar.interval_start('15m')
+    service.start()
+    try:
+        assert reference_feed.wait_for(lambda: service.connected)
+        reference_feed.trade('BTC', 100.0, ts=start)
+        reference_feed.trade('BTC', 101.0)
+        assert reference_feed.wait_for(lambda: service.ticks == 2)
+        
+        # Our own feed at the open until the official price is known
+        assert service.price_to_beat('BTC', '15m') == 100.0
+        assert abs(service.distance_to_beat('BTC', '15m') - 0.01) < 1e-9
+        service.price_cache.put('BTC', '15m', start, 100.5, time.time() + 60)
+        assert service.price_to_beat('BTC', '15m') == 100.5
+        
+        started = time.time()
+        assert service.price_to_beat('ETH', '1h') is None
+        assert time.time() - started < 0.1
+    finally:
+        service.stop()
+
+
+def test_added_symbols_subscribe_on_the_live_socket(reference_feed):
+    service = _service(reference_feed)
+    service.start()
+    try:
+        assert reference_feed.wait_for(lambda: service.connected)
+        service.add_symbols(['SOL'])
+        assert reference_feed.wait_for(lambda: any('solusdt@aggTrade' in m for m in reference_feed.received))
+        message = json.loads(reference_feed.received[-1])
+        assert message['method'] == 'SUBSCRIBE'
+        reference_feed.trade('SOL', 150.0)
+        assert reference_feed.wait_for(lambda: service.prices(['SOL']) == {'SOL': 150.0})
+    finally:
+        service.stop()
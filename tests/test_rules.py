@@ -0,0 +1,50 @@
+import time
+from polymarket_bot.agent.rules import MovePrefilter, parse_timestamp
+
+WHALE = {'wallet': '0xwhale', 'profit': 50000}
+
+
+def fields(price: float = 0.5, size: float = 500, market: str = '0xmarket', side: str = 'BUY') -> dict:
+    return {'market_id': market, 'market_question': 'Q?', 'side': side, 'size': size, 'price': price}
+
+
+def test_rules_in_order_and_escalation():
+    rules = MovePrefilter(min_whale_profit=1000, price_floor=0.03, price_ceiling=0.97, max_move_age=3600)
+    now = time.time()
+    
+    assert rules.check(WHALE, {'timestamp': now}, fields()) is None
+    assert rules.check(WHALE, {'closed': True}, fields())['tier'] == 'rules:closed'
+    assert rules.check(WHALE, {'endDate': '2020-01-01T00:00:00Z'}, fields())['tier'] == 'rules:closed'
+    assert rules.check(WHALE, {'timestamp': (now - 7200) * 1000}, fields())['tier'] == 'rules:closed'
+    assert rules.check(WHALE, {}, fields(price=0.03))['tier'] == 'rules:extreme_price'
+    assert rules.check(WHALE, {}, fields(price=0.97))['tier'] == 'rules:extreme_price'
+    assert rules.check(WHALE, {}, fields(price=0.031)) is None
+    
+    small = rules.check({'profit': 999}, {}, fields())
+    assert small['tier'] == 'rules:small_whale' and small['copy'] is False
+    assert rules.check({'profit': 1000}, {}, fields()) is None
+    
+    rules.mark_copied('0xmarket', 'buy')
+    assert rules.check(WHALE, {'closed': True}, fields())['tier'] == 'rules:duplicate'
+    assert rules.check(WHALE, {}, fields(side='SELL')) is None
+    
+    stats = rules.stats()
+    assert stats['checked'] == 11 and stats['escalated'] == 4
+    assert stats['rules']['closed'] == 3 and stats['rules']['duplicate'] == 1
+
+
+def test_auto_copy_only_when_enabled():
+    assert MovePrefilter(auto_profit=0).check(WHALE, {}, fields(size=5000)) is None
+    
+    rules = MovePrefilter(auto_profit=40000, auto_size=1000)
+    decision = rules.check(WHALE, {}, fields(size=1000))
+    assert decision['tier'] == 'rules:auto_copy' and decision['copy'] is True
+    assert rules.check(WHALE, {}, fields(size=999)) is None
+    assert rules.check({'profit': 39999}, {}, fields(size=5000)) is None
+
+
+def test_parse_timestamp_formats():
+    assert parse_timestamp(1700000000) == 1700000000
+    assert parse_timestamp('1700000000000') == 1700000000
+    assert parse_timestamp('2023-11-14T22:13:20Z') == 1700000000
+    assert parse_timestamp('') is None and parse_timestamp('soon') is None
@@ -0,0 +1,27 @@
+import time
+import pytest
+from polymarket_bot.api.scheduler import DeadlineExceeded, LLMScheduler
+
+
+def test_deadline_caps_but_does_not_replace_the_call_timeout():
+    scheduler = LLMScheduler(max_concurrency=1, call_timeout=5)
+    try:
+        assert scheduler.run(lambda timeout: timeout, deadline=time.time() + 900) == 5
+        assert scheduler.run(lambda timeout: timeout, deadline=time.time() + 2) <= 2
+        assert scheduler.run(lambda timeout: timeout) == 5
+    finally:
+        scheduler.shutdown()
+
+
+def test_request_past_its_deadline_is_not_called():
+    scheduler = LLMScheduler(max_concurrency=1, call_timeout=5)
+    calls = []
+    try:
+        future = scheduler.submit(calls.append, deadline=time.time() - 1)
+        with pytest.raises(DeadlineExceeded):
+            future.result(timeout=5)
+        assert calls == []
+        assert scheduler.stats()['expired'] == 1
+        assert scheduler.stats()['in_flight'] == 0
+    finally:
+        scheduler.shutdown()
@@ -0,0 +1,77 @@
+import threading
+import time
+from datetime import date
+from types import SimpleNamespace
+from polymarket_bot.api.decisions import DecisionCache
+from polymarket_bot.api.scheduler import LLMScheduler
+from polymarket_bot.markets.crypto import Market
+from polymarket_bot.markets.hub import MarketSnapshot
+from polymarket_bot.strategy.smart import SmartStrategy
+
+REPLY = ['BTC 15m ', 'Up $0.55', ', Yes', ', momentum ', 'holds into ', 'the close']
+
+
+class FakeRepo:
+    def __init__(self):
+        self.saved = []
+    
+    def save_brain_bet(self, **bet):
+        self.saved.append(bet)
+        return len(self.saved)
+
+
+def strategy(deadline: float, token_delay: float, buy_delay: float) -> SmartStrategy:
+    market = Market('BTC', '15m', 'btc-updown-15m-1', '0x1', 'BTC Up or Down?', 20000.0, 5000.0, True,
+                    ['Up', 'Down'], ['up-token', 'down-token'], {'Up': 0.55, 'Down': 0.45})
+    snapshot = MarketSnapshot(1, time.time(), {'15m': [market], '1h': []})
+    orders = []
+    
+    def buy(token_id, size, price):
+        time.sleep(buy_delay)
+        orders.append(token_id)
+        return {'orderID': f'order-{len(orders)}'}
+    
+    def chat_stream(prompt, on_token, timeout):
+        for chunk in REPLY:
+            time.sleep(token_delay)
+            on_token(chunk)
+        return {'content': ''.join(REPLY)}
+    
+    smart = SmartStrategy.__new__(SmartStrategy)
+    smart.hub = SimpleNamespace(snapshot=lambda: snapshot)
+    smart.trader = SimpleNamespace(buy=buy, orders=orders)
+    smart.brain = SimpleNamespace(chat_stream=chat_stream)
+    smart.decisions = DecisionCache()
+    smart.scheduler = LLMScheduler(max_concurrency=1, call_timeout=5)
+    smart.calendar = SimpleNamespace(interval_start=lambda tf: 0, interval_end=lambda tf: deadline)
+    smart.reference = SimpleNamespace(prices=lambda symbols: {}, distance_to_beat=lambda symbol, tf: None)
+    smart.repo = FakeRepo()
+    smart.trades_today = []
+    smart.today = date.today()
+    smart._trade_lock = threading.Lock()
+    return smart
+
+
+def test_early_bet_in_flight_at_the_deadline_is_placed_and_saved_once():
+    smart = strategy(time.time() + 0.3, token_delay=0.05, buy_delay=0.5)
+    try:
+        result = smart.ask_brain_and_trade()
+    finally:
+        smart.scheduler.shutdown()
+    time.sleep(0.5)
+    assert smart.trader.orders == ['up-token']
+    assert len(smart.trades_today) == 1
+    assert len(smart.repo.saved) == 1 and smart.repo.saved[0]['status'] == 'placed'
+    assert result['trade_placed'] is True
+
+
+def test_decision_streamed_after_the_deadline_places_nothing():
+    smart = strategy(time.time() + 0.1, token_delay=0.1, buy_delay=0.0)
+    try:
+        result = smart.ask_brain_and_trade()
+    finally:
+        smart.scheduler.shutdown()
+    time.sleep(0.5)
+    assert result == {'success': False, 'error': 'deadline'}
+    assert smart.trader.orders == []
+    assert smart.trades_today == [] and smart.repo.saved == []